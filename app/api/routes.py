@@ -0,0 +1,80 @@
+"""HTTP/WebSocket entry point.
+
+    uvicorn app.api.routes:app --host 0.0.0.0 --port 8000
+"""
+
+import asyncio
+from contextlib import asynccontextmanager
+
+from fastapi import APIRouter, FastAPI
+from fastapi.responses import PlainTextResponse
+
+from app.api.websocket import router as websocket_router, session_manager
+from app.core.evaluation_queue import turn_latency
+from app.core.graph import get_graph
+from app.core.intent import intent_stats
+from app.core.router_prefetch import router_prefetch
+from app.core.speculation import pool_speculator
+from app.core.speculative_intent import speculation_stats
+from app.services.evaluation_cache import evaluation_cache
+from app.services.llm_service import llm_client, warm_up
+from app.services.question_bank import question_bank
+from app.services.report_service import report_worker
+from app.utils.logger import render_prometheus
+
+router = APIRouter()
+
+
+@router.get("/health")
+async def health():
+    return {"status": "ok" if session_manager.accepting else "draining"}
+
+
+@router.get("/stats")
+async def stats():
+    return {
+        "sessions": session_manager.stats(),
+        "llm": llm_client.stats(),
+        "turn_latency": turn_latency.stats(),
+        "intent": intent_stats.snapshot(),
+        "evaluation_cache": evaluation_cache.stats(),
+        "question_bank": question_bank.stats(),
+        "reports": report_worker.stats(),
+        "speculation": speculation_stats.snapshot(),
+        "router_prefetch": router_prefetch.stats(),
+        "pool_speculation": pool_speculator.stats(),
+    }
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    # Prometheus text exposition format; empty histograms unless METRICS_ENABLED
+    return PlainTextResponse(render_prometheus(), media_type="text/plain; version=0.0.4")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # One compiled graph and checkpointer shared by every session
+    app.state.graph = get_graph()
+    # Load the LLM SDK off the event loop while the first caller is being greeted
+    warming = asyncio.create_task(asyncio.to_thread(warm_up))
+    # Pick up reports queued before the last restart
+    report_worker.start()
+    yield
+    await session_manager.shutdown()
+    await report_worker.stop()
+    await warming
+    evaluation_cache.flush()
+    checkpointer = app.state.graph.checkpointer
+    if hasattr(checkpointer, "close"):
+        checkpointer.close()
+
+
+def create_app() -> FastAPI:
+    app = FastAPI(title="IntervuAgent", lifespan=lifespan)
+    app.include_router(router)
+    app.include_router(websocket_router)
+    return app
+
+
+app = create_app()
@@ -0,0 +1,368 @@
+"""Multi-session WebSocket call server.
+
+Every connection is one interview on the shared graph, with its own
+``thread_id``; all sessions run on the same event loop. Protocol (JSON text
+frames unless noted)::
+
+    client -> {"type": "start", "student_name": ..., "college": ..., "course": ...,
+               "candidate_id": <optional, keys question history>,
+               "thread_id": <optional, resumes a dropped call>, "audio": <bool>}
+    client -> {"type": "partial", "text": ...}   interim STT, used for speculative routing
+    client -> {"type": "text", "text": ...}      the candidate's final reply
+    client -> {"type": "interrupt"}              barge-in: drop agent audio not yet sent; in audio
+                                                 mode also cancel the turn if the graph is still
+                                                 running, and rerun it with the next reply appended
+    client -> {"type": "end"}
+
+    server -> {"type": "session", "thread_id": ..., "resumed": <bool>}
+    server -> {"type": "agent", "text": ...}     one per agent message
+    server -> binary frames                      agent speech, 24 kHz linear16 (audio mode), greeting
+                                                 included; sent before the matching "agent" frames
+    server -> {"type": "turn_done", "latency_ms": ..., "interrupted": <bool>}
+    server -> {"type": "end"} | {"type": "shutdown"} | {"type": "error", "error": ...}
+
+Backpressure: inbound messages go through a small bounded queue, so a client
+that sends faster than turns complete stops being read (and TCP pushes back);
+outbound frames go through a bounded queue too, and a client that does not
+drain it within ``WS_SEND_TIMEOUT_SECONDS`` is disconnected.
+"""
+
+import asyncio
+import time
+import uuid
+from collections import deque
+from typing import AsyncIterator, Deque, List, Optional, Set
+
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect
+from langchain_core.messages import AIMessage
+
+from app import config
+from app.core.evaluation_queue import evaluation_queue
+from app.core.router_prefetch import router_prefetch
+from app.core.speculation import pool_speculator
+from app.core.speculative_intent import IntentSpeculator
+from app.core.streaming_reply import speak_lines, speak_turn
+from app.streaming.audio_stream import TTS_RATE
+from app.streaming.interrupt_handler import InterruptHandler
+from app.utils.helpers import percentile
+from app.utils.logger import current_thread_id
+
+router = APIRouter()
+
+
+class SlowConsumer(Exception):
+    pass
+
+
+class CallSession:
+    """One connected candidate."""
+
+    def __init__(self, websocket: WebSocket, graph):
+        self.ws = websocket
+        self.graph = graph
+        self.config: Optional[dict] = None
+        self.audio = False
+        self.outbound: asyncio.Queue = asyncio.Queue(maxsize=config.WS_SEND_QUEUE_SIZE)
+        self.inbound: asyncio.Queue = asyncio.Queue(maxsize=config.WS_RECEIVE_QUEUE_SIZE)
+        self.speculator: Optional[IntentSpeculator] = None
+        self.interrupts: Optional[InterruptHandler] = None
+        self.task: Optional[asyncio.Task] = None
+        self.finished = False
+        self._generation = 0
+        self._in_turn = False
+        self._message_count = 0
+
+    @property
+    def thread_id(self) -> Optional[str]:
+        return self.config["configurable"]["thread_id"] if self.config else None
+
+    async def run(self) -> None:
+        self.task = asyncio.current_task()
+        sender = asyncio.create_task(self._send_loop())
+        receiver = asyncio.create_task(self._receive_loop())
+        try:
+            await self._conversation()
+        except (WebSocketDisconnect, SlowConsumer):
+            pass
+        finally:
+            receiver.cancel()
+            if self.interrupts is not None:
+                # Release the pinned turn checkpoint; a reconnect resumes from the latest one
+                self.interrupts.settle()
+            try:
+                # Let queued frames go out, unless the client has stopped reading
+                self.outbound.put_nowait(None)
+                await asyncio.wait_for(sender, config.WS_SEND_TIMEOUT_SECONDS)
+            except (asyncio.QueueFull, asyncio.TimeoutError, WebSocketDisconnect, RuntimeError):
+                sender.cancel()
+
+    # Outbound
+    async def send(self, payload) -> None:
+        try:
+            await asyncio.wait_for(
+                self.outbound.put((self._generation, payload)), config.WS_SEND_TIMEOUT_SECONDS
+            )
+        except asyncio.TimeoutError:
+            raise SlowConsumer(self.thread_id)
+
+    async def _send_loop(self) -> None:
+        while (item := await self.outbound.get()) is not None:
+            generation, payload = item
+            if isinstance(payload, bytes):
+                # Audio queued before a barge-in is dropped, not played late
+                if generation == self._generation:
+                    await self.ws.send_bytes(payload)
+            else:
+                await self.ws.send_json(payload)
+
+    # Inbound
+    async def _receive_loop(self) -> None:
+        try:
+            while True:
+                message = await self.ws.receive_json()
+                kind = message.get("type")
+                if kind == "interrupt":
+                    self._generation += 1
+                    if self.interrupts is not None:
+                        self.interrupts.barge_in()
+                elif kind == "partial":
+                    if self.speculator is not None and not self._in_turn and message.get("text"):
+                        await self.speculator.on_partial(message["text"])
+                else:
+                    await self.inbound.put(message)
+        except (WebSocketDisconnect, RuntimeError):
+            pass
+        except (ValueError, KeyError):
+            await self.send({"type": "error", "error": "expected JSON text frames"})
+        finally:
+            # Wake the conversation loop so it can wind down
+            while True:
+                try:
+                    self.inbound.put_nowait(None)
+                    break
+                except asyncio.QueueFull:
+                    self.inbound.get_nowait()
+
+    # Conversation
+    async def _conversation(self) -> None:
+        start = await self.inbound.get()
+        if start is None:
+            return
+        if start.get("type") != "start":
+            await self.send({"type": "error", "error": "first message must be 'start'"})
+            return
+
+        thread_id = start.get("thread_id") or f"call-{uuid.uuid4().hex[:12]}"
+        self.config = {"configurable": {"thread_id": thread_id}}
+        # Tags this session's TTS/STT spans (graph nodes set it themselves)
+        current_thread_id.set(thread_id)
+        self.audio = bool(start.get("audio"))
+        self.speculator = IntentSpeculator(self.graph, self.config)
+        if self.audio:
+            self.interrupts = InterruptHandler(
+                self.graph, self.config, speculator=self.speculator, respond=self._speak,
+                bytes_per_second=2 * TTS_RATE,
+            )
+
+        existing = await self.graph.aget_state(self.config)
+        resumed = bool(existing.values)
+        await self.send({"type": "session", "thread_id": thread_id, "resumed": resumed})
+        if not resumed:
+            await self.graph.ainvoke({
+                "candidate_id": start.get("candidate_id"),
+                "student_name": start.get("student_name", ""),
+                "college": start.get("college", ""),
+                "course": start.get("course", ""),
+                "messages": [],
+            }, config=self.config)
+            await self._say(await self._new_messages())
+        else:
+            messages = existing.values.get("messages", [])
+            self._message_count = len(messages)
+            if existing.next and existing.next[0] not in self.graph.interrupt_before_nodes:
+                # Dropped mid-turn: finish that turn first
+                await self.graph.ainvoke(None, config=self.config)
+                await self._say(await self._new_messages())
+            else:
+                # Repeat the last thing the agent said
+                last = next((m for m in reversed(messages) if isinstance(m, AIMessage)), None)
+                if last is not None:
+                    await self._say([last.content])
+
+        while True:
+            state = await self.graph.aget_state(self.config)
+            if not state.next:
+                self.finished = True
+                checkpointer = self.graph.checkpointer
+                if hasattr(checkpointer, "mark_finished"):
+                    checkpointer.mark_finished(thread_id)
+                await self.send({"type": "end"})
+                return
+
+            message = await self.inbound.get()
+            if message is None or message.get("type") == "end":
+                return
+            if message.get("type") != "text":
+                await self.send({"type": "error", "error": f"unexpected message type {message.get('type')!r}"})
+                continue
+            await self._turn(message.get("text", ""))
+
+    async def _turn(self, text: str) -> None:
+        started = time.perf_counter()
+        interrupted = False
+        self._in_turn = True
+        try:
+            if self.interrupts is not None:
+                turn = await self.interrupts.submit_utterance(text)
+                try:
+                    await turn
+                except asyncio.CancelledError:
+                    if asyncio.current_task().cancelling():
+                        raise
+                playback = self.interrupts.playback
+                interrupted = turn.cancelled() or (playback is not None and playback.cancelled)
+            else:
+                await self.speculator.apply_final(text)
+                await self.graph.ainvoke(None, config=self.config)
+            if self.interrupts is None or not self.interrupts.pending:
+                # A cut-off turn is rerun from its starting checkpoint; persisting now would fork past it
+                await evaluation_queue.persist(self.graph, self.config)
+        finally:
+            self._in_turn = False
+        if not interrupted or not self.interrupts.pending:
+            # A turn cut off mid-graph is rerun with the next reply; its messages are not final
+            await self._send_new_messages()
+        latency = time.perf_counter() - started
+        session_manager.turn_seconds.append(latency)
+        await self.send({"type": "turn_done", "latency_ms": round(1000 * latency, 1), "interrupted": interrupted})
+
+    async def _speak(self) -> None:
+        """Resume the graph and send the reply as audio, tracked for barge-in."""
+        playback = self.interrupts.start_playback("", asyncio.current_task())
+
+        def graph_done(text: str) -> None:
+            playback.text = text
+            self.interrupts.settle()
+
+        await self._play(playback, speak_turn(self.graph, self.config, on_graph_done=graph_done))
+
+    async def _say(self, lines: List[str]) -> None:
+        """Send agent lines said outside a turn (greeting, resume); spoken first in audio mode."""
+        if self.audio and lines:
+            async def speak() -> None:
+                playback = self.interrupts.start_playback(" ".join(lines), asyncio.current_task())
+                await self._play(playback, speak_lines(lines))
+
+            # Its own task, so a barge-in cuts the audio and not the session
+            speaker = asyncio.create_task(speak())
+            try:
+                await speaker
+            except asyncio.CancelledError:
+                if asyncio.current_task().cancelling():
+                    speaker.cancel()
+                    raise
+        for text in lines:
+            await self.send({"type": "agent", "text": text})
+
+    async def _play(self, playback, audio: AsyncIterator[bytes]) -> None:
+        async for pcm in audio:
+            if not await playback.feed(pcm):
+                return
+            # Cached audio arrives as views of a memory-mapped file
+            await self.send(bytes(pcm))
+            self.interrupts.on_frame_sent(len(pcm))
+        playback.finish()
+
+    async def _new_messages(self) -> List[str]:
+        state = await self.graph.aget_state(self.config)
+        messages = state.values.get("messages", [])
+        new = [msg.content for msg in messages[self._message_count:] if isinstance(msg, AIMessage)]
+        self._message_count = len(messages)
+        return new
+
+    async def _send_new_messages(self) -> None:
+        for text in await self._new_messages():
+            await self.send({"type": "agent", "text": text})
+
+    def close(self, reason: str) -> None:
+        """Tell the client we are going away; the session ends after the current turn."""
+        for queue, item in ((self.outbound, (self._generation, {"type": "shutdown", "reason": reason})),
+                            (self.inbound, None)):
+            try:
+                queue.put_nowait(item)
+            except asyncio.QueueFull:
+                pass
+
+
+class SessionManager:
+    """Admission control, bookkeeping and graceful shutdown for all sessions."""
+
+    def __init__(self, max_sessions: int = config.WS_MAX_SESSIONS):
+        self.max_sessions = max_sessions
+        self.sessions: Set[CallSession] = set()
+        self.accepting = True
+        self.started = 0
+        self.completed = 0
+        self.rejected = 0
+        self.turn_seconds: Deque[float] = deque(maxlen=10000)
+
+    async def handle(self, websocket: WebSocket, graph) -> None:
+        if not self.accepting or len(self.sessions) >= self.max_sessions:
+            self.rejected += 1
+            # 1013: try again later
+            await websocket.close(code=1013)
+            return
+        await websocket.accept()
+        session = CallSession(websocket, graph)
+        self.sessions.add(session)
+        self.started += 1
+        try:
+            await session.run()
+        finally:
+            self.sessions.discard(session)
+            if session.thread_id:
+                # Hang-up, error or close: stop generating pools and router calls nobody will
+                # ask for, and keep the verdicts already paid for
+                pool_speculator.discard(session.thread_id)
+                router_prefetch.discard(session.thread_id)
+                await evaluation_queue.persist(graph, session.config, wait=True,
+                                               timeout=config.EVALUATION_QUEUE_DRAIN_SECONDS)
+            if session.finished:
+                self.completed += 1
+            try:
+                await websocket.close()
+            except RuntimeError:
+                pass
+
+    async def shutdown(self, grace: float = config.WS_SHUTDOWN_GRACE_SECONDS) -> None:
+        """Stop admitting calls, ask live sessions to wind down, cancel stragglers.
+
+        Every graph step is checkpointed, so a cut-off call resumes where it
+        left off when the client reconnects with its ``thread_id``.
+        """
+        self.accepting = False
+        for session in list(self.sessions):
+            session.close("server shutting down")
+        tasks = [s.task for s in self.sessions if s.task is not None]
+        if tasks:
+            _, pending = await asyncio.wait(tasks, timeout=grace)
+            for task in pending:
+                task.cancel()
+
+    def stats(self) -> dict:
+        return {
+            "active": len(self.sessions),
+            "started": self.started,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "turn_p50_ms": 1000 * percentile(list(self.turn_seconds), 50),
+            "turn_p95_ms": 1000 * percentile(list(self.turn_seconds), 95),
+        }
+
+
+session_manager = SessionManager()
+
+
+@router.websocket("/ws/interview")
+async def interview_socket(websocket: WebSocket):
+    await session_manager.handle(websocket, websocket.app.state.graph)
@@ -0,0 +1,134 @@
+import os
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in {"1", "true", "yes", "on"}
+
+
+def _env_float(name: str, default: float) -> float:
+    value = os.getenv(name)
+    return float(value) if value else default
+
+
+def _env_int(name: str, default: int) -> int:
+    value = os.getenv(name)
+    return int(value) if value else default
+
+
+# Shared LLM client — concurrency caps, pacing, retries and hedging (see app/services/llm_service.py)
+LLM_BASE_URL = os.getenv("LLM_BASE_URL") or None
+LLM_TIMEOUT_SECONDS = _env_float("LLM_TIMEOUT_SECONDS", 30.0)
+LLM_MAX_CONCURRENCY = _env_int("LLM_MAX_CONCURRENCY", 64)
+LLM_MODEL_CONCURRENCY = _env_int("LLM_MODEL_CONCURRENCY", 32)
+LLM_REQUESTS_PER_SECOND = _env_float("LLM_REQUESTS_PER_SECOND", 50.0)
+LLM_BURST = _env_int("LLM_BURST", 20)
+LLM_MAX_ATTEMPTS = _env_int("LLM_MAX_ATTEMPTS", 3)
+LLM_BACKOFF_BASE_SECONDS = _env_float("LLM_BACKOFF_BASE_SECONDS", 0.25)
+LLM_BACKOFF_MAX_SECONDS = _env_float("LLM_BACKOFF_MAX_SECONDS", 8.0)
+LLM_HEDGE_ENABLED = _env_bool("LLM_HEDGE_ENABLED", True)
+LLM_HEDGE_MIN_SAMPLES = _env_int("LLM_HEDGE_MIN_SAMPLES", 20)
+LLM_HEDGE_BUDGET = _env_float("LLM_HEDGE_BUDGET", 0.1)
+
+# Local intent classifier — answers obvious replies without an LLM call
+LOCAL_INTENT_ENABLED = _env_bool("LOCAL_INTENT_ENABLED", True)
+LOCAL_INTENT_THRESHOLD = _env_float("LOCAL_INTENT_THRESHOLD", 0.85)
+
+# Speculative question pools — generate all difficulties once the topic is known
+SPECULATIVE_POOL_ENABLED = _env_bool("SPECULATIVE_POOL_ENABLED", False)
+
+# Speculative intent — start a router's LLM call on a stable partial transcript the local
+# classifier cannot settle; used only if the final matches, so a changed partial wastes a call
+SPECULATIVE_INTENT_LLM_ENABLED = _env_bool("SPECULATIVE_INTENT_LLM_ENABLED", False)
+
+# Question bank — questions indexed by topic and difficulty, with per-candidate history;
+# the LLM only generates when a cell has fewer than QUESTION_BANK_MIN_CELL questions
+QUESTION_BANK_ENABLED = _env_bool("QUESTION_BANK_ENABLED", True)
+QUESTION_BANK_PATH = os.getenv("QUESTION_BANK_PATH", ".cache/question_bank.sqlite")
+QUESTION_BANK_MIN_CELL = _env_int("QUESTION_BANK_MIN_CELL", 12)
+QUESTION_BANK_SIMILARITY = _env_float("QUESTION_BANK_SIMILARITY", 0.7)
+
+# Fused answer turn — one LLM call classifies the reply and evaluates it
+FUSED_ANSWER_ENABLED = _env_bool("FUSED_ANSWER_ENABLED", False)
+
+# Pipelined evaluation — score answers in the background while the next question is asked
+PIPELINED_EVALUATION_ENABLED = _env_bool("PIPELINED_EVALUATION_ENABLED", False)
+EVALUATION_QUEUE_CONCURRENCY = _env_int("EVALUATION_QUEUE_CONCURRENCY", 8)
+# How long a call that ends early waits for its outstanding evaluations before they are dropped
+EVALUATION_QUEUE_DRAIN_SECONDS = _env_float("EVALUATION_QUEUE_DRAIN_SECONDS", 10.0)
+
+# Streaming feedback — speak evaluation feedback clause-by-clause as the model writes it
+STREAMING_FEEDBACK_ENABLED = _env_bool("STREAMING_FEEDBACK_ENABLED", False)
+
+# Evaluation cache — reuse verdicts for answers that repeat one already scored for the same question
+EVALUATION_CACHE_ENABLED = _env_bool("EVALUATION_CACHE_ENABLED", True)
+EVALUATION_CACHE_PATH = os.getenv("EVALUATION_CACHE_PATH", ".cache/evaluations.json")
+EVALUATION_CACHE_MAX_ENTRIES = _env_int("EVALUATION_CACHE_MAX_ENTRIES", 20000)
+
+# Post-interview feedback reports — generated in batches off the call path
+REPORTS_ENABLED = _env_bool("REPORTS_ENABLED", True)
+REPORTS_DIR = os.getenv("REPORTS_DIR", ".cache/reports")
+REPORT_QUEUE_PATH = os.getenv("REPORT_QUEUE_PATH", ".cache/report_queue.sqlite")
+REPORT_BATCH_SIZE = _env_int("REPORT_BATCH_SIZE", 8)
+REPORT_BATCH_WAIT_SECONDS = _env_float("REPORT_BATCH_WAIT_SECONDS", 5.0)
+REPORT_CONCURRENCY = _env_int("REPORT_CONCURRENCY", 2)
+REPORT_MAX_ATTEMPTS = _env_int("REPORT_MAX_ATTEMPTS", 3)
+REPORT_RETRY_BACKOFF_SECONDS = _env_float("REPORT_RETRY_BACKOFF_SECONDS", 30.0)
+REPORT_MIN_LLM_HEADROOM = _env_float("REPORT_MIN_LLM_HEADROOM", 0.5)
+
+# Checkpointing — "sqlite" (bounded, persistent) or "memory" (MemorySaver)
+CHECKPOINT_BACKEND = os.getenv("CHECKPOINT_BACKEND", "sqlite")
+CHECKPOINT_DB_PATH = os.getenv("CHECKPOINT_DB_PATH", ".cache/checkpoints.sqlite")
+CHECKPOINT_KEEP_LAST = _env_int("CHECKPOINT_KEEP_LAST", 4)
+CHECKPOINT_FINISHED_TTL_SECONDS = _env_int("CHECKPOINT_FINISHED_TTL_SECONDS", 3600)
+CHECKPOINT_IDLE_TTL_SECONDS = _env_int("CHECKPOINT_IDLE_TTL_SECONDS", 24 * 3600)
+
+# Observability — timing spans exported as Prometheus histograms on /metrics,
+# optionally also logged as one JSON line per span
+METRICS_ENABLED = _env_bool("METRICS_ENABLED", False)
+TRACE_LOG_ENABLED = _env_bool("TRACE_LOG_ENABLED", False)
+
+# Voice activity detection / endpointing — an utterance ends after VAD_HANGOVER_MS + VAD_END_OF_UTTERANCE_MS
+# without speech (300 ms by default)
+VAD_FRAME_MS = _env_int("VAD_FRAME_MS", 20)
+VAD_THRESHOLD_DB = _env_float("VAD_THRESHOLD_DB", 9.0)
+VAD_MIN_ENERGY_DB = _env_float("VAD_MIN_ENERGY_DB", -60.0)
+VAD_START_MS = _env_int("VAD_START_MS", 60)
+VAD_HANGOVER_MS = _env_int("VAD_HANGOVER_MS", 100)
+VAD_END_OF_UTTERANCE_MS = _env_int("VAD_END_OF_UTTERANCE_MS", 200)
+
+# Streaming speech-to-text — partial cadence and when a partial counts as stable
+STT_PARTIAL_INTERVAL_MS = _env_int("STT_PARTIAL_INTERVAL_MS", 100)
+STT_STABLE_PARTIALS = _env_int("STT_STABLE_PARTIALS", 2)
+
+# Text-to-speech — "openai" or "local" (offline stand-in for tests and benchmarks)
+TTS_PROVIDER = os.getenv("TTS_PROVIDER", "openai")
+TTS_MODEL = os.getenv("TTS_MODEL", "tts-1")
+TTS_VOICE = os.getenv("TTS_VOICE", "alloy")
+TTS_SAMPLE_RATE = 24000
+
+# Pre-synthesized audio cache
+AUDIO_CACHE_DIR = os.getenv("AUDIO_CACHE_DIR", ".cache/audio")
+AUDIO_CACHE_MAX_BYTES = _env_int("AUDIO_CACHE_MAX_BYTES", 256 * 1024 * 1024)
+
+# WebSocket call server (app/api)
+WS_MAX_SESSIONS = _env_int("WS_MAX_SESSIONS", 500)
+WS_SEND_QUEUE_SIZE = _env_int("WS_SEND_QUEUE_SIZE", 64)
+WS_RECEIVE_QUEUE_SIZE = _env_int("WS_RECEIVE_QUEUE_SIZE", 8)
+WS_SEND_TIMEOUT_SECONDS = _env_float("WS_SEND_TIMEOUT_SECONDS", 10.0)
+WS_SHUTDOWN_GRACE_SECONDS = _env_float("WS_SHUTDOWN_GRACE_SECONDS", 5.0)
+
+# Outbound call campaigns (app/services/call_service.py)
+CAMPAIGN_DB_PATH = os.getenv("CAMPAIGN_DB_PATH", ".cache/campaigns.sqlite")
+CAMPAIGN_CONCURRENCY = _env_int("CAMPAIGN_CONCURRENCY", 50)
+CAMPAIGN_MAX_ATTEMPTS = _env_int("CAMPAIGN_MAX_ATTEMPTS", 3)
+CAMPAIGN_RETRY_DELAY_SECONDS = _env_float("CAMPAIGN_RETRY_DELAY_SECONDS", 900.0)
+CAMPAIGN_ADMISSIONS_PER_SECOND = _env_float("CAMPAIGN_ADMISSIONS_PER_SECOND", 2.0)
+CAMPAIGN_MIN_LLM_HEADROOM = _env_float("CAMPAIGN_MIN_LLM_HEADROOM", 0.3)
+CAMPAIGN_REPLY_TIMEOUT_SECONDS = _env_float("CAMPAIGN_REPLY_TIMEOUT_SECONDS", 30.0)
@@ -0,0 +1,259 @@
+"""Off-critical-path answer evaluation.
+
+In pipelined mode the answer turn only records the reply, says a short
+acknowledgement and moves on to the next question. The full evaluation runs
+in a background task. Finished results are written into the thread's state
+by ``EvaluationQueue.persist``, which the call layers run after every turn
+and when a call ends for any reason (drop, disconnect, shutdown); the
+pipelined node also picks up whatever finished mid-turn, and the terminal
+nodes wait for anything still outstanding.
+
+A turn cut off by a barge-in is rerun from the checkpoint it started on, so
+its state writes are dropped. Results therefore stay queued until they are
+seen in a node's input state (which every later run descends from), and a
+resubmitted answer replaces the cut-off run's evaluation of that question.
+
+``turn_latency`` times the answer turn the candidate experiences, from the
+router receiving the answer to the next question (or the closing line), so
+inline, fused, streamed and pipelined evaluation are directly comparable.
+"""
+
+import asyncio
+import inspect
+import logging
+import time
+from collections import OrderedDict, defaultdict, deque
+from typing import Deque, Dict, List, Optional, Tuple
+
+from langchain_core.messages import AIMessage
+from langchain_core.runnables import RunnableConfig
+
+from app import config
+from app.core.state import InterviewState, QuestionEvaluation
+from app.core.prompts import ACKNOWLEDGEMENTS
+from app.core.nodes import run_evaluation, evaluation_record
+from app.utils.helpers import thread_id_of, percentile
+
+logger = logging.getLogger("intervu.evaluations")
+
+# Answer turns started but not (yet) finished are forgotten past this many threads
+_MAX_OPEN_TURNS = 10000
+
+
+class TurnLatency:
+    """Answer-to-next-question latency, per evaluation mode."""
+
+    def __init__(self):
+        self.samples: Dict[str, List[float]] = defaultdict(list)
+        self._started: "OrderedDict[str, float]" = OrderedDict()
+
+    def start(self, thread_id: str) -> None:
+        self._started[thread_id] = time.perf_counter()
+        self._started.move_to_end(thread_id)
+        while len(self._started) > _MAX_OPEN_TURNS:
+            self._started.popitem(last=False)
+
+    def finish(self, thread_id: str, mode: str) -> None:
+        started = self._started.pop(thread_id, None)
+        if started is not None:
+            self.record(mode, time.perf_counter() - started)
+
+    def record(self, mode: str, seconds: float) -> None:
+        self.samples[mode].append(seconds)
+
+    def reset(self) -> None:
+        self.samples.clear()
+        self._started.clear()
+
+    def stats(self) -> dict:
+        return {
+            mode: {
+                "count": len(values),
+                "p50_ms": 1000 * percentile(values, 50),
+                "p95_ms": 1000 * percentile(values, 95),
+                "mean_ms": 1000 * sum(values) / len(values),
+            }
+            for mode, values in self.samples.items() if values
+        }
+
+
+class EvaluationQueue:
+    """Background evaluation tasks per thread, bounded by a shared semaphore."""
+
+    def __init__(self, concurrency: int = config.EVALUATION_QUEUE_CONCURRENCY):
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._pending: Dict[str, Deque[Tuple[str, asyncio.Task]]] = defaultdict(deque)
+        self.submitted = 0
+        self.replaced = 0
+        self.completed_count = 0
+        self.eval_seconds: List[float] = []
+
+    def submit(self, thread_id: str, question: str, answer: str) -> None:
+        """Queue an answer for scoring, replacing any earlier answer to the same question.
+
+        A turn rerun after a barge-in submits the longer reply again; the
+        cut-off run's evaluation is cancelled so the question is scored once.
+        """
+        pending = self._pending[thread_id]
+        for queued in [entry for entry in pending if entry[0] == question]:
+            pending.remove(queued)
+            queued[1].cancel()
+            self.replaced += 1
+        pending.append((question, asyncio.create_task(self._evaluate(question, answer))))
+        self.submitted += 1
+
+    async def _evaluate(self, question: str, answer: str) -> QuestionEvaluation:
+        async with self._semaphore:
+            started = time.perf_counter()
+            result = await run_evaluation(question, answer)
+            self.eval_seconds.append(time.perf_counter() - started)
+        self.completed_count += 1
+        return evaluation_record(question, answer, result)
+
+    def finished(self, thread_id: str) -> List[QuestionEvaluation]:
+        """Evaluations that already finished, in question order; they stay queued."""
+        results = []
+        for _, task in self._pending.get(thread_id, ()):
+            if not task.done():
+                break
+            results.append(task.result())
+        return results
+
+    def forget(self, thread_id: str, saved: List[QuestionEvaluation]) -> None:
+        """Drop finished evaluations whose question is already in the thread's saved state."""
+        pending = self._pending.get(thread_id)
+        if not pending:
+            return
+        questions = {e.question for e in saved}
+        kept = deque(entry for entry in pending if not (entry[1].done() and entry[0] in questions))
+        if kept:
+            self._pending[thread_id] = kept
+        else:
+            del self._pending[thread_id]
+
+    async def drain(self, thread_id: str) -> List[QuestionEvaluation]:
+        """Wait for every outstanding evaluation of this thread.
+
+        Cancelling the wait leaves the evaluations running, for the rerun of
+        a cut-off turn; the call layer clears the queue when the call ends.
+        """
+        tasks = [task for _, task in self._pending.get(thread_id, ())]
+        if tasks:
+            await asyncio.wait(tasks)
+        return self.finished(thread_id)
+
+    def outstanding(self, thread_id: str) -> int:
+        return len(self._pending.get(thread_id, ()))
+
+    def discard(self, thread_id: str) -> None:
+        """Cancel this thread's outstanding evaluations."""
+        for _, task in self._pending.pop(thread_id, ()):
+            task.cancel()
+
+    async def persist(self, graph, config: dict, wait: bool = False, timeout: Optional[float] = None) -> int:
+        """Write this thread's finished evaluations into its checkpointed state.
+
+        Call only while no turn is running on the thread. With ``wait`` (the
+        call is ending) outstanding evaluations get ``timeout`` seconds, the
+        rest are cancelled, and nothing is left behind in memory.
+        """
+        thread_id = thread_id_of(config)
+        if wait:
+            pending = [task for _, task in self._pending.pop(thread_id, deque())]
+            if pending:
+                await asyncio.wait(pending, timeout=timeout)
+            results = []
+            for task in pending:
+                if not task.done():
+                    task.cancel()
+                elif not task.cancelled() and task.exception() is None:
+                    results.append(task.result())
+        else:
+            results = self.finished(thread_id)
+        if not results:
+            return 0
+        try:
+            saved = (await graph.aget_state(config)).values.get("evaluations", [])
+            evaluations = merge_evaluations(saved, results)
+            if len(evaluations) > len(saved):
+                await graph.aupdate_state(config, {"evaluations": evaluations})
+        except Exception as e:
+            logger.error("Error persisting %d evaluations for %s: %s", len(results), thread_id, e)
+            return 0
+        self.forget(thread_id, evaluations)
+        return len(evaluations) - len(saved)
+
+    def stats(self) -> dict:
+        return {
+            "submitted": self.submitted,
+            "replaced": self.replaced,
+            "completed": self.completed_count,
+            "in_flight": sum(not task.done() for p in self._pending.values() for _, task in p),
+            "eval_p50_ms": 1000 * percentile(self.eval_seconds, 50),
+            "eval_p95_ms": 1000 * percentile(self.eval_seconds, 95),
+        }
+
+
+evaluation_queue = EvaluationQueue()
+turn_latency = TurnLatency()
+
+
+def merge_evaluations(saved: List[QuestionEvaluation], results: List[QuestionEvaluation]) -> List[QuestionEvaluation]:
+    """``saved`` plus the results for questions it does not have yet."""
+    questions = {e.question for e in saved}
+    return saved + [r for r in results if r.question not in questions]
+
+
+# Graph nodes
+async def pipelined_evaluate_answer(state: InterviewState, config: RunnableConfig) -> dict:
+    thread_id = thread_id_of(config)
+    evaluation_queue.forget(thread_id, state.evaluations)
+    evaluation_queue.submit(thread_id, state.current_question, state.last_user_input)
+    msg = ACKNOWLEDGEMENTS[state.question_count % len(ACKNOWLEDGEMENTS)]
+    update = {
+        "messages": [AIMessage(content=msg)],
+        "question_count": state.question_count + 1,
+        "evaluations": merge_evaluations(state.evaluations, evaluation_queue.finished(thread_id))
+    }
+    return update
+
+def starts_answer_turn(node):
+    """Wrap the question router: the candidate's answer has arrived."""
+    takes_config = "config" in inspect.signature(node).parameters
+
+    async def wrapper(state: InterviewState, config: RunnableConfig) -> dict:
+        turn_latency.start(thread_id_of(config))
+        return await (node(state, config) if takes_config else node(state))
+
+    wrapper.__name__ = node.__name__
+    return wrapper
+
+def ends_answer_turn(node, mode: str):
+    """Wrap the node that speaks after an answer (next question or closing line)."""
+    takes_config = "config" in inspect.signature(node).parameters
+
+    async def wrapper(state: InterviewState, config: RunnableConfig) -> dict:
+        update = await (node(state, config) if takes_config else node(state))
+        turn_latency.finish(thread_id_of(config), mode)
+        return update
+
+    wrapper.__name__ = node.__name__
+    return wrapper
+
+def drains_evaluations(node):
+    """Wrap a terminal node so it first waits for outstanding evaluations."""
+    takes_config = "config" in inspect.signature(node).parameters
+
+    async def wrapper(state: InterviewState, config: RunnableConfig) -> dict:
+        thread_id = thread_id_of(config)
+        evaluation_queue.forget(thread_id, state.evaluations)
+        evaluations = await evaluation_queue.drain(thread_id)
+        update = await (node(state, config) if takes_config else node(state))
+        if evaluations:
+            update["evaluations"] = merge_evaluations(state.evaluations, evaluations)
+            latest = evaluations[-1]
+            update.update(correct=latest.correct, short_feedback=latest.short_feedback, correction=latest.correction)
+        return update
+
+    wrapper.__name__ = node.__name__
+    return wrapper
@@ -1,15 +1,32 @@
+from typing import Optional
+
 from langgraph.graph import StateGraph, END
-from langgraph.checkpoint.memory import MemorySaver
+from langgraph.checkpoint.base import BaseCheckpointSaver
 
+from app import config
 from app.core.state import InterviewState
+from app.core.checkpointer import build_checkpointer
 from app.core.nodes import (
     load_candidate_context,
     intro_hook, quit_call, end_call, goodbye_node,
     identity_router, identity_repeat,
     topic_ask, topic_router, topic_repeat,
     difficulty_ask, difficulty_router, difficulty_repeat,
-    prepare_question_pool, ask_question, question_intent_router, question_repeat, evaluate_answer
+    prepare_question_pool, ask_question, question_intent_router, question_repeat, evaluate_answer,
+    answer_turn_router
+)
+from app.core.speculation import (
+    speculative_topic_router, speculative_prepare_question_pool, speculative_goodbye_node
 )
+from app.core.evaluation_queue import (
+    pipelined_evaluate_answer, drains_evaluations, starts_answer_turn, ends_answer_turn
+)
+from app.core.streaming_reply import streaming_evaluate_answer
+from app.services.report_service import enqueues_report
+from app.utils.logger import traced_node
+
+# The process-wide compiled graph (see get_graph)
+_graph = None
 
 def route_identity(state: InterviewState) -> str:
     if state.intent == "valid":
@@ -48,38 +65,82 @@ def check_questions_done(state: InterviewState) -> str:
         return "end_call"
     return "ask_question"
 
-def build_graph():
+def route_answer_turn(state: InterviewState) -> str:
+    # Fused mode: an "answer" has already been evaluated by the router
+    if state.intent == "answer":
+        return check_questions_done(state)
+    elif state.intent == "quit":
+        return "goodbye_node"
+    else:
+        return "question_repeat"
+
+def build_graph(
+    speculative_pool: bool = config.SPECULATIVE_POOL_ENABLED,
+    fused_answer: bool = config.FUSED_ANSWER_ENABLED,
+    pipelined_evaluation: bool = config.PIPELINED_EVALUATION_ENABLED,
+    streaming_feedback: bool = config.STREAMING_FEEDBACK_ENABLED,
+    feedback_reports: bool = config.REPORTS_ENABLED,
+    checkpointer: Optional[BaseCheckpointSaver] = None,
+):
+    # Pipelined evaluation takes scoring off the critical path entirely, and
+    # streamed feedback needs its own evaluation call; both supersede the
+    # fused classify-and-evaluate call.
+    fused_answer = fused_answer and not pipelined_evaluation and not streaming_feedback
+    mode = ("pipelined" if pipelined_evaluation else "streaming" if streaming_feedback
+            else "fused" if fused_answer else "inline")
     workflow = StateGraph(InterviewState)
 
+    def add_node(name: str, node) -> None:
+        # Every node gets a timing span when METRICS_ENABLED is on
+        workflow.add_node(name, traced_node(name, node))
+
     # Context & Hooks
-    workflow.add_node("load_candidate_context", load_candidate_context)
-    workflow.add_node("intro_hook", intro_hook)
+    add_node("load_candidate_context", load_candidate_context)
+    add_node("intro_hook", intro_hook)
     
     # Terminal nodes
-    workflow.add_node("quit_call", quit_call)
-    workflow.add_node("end_call", end_call)
-    workflow.add_node("goodbye_node", goodbye_node)
+    add_node("quit_call", quit_call)
+    end = end_call
+    goodbye = speculative_goodbye_node if speculative_pool else goodbye_node
+    if pipelined_evaluation:
+        end, goodbye = drains_evaluations(end), drains_evaluations(goodbye)
+    # The last answer's turn ends with the closing line
+    end = ends_answer_turn(end, mode)
+    if feedback_reports:
+        # Outermost, so the queued report sees drained evaluations too
+        end, goodbye = enqueues_report(end), enqueues_report(goodbye)
+    add_node("end_call", end)
+    add_node("goodbye_node", goodbye)
 
     # Identity
-    workflow.add_node("identity_router", identity_router)
-    workflow.add_node("identity_repeat", identity_repeat)
+    add_node("identity_router", identity_router)
+    add_node("identity_repeat", identity_repeat)
     
     # Topic
-    workflow.add_node("topic_ask", topic_ask)
-    workflow.add_node("topic_router", topic_router)
-    workflow.add_node("topic_repeat", topic_repeat)
+    add_node("topic_ask", topic_ask)
+    add_node("topic_router", speculative_topic_router if speculative_pool else topic_router)
+    add_node("topic_repeat", topic_repeat)
 
     # Difficulty
-    workflow.add_node("difficulty_ask", difficulty_ask)
-    workflow.add_node("difficulty_router", difficulty_router)
-    workflow.add_node("difficulty_repeat", difficulty_repeat)
+    add_node("difficulty_ask", difficulty_ask)
+    add_node("difficulty_router", difficulty_router)
+    add_node("difficulty_repeat", difficulty_repeat)
 
     # Questions
-    workflow.add_node("prepare_question_pool", prepare_question_pool)
-    workflow.add_node("ask_question", ask_question)
-    workflow.add_node("question_intent_router", question_intent_router)
-    workflow.add_node("question_repeat", question_repeat)
-    workflow.add_node("evaluate_answer", evaluate_answer)
+    add_node(
+        "prepare_question_pool",
+        speculative_prepare_question_pool if speculative_pool else prepare_question_pool
+    )
+    add_node("ask_question", ends_answer_turn(ask_question, mode))
+    add_node("question_intent_router",
+             starts_answer_turn(answer_turn_router if fused_answer else question_intent_router))
+    add_node("question_repeat", question_repeat)
+    if pipelined_evaluation:
+        add_node("evaluate_answer", pipelined_evaluate_answer)
+    elif streaming_feedback:
+        add_node("evaluate_answer", streaming_evaluate_answer)
+    elif not fused_answer:
+        add_node("evaluate_answer", evaluate_answer)
 
     # Entry
     workflow.set_entry_point("load_candidate_context")
@@ -101,19 +162,20 @@ def build_graph():
 
     workflow.add_edge("prepare_question_pool", "ask_question")
     workflow.add_edge("ask_question", "question_intent_router")
-    workflow.add_conditional_edges("question_intent_router", route_question_intent)
     workflow.add_edge("question_repeat", "question_intent_router")
-    
-    workflow.add_conditional_edges("evaluate_answer", check_questions_done)
+    if fused_answer:
+        workflow.add_conditional_edges("question_intent_router", route_answer_turn)
+    else:
+        workflow.add_conditional_edges("question_intent_router", route_question_intent)
+        workflow.add_conditional_edges("evaluate_answer", check_questions_done)
 
     # Terminal connections
     workflow.add_edge("quit_call", END)
     workflow.add_edge("end_call", END)
     workflow.add_edge("goodbye_node", END)
 
-    memory = MemorySaver()
     return workflow.compile(
-        checkpointer=memory,
+        checkpointer=checkpointer or build_checkpointer(),
         interrupt_before=[
             "identity_router", 
             "topic_router", 
@@ -121,3 +183,14 @@ def build_graph():
             "question_intent_router"
         ]
     )
+
+def get_graph():
+    """The compiled graph for this process, built on first use.
+
+    A compiled graph holds no per-call state (that lives in the checkpointer,
+    keyed by thread_id), so every session in a worker shares this one.
+    """
+    global _graph
+    if _graph is None:
+        _graph = build_graph()
+    return _graph
@@ -0,0 +1,312 @@
+"""Deterministic fast-path intent classifier.
+
+Obvious replies ("yes", "medium", "can you repeat that", "stop") are answered
+locally from phrase tables. Anything the tables cannot explain with enough
+confidence returns ``None`` so the router falls back to the LLM.
+"""
+
+import re
+from collections import Counter
+from difflib import SequenceMatcher
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from pydantic import BaseModel
+
+from app import config
+
+
+class LocalIntent(BaseModel):
+    intent: str
+    confidence: float
+    value: Optional[str] = None
+
+
+# Phrase tables — (intent, value) -> phrases
+REPEAT_PHRASES = [
+    "repeat", "repeat that", "repeat the question", "come again", "pardon",
+    "sorry", "what", "say that again", "say it again", "once more", "again",
+    "i didnt get that", "i didnt get you", "i didnt hear", "didnt catch that",
+    "can you hear me", "hello", "what did you say", "what was the question",
+]
+
+QUIT_PHRASES = [
+    "quit", "stop", "exit", "end the call", "end the interview", "bye",
+    "goodbye", "i want to stop", "i want to quit", "not interested",
+    "leave it", "cut the call", "hang up", "lets stop", "stop the interview",
+]
+
+# A denial next to one of these (or the candidate's name) is not a plain "no"
+SELF_IDENTIFICATION = ["i am", "im", "this is", "my name is", "myself"]
+
+IDENTITY_TABLE: Dict[Tuple[str, Optional[str]], List[str]] = {
+    ("valid", None): [
+        "yes", "yeah", "yep", "yup", "haan", "ha", "speaking", "its me",
+        "thats me", "this is me", "correct", "right", "sure", "of course",
+        "absolutely",
+    ],
+    ("not_valid", None): [
+        "no", "nope", "wrong number", "not me", "you have the wrong number",
+        "he is not here", "she is not here", "they are not here", "not available",
+    ],
+    ("repeat", None): REPEAT_PHRASES + ["who is this", "who is calling", "whos calling"],
+}
+
+DIFFICULTY_TABLE: Dict[Tuple[str, Optional[str]], List[str]] = {
+    ("difficulty_answer", "beginner"): [
+        "beginner", "easy", "basic", "basics", "simple", "entry level", "low",
+        "beginner level", "fresher",
+    ],
+    ("difficulty_answer", "medium"): [
+        "medium", "intermediate", "moderate", "mid", "normal", "average",
+        "medium level",
+    ],
+    ("difficulty_answer", "hard"): [
+        "hard", "advanced", "difficult", "tough", "expert", "hard level",
+    ],
+    ("repeat", None): REPEAT_PHRASES + ["what are the options", "options"],
+    ("quit", None): QUIT_PHRASES,
+}
+
+QUESTION_TABLE: Dict[Tuple[str, Optional[str]], List[str]] = {
+    ("repeat", None): REPEAT_PHRASES + [
+        "repeat the question please", "can you rephrase", "rephrase",
+        "i didnt understand the question",
+    ],
+    ("quit", None): QUIT_PHRASES,
+    ("answer", None): [
+        "i dont know", "dont know", "no idea", "not sure", "i am not sure",
+        "i have no idea", "i forgot", "skip",
+    ],
+}
+
+# Canonical topic -> spoken aliases (after normalization)
+TOPIC_ALIASES: Dict[str, List[str]] = {
+    "Python": ["python"],
+    "Java": ["java", "core java"],
+    "JavaScript": ["javascript", "js", "java script"],
+    "TypeScript": ["typescript", "type script"],
+    "React": ["react", "reactjs", "react js"],
+    "Node.js": ["node", "nodejs", "node js"],
+    "Angular": ["angular", "angularjs"],
+    "HTML": ["html"],
+    "CSS": ["css"],
+    "SQL": ["sql", "mysql", "postgres", "postgresql"],
+    "MongoDB": ["mongodb", "mongo", "mongo db"],
+    "DBMS": ["dbms", "database", "databases", "database management system"],
+    "Data Structures": ["data structures", "dsa", "data structures and algorithms"],
+    "Algorithms": ["algorithms"],
+    "Operating Systems": ["operating system", "operating systems", "os"],
+    "Computer Networks": ["computer networks", "networking", "cn"],
+    "OOP": ["oop", "oops", "object oriented programming"],
+    "C": ["c", "c language", "c programming"],
+    "C++": ["cpp"],
+    "C#": ["csharp"],
+    "Django": ["django"],
+    "Flask": ["flask"],
+    "Spring Boot": ["spring", "spring boot", "springboot"],
+    "Machine Learning": ["machine learning", "ml"],
+    "Git": ["git"],
+}
+
+TOPIC_TABLE: Dict[Tuple[str, Optional[str]], List[str]] = {
+    ("topic_valid", name): aliases for name, aliases in TOPIC_ALIASES.items()
+}
+TOPIC_TABLE[("repeat", None)] = REPEAT_PHRASES + ["what are the options", "options"]
+TOPIC_TABLE[("quit", None)] = QUIT_PHRASES
+
+# Words that carry no intent on their own; they neither help nor hurt coverage
+FILLER_WORDS = {
+    "a", "an", "the", "um", "uh", "umm", "hmm", "ok", "okay", "so", "well",
+    "please", "sir", "maam", "madam", "just", "actually", "i", "im", "am",
+    "is", "it", "its", "this", "that", "me", "my", "you", "can", "could",
+    "would", "will", "lets", "go", "with", "do", "on", "in", "about", "for",
+    "like", "want", "to", "be", "prefer", "choose", "take", "level", "topic",
+    "interview", "interviewed", "one", "think", "guess", "oh", "ah", "and",
+}
+
+FUZZY_MIN_LENGTH = 4
+FUZZY_MIN_RATIO = 0.8
+ANSWER_MIN_WORDS = 3
+
+
+def normalize(text: str) -> List[str]:
+    text = (text or "").lower()
+    text = text.replace("c++", " cpp ").replace("c#", " csharp ")
+    text = re.sub(r"(?<=\w)\.(?=\w)", "", text)
+    text = text.replace("'", "").replace("’", "")
+    return re.findall(r"[a-z0-9]+", text)
+
+
+def _compile(table: Dict[Tuple[str, Optional[str]], List[str]]):
+    return [(key, tuple(normalize(p))) for key, phrases in table.items() for p in phrases]
+
+
+_IDENTITY = _compile(IDENTITY_TABLE)
+_TOPIC = _compile(TOPIC_TABLE)
+_DIFFICULTY = _compile(DIFFICULTY_TABLE)
+_QUESTION = _compile(QUESTION_TABLE)
+
+
+def _token_similarity(a: str, b: str) -> float:
+    if a == b:
+        return 1.0
+    if len(a) < FUZZY_MIN_LENGTH or len(b) < FUZZY_MIN_LENGTH:
+        return 0.0
+    ratio = SequenceMatcher(None, a, b).ratio()
+    return ratio if ratio >= FUZZY_MIN_RATIO else 0.0
+
+
+def _score(tokens: List[str], compiled, extra_fillers: Iterable[str] = ()) -> Optional[LocalIntent]:
+    """Match phrases against tokens and score by how much of the reply they explain."""
+    if not tokens:
+        return None
+
+    weights: Dict[int, float] = {}
+    owners: Dict[int, Tuple[str, Optional[str]]] = {}
+
+    # Multi-word phrases match exactly, longest first so "end the call" wins over "end"
+    for key, phrase in sorted(compiled, key=lambda item: -len(item[1])):
+        n = len(phrase)
+        if n == 1:
+            break
+        for start in range(len(tokens) - n + 1):
+            span = range(start, start + n)
+            if any(i in owners for i in span):
+                continue
+            if tuple(tokens[start:start + n]) == phrase:
+                for i in span:
+                    weights[i] = 1.0
+                    owners[i] = key
+
+    # Remaining single tokens take their closest keyword, tolerating typos
+    words = [(key, phrase[0]) for key, phrase in compiled if len(phrase) == 1]
+    for i, tok in enumerate(tokens):
+        if i in owners:
+            continue
+        best_key, best = None, 0.0
+        for key, word in words:
+            similarity = _token_similarity(tok, word)
+            if similarity > best:
+                best_key, best = key, similarity
+                if similarity == 1.0:
+                    break
+        if best_key is not None:
+            weights[i] = best
+            owners[i] = best_key
+
+    matched = set(owners.values())
+    if len(matched) != 1:
+        return None
+
+    fillers = FILLER_WORDS.union(extra_fillers)
+    covered = sum(
+        weights[i] if i in owners else (1.0 if tok in fillers else 0.0)
+        for i, tok in enumerate(tokens)
+    )
+    intent, value = matched.pop()
+    return LocalIntent(intent=intent, value=value, confidence=round(covered / len(tokens), 3))
+
+
+class IntentStats:
+    """Counts how often each router was answered locally vs. by the LLM."""
+
+    def __init__(self):
+        self.local_hits: Counter = Counter()
+        self.llm_fallbacks: Counter = Counter()
+
+    def record(self, router: str, hit: bool) -> None:
+        if hit:
+            self.local_hits[router] += 1
+        else:
+            self.llm_fallbacks[router] += 1
+
+    def reset(self) -> None:
+        self.local_hits.clear()
+        self.llm_fallbacks.clear()
+
+    def snapshot(self) -> dict:
+        routers = set(self.local_hits) | set(self.llm_fallbacks)
+        stats = {}
+        for router in sorted(routers):
+            hits, misses = self.local_hits[router], self.llm_fallbacks[router]
+            stats[router] = {
+                "local_hits": hits,
+                "llm_fallbacks": misses,
+                "hit_rate": hits / (hits + misses),
+            }
+        total_hits = sum(self.local_hits.values())
+        total = total_hits + sum(self.llm_fallbacks.values())
+        stats["total"] = {
+            "local_hits": total_hits,
+            "llm_fallbacks": total - total_hits,
+            "hit_rate": total_hits / total if total else 0.0,
+        }
+        return stats
+
+
+intent_stats = IntentStats()
+
+
+def _resolve(router: str, result: Optional[LocalIntent], record: bool = True) -> Optional[LocalIntent]:
+    if result is not None and result.confidence < config.LOCAL_INTENT_THRESHOLD:
+        result = None
+    if record:
+        intent_stats.record(router, result is not None)
+    return result
+
+
+# ``record=False`` classifies without counting towards intent_stats (e.g. speculation on partials)
+def classify_identity(text: str, student_name: str = "", record: bool = True) -> Optional[LocalIntent]:
+    if not config.LOCAL_INTENT_ENABLED:
+        return None
+    tokens = normalize(text)
+    if not tokens:
+        return _resolve("identity", LocalIntent(intent="silence", confidence=1.0), record)
+    name = normalize(student_name)
+    result = _score(tokens, _IDENTITY, extra_fillers=name)
+    if result is not None and result.intent == "not_valid" and _identifies_self(tokens, name):
+        # "no no, I am Jayanth" corrects the line, it does not deny it; leave it to the LLM
+        result = None
+    return _resolve("identity", result, record)
+
+
+def classify_topic(text: str, record: bool = True) -> Optional[LocalIntent]:
+    if not config.LOCAL_INTENT_ENABLED:
+        return None
+    return _resolve("topic", _score(normalize(text), _TOPIC), record)
+
+
+def classify_difficulty(text: str, record: bool = True) -> Optional[LocalIntent]:
+    if not config.LOCAL_INTENT_ENABLED:
+        return None
+    return _resolve("difficulty", _score(normalize(text), _DIFFICULTY), record)
+
+
+def classify_question_reply(text: str, record: bool = True) -> Optional[LocalIntent]:
+    if not config.LOCAL_INTENT_ENABLED:
+        return None
+    tokens = normalize(text)
+    result = _score(tokens, _QUESTION)
+    if result is None and len(tokens) >= ANSWER_MIN_WORDS and not _mentions_any(tokens, _QUESTION):
+        # No repeat/quit cue anywhere in a real sentence -> it's an answer
+        result = LocalIntent(intent="answer", confidence=0.9)
+    return _resolve("question", result, record)
+
+
+def _identifies_self(tokens: List[str], name: List[str]) -> bool:
+    joined = f" {' '.join(tokens)} "
+    return any(token in name for token in tokens) or any(f" {cue} " in joined for cue in SELF_IDENTIFICATION)
+
+
+def _mentions_any(tokens: List[str], compiled) -> bool:
+    joined = f" {' '.join(tokens)} "
+    return any(f" {' '.join(phrase)} " in joined for _, phrase in compiled)
+
+
+def canonical_topic(text: str) -> Optional[str]:
+    """Map a spoken topic ("react js", "ReactJS") to its canonical name, if known."""
+    tokens = normalize(text)
+    result = _score(tokens, _TOPIC)
+    if result is None or result.intent != "topic_valid" or result.confidence < 1.0:
+        return None
+    return result.value
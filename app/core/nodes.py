@@ -1,7 +1,14 @@
+import asyncio
+import logging
+import time
+from typing import Dict, List, Optional, Set
+
 from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
-from app.core.state import InterviewState
+from langchain_core.runnables import RunnableConfig
+from app.core.state import InterviewState, QuestionEvaluation
 from app.models.schemas import (
-    IdentityIntent, TopicIntent, DifficultyIntent, QuestionBatch, QuestionIntent, EvaluationSchema
+    IdentityIntent, TopicIntent, DifficultyIntent, QuestionBatch, QuestionIntent, EvaluationSchema,
+    AnswerTurn
 )
 from app.core.prompts import (
     build_system_prompt,
@@ -9,9 +16,22 @@ from app.core.prompts import (
     DIFFICULTY_ROUTER_SYSTEM_PROMPT,
     QUESTION_POOL_SYSTEM_PROMPT,
     QUESTION_ROUTER_SYSTEM_PROMPT,
-    EVALUATION_SYSTEM_PROMPT
+    EVALUATION_SYSTEM_PROMPT,
+    ANSWER_TURN_SYSTEM_PROMPT,
+    INTRO_TEMPLATE, IDENTITY_CONFIRM_TEMPLATE, QUESTION_REPEAT_TEMPLATE,
+    SILENCE_PROMPT, TOPIC_ASK, TOPIC_REPEAT, DIFFICULTY_ASK, DIFFICULTY_REPEAT,
+    OUT_OF_QUESTIONS, QUIT_CALL, END_CALL, GOODBYE, FALLBACK_FEEDBACK
+)
+from app.core.intent import (
+    classify_identity, classify_topic, classify_difficulty, classify_question_reply
 )
-from app.services.llm_service import get_llm, get_fast_llm
+from app.core.router_prefetch import router_prefetch
+from app.services.evaluation_cache import evaluation_cache
+from app.services.llm_service import get_llm, get_fast_llm, invoke_structured
+from app.services.question_bank import candidate_key, question_bank
+from app.utils.helpers import thread_id_of
+
+logger = logging.getLogger("intervu.nodes")
 
 async def load_candidate_context(state: InterviewState) -> dict:
     return {"messages": [SystemMessage(content=build_system_prompt(
@@ -19,204 +39,344 @@ async def load_candidate_context(state: InterviewState) -> dict:
     ))]}
 
 async def intro_hook(state: InterviewState) -> dict:
-    response = f"Hello! This is the interview agent. Am I speaking to {state.student_name}?"
+    response = INTRO_TEMPLATE.format(student_name=state.student_name)
     return {"messages": [AIMessage(content=response)]}
 
 async def quit_call(state: InterviewState) -> dict:
-    msg = "Sorry about that. I'll end the call here. Have a good day."
+    msg = QUIT_CALL
     return {"messages": [AIMessage(content=msg)]}
 
 async def end_call(state: InterviewState) -> dict:
-    msg = "Thank you! Have a great day, Goodbye!"
+    msg = END_CALL
     return {"messages": [AIMessage(content=msg)]}
 
 async def goodbye_node(state: InterviewState) -> dict:
-    msg = "Thanks for your time. You'll receive detailed feedback soon. All the best."
+    msg = GOODBYE
     return {"messages": [AIMessage(content=msg)]}
 
+# Router LLM calls — also started early on a stable partial (app.core.speculative_intent)
+async def identity_llm(state: InterviewState, user_text: str) -> IdentityIntent:
+    return await invoke_structured(get_fast_llm(), IdentityIntent,
+        f"""
+        The assistant asked: "Am I speaking to {state.student_name}?"
+        Classify the user's reply.
+        Rules:
+        - If clearly yes -> valid
+        - If clearly no -> not_valid
+        - If asking to repeat or unclear -> repeat
+        - If empty or meaningless -> silence
+        User reply: {user_text}
+        """
+    )
+
+async def topic_llm(state: InterviewState, user_text: str) -> TopicIntent:
+    return await invoke_structured(get_fast_llm(), TopicIntent, [
+        SystemMessage(content=TOPIC_ROUTER_SYSTEM_PROMPT),
+        HumanMessage(content=f'The assistant asked:\n"Which topic would you like to be interviewed on today?"\n\nUser reply:\n"{user_text}"')
+    ])
+
+async def difficulty_llm(state: InterviewState, user_text: str) -> DifficultyIntent:
+    return await invoke_structured(get_fast_llm(), DifficultyIntent, [
+        SystemMessage(content=DIFFICULTY_ROUTER_SYSTEM_PROMPT),
+        HumanMessage(content=f'The assistant asked:\n"What difficulty level would you prefer — beginner, medium, or hard?"\n\nUser reply:\n"{user_text}"')
+    ])
+
+async def question_intent_llm(state: InterviewState, user_text: str) -> QuestionIntent:
+    return await invoke_structured(get_fast_llm(), QuestionIntent, [
+        SystemMessage(content=QUESTION_ROUTER_SYSTEM_PROMPT),
+        HumanMessage(content=f'Question: {state.current_question}\n\nUser reply:\n"{user_text}"')
+    ])
+
+async def answer_turn_llm(state: InterviewState, user_text: str) -> AnswerTurn:
+    return await invoke_structured(get_fast_llm(), AnswerTurn, [
+        SystemMessage(content=ANSWER_TURN_SYSTEM_PROMPT),
+        HumanMessage(content=f'Question: {state.current_question}\n\nUser reply:\n"{user_text}"')
+    ])
+
+async def router_llm(config: Optional[RunnableConfig], router: str, call, state: InterviewState, user_text: str):
+    """The router's LLM result, reusing one started on a matching partial."""
+    prefetched = await router_prefetch.take(thread_id_of(config), router, user_text)
+    return prefetched if prefetched is not None else await call(state, user_text)
+
 # Identity
-async def identity_router(state: InterviewState) -> dict:
+async def identity_router(state: InterviewState, config: Optional[RunnableConfig] = None) -> dict:
     user_text = state.last_user_input or ""
-    structured_llm = get_fast_llm().with_structured_output(IdentityIntent)
-    
-    # Try multiple times in case of structured output failure
-    for attempt in range(3):
-        try:
-            result = await structured_llm.ainvoke(
-                f"""
-                The assistant asked: "Am I speaking to {state.student_name}?"
-                Classify the user's reply.
-                Rules:
-                - If clearly yes -> valid
-                - If clearly no -> not_valid
-                - If asking to repeat or unclear -> repeat
-                - If empty or meaningless -> silence
-                User reply: {user_text}
-                """
-            )
-            return {"intent": result.intent, "messages": [HumanMessage(content=user_text)]}
-        except Exception as e:
-            print(f"Error in identity_router: {e}")
-            pass
+    local = classify_identity(user_text, state.student_name)
+    if local is not None:
+        return {"intent": local.intent, "messages": [HumanMessage(content=user_text)]}
+
+    # Retries with backoff happen inside the shared LLM client
+    try:
+        result = await router_llm(config, "identity_router", identity_llm, state, user_text)
+        return {"intent": result.intent, "messages": [HumanMessage(content=user_text)]}
+    except Exception as e:
+        print(f"Error in identity_router: {e}")
     return {"intent": "repeat", "messages": [HumanMessage(content=user_text)]}
 
 async def identity_repeat(state: InterviewState) -> dict:
     if state.intent == "silence":
-        msg = "Hello? Can you hear me?"
+        msg = SILENCE_PROMPT
     else:
-        msg = f"Sure. I just wanted to confirm — am I speaking to {state.student_name}?"
+        msg = IDENTITY_CONFIRM_TEMPLATE.format(student_name=state.student_name)
     return {"messages": [AIMessage(content=msg)]}
 
 
 # Topic Flow
 async def topic_ask(state: InterviewState) -> dict:
-    msg = "Which topic would you like to be interviewed on today?"
+    msg = TOPIC_ASK
     return {"messages": [AIMessage(content=msg)]}
 
-async def topic_router(state: InterviewState) -> dict:
+async def topic_router(state: InterviewState, config: Optional[RunnableConfig] = None) -> dict:
     user_text = (state.last_user_input or "").strip()
     if user_text == "":
         return {"intent": "silence", "messages": [HumanMessage(content=user_text)]}
-    
-    topic_llm = get_fast_llm().with_structured_output(TopicIntent)
-    for attempt in range(3):
-        try:
-            result = await topic_llm.ainvoke([
-                SystemMessage(content=TOPIC_ROUTER_SYSTEM_PROMPT),
-                HumanMessage(content=f'The assistant asked:\n"Which topic would you like to be interviewed on today?"\n\nUser reply:\n"{user_text}"')
-            ])
-            return {
-                "intent": result.intent, 
-                "topic": result.extracted_topic or state.topic,
-                "messages": [HumanMessage(content=user_text)]
-            }
-        except Exception as e:
-            print(f"Error in topic_router: {e}")
-            pass
+
+    local = classify_topic(user_text)
+    if local is not None:
+        return {
+            "intent": local.intent,
+            "topic": local.value or state.topic,
+            "messages": [HumanMessage(content=user_text)]
+        }
+
+    try:
+        result = await router_llm(config, "topic_router", topic_llm, state, user_text)
+        return {
+            "intent": result.intent, 
+            "topic": result.extracted_topic or state.topic,
+            "messages": [HumanMessage(content=user_text)]
+        }
+    except Exception as e:
+        print(f"Error in topic_router: {e}")
     return {"intent": "repeat", "messages": [HumanMessage(content=user_text)]}
 
 async def topic_repeat(state: InterviewState) -> dict:
     if state.intent == "silence":
-        msg = "Hello? Can you hear me?"
+        msg = SILENCE_PROMPT
     else:
-        msg = "No problem. Which topic would you like to go with?"
+        msg = TOPIC_REPEAT
     return {"messages": [AIMessage(content=msg)]}
 
 
 # Difficulty Flow
 async def difficulty_ask(state: InterviewState) -> dict:
-    msg = "What difficulty level would you prefer — beginner, medium, or hard?"
+    msg = DIFFICULTY_ASK
     return {"messages": [AIMessage(content=msg)]}
 
-async def difficulty_router(state: InterviewState) -> dict:
+async def difficulty_router(state: InterviewState, config: Optional[RunnableConfig] = None) -> dict:
     user_text = (state.last_user_input or "").strip()
     if user_text == "":
         return {"intent": "silence", "messages": [HumanMessage(content=user_text)]}
-    
-    difficulty_llm = get_fast_llm().with_structured_output(DifficultyIntent)
-    for attempt in range(3):
-        try:
-            result = await difficulty_llm.ainvoke([
-                SystemMessage(content=DIFFICULTY_ROUTER_SYSTEM_PROMPT),
-                HumanMessage(content=f'The assistant asked:\n"What difficulty level would you prefer — beginner, medium, or hard?"\n\nUser reply:\n"{user_text}"')
-            ])
-            if result.intent == "unknown":
-                return {"intent": "repeat", "messages": [HumanMessage(content=user_text)]}
-            return {
-                "intent": result.intent, 
-                "difficulty": result.extracted_difficulty or state.difficulty,
-                "messages": [HumanMessage(content=user_text)]
-            }
-        except Exception as e:
-            print(f"Error in difficulty_router: {e}")
-            pass
+
+    local = classify_difficulty(user_text)
+    if local is not None:
+        return {
+            "intent": local.intent,
+            "difficulty": local.value or state.difficulty,
+            "messages": [HumanMessage(content=user_text)]
+        }
+
+    try:
+        result = await router_llm(config, "difficulty_router", difficulty_llm, state, user_text)
+        if result.intent == "unknown":
+            return {"intent": "repeat", "messages": [HumanMessage(content=user_text)]}
+        return {
+            "intent": result.intent, 
+            "difficulty": result.extracted_difficulty or state.difficulty,
+            "messages": [HumanMessage(content=user_text)]
+        }
+    except Exception as e:
+        print(f"Error in difficulty_router: {e}")
     return {"intent": "repeat", "messages": [HumanMessage(content=user_text)]}
 
 async def difficulty_repeat(state: InterviewState) -> dict:
     if state.intent == "silence":
-        msg = "Hello? Can you hear me?"
+        msg = SILENCE_PROMPT
     else:
-        msg = "Sure. Would you like beginner, medium, or hard?"
+        msg = DIFFICULTY_REPEAT
     return {"messages": [AIMessage(content=msg)]}
 
 
 # Question Flow
+async def generate_questions(topic: str, difficulty: str) -> List[str]:
+    prompt = QUESTION_POOL_SYSTEM_PROMPT.format(topic=topic, difficulty=difficulty)
+    result = await invoke_structured(get_llm(), QuestionBatch, prompt)
+    return result.questions
+
+# Background top-ups of thin bank cells: one at a time per cell, and none for
+# a while after one that only produced duplicates
+REFILL_COOLDOWN_SECONDS = 3600
+_refills: Dict[str, asyncio.Task] = {}
+_refill_cooldown: Dict[str, float] = {}
+
+async def refill_question_bank(topic: str, difficulty: str) -> int:
+    questions = await generate_questions(topic, difficulty)
+    added = question_bank.add(topic, difficulty, questions)
+    if not added:
+        _refill_cooldown[question_bank.cell(topic, difficulty)] = time.monotonic() + REFILL_COOLDOWN_SECONDS
+    return added
+
+def _refill_in_background(topic: str, difficulty: str) -> None:
+    cell = question_bank.cell(topic, difficulty)
+    if cell in _refills or _refill_cooldown.get(cell, 0.0) > time.monotonic():
+        return
+
+    async def refill():
+        try:
+            await refill_question_bank(topic, difficulty)
+        except Exception as e:
+            logger.warning("Background refill of %s failed: %s", cell, e)
+        finally:
+            _refills.pop(cell, None)
+
+    _refills[cell] = asyncio.create_task(refill())
+
+async def draw_question_pool(topic: str, difficulty: str, size: int, candidate: Optional[str]) -> List[str]:
+    if not question_bank.enabled:
+        return await generate_questions(topic, difficulty)
+
+    questions = question_bank.sample(topic, difficulty, size, candidate)
+    if len(questions) == size:
+        # Enough for this interview; grow the cell without holding the candidate up
+        if question_bank.is_thin(topic, difficulty):
+            _refill_in_background(topic, difficulty)
+        return questions
+
+    try:
+        await refill_question_bank(topic, difficulty)
+    except Exception as e:
+        if not question_bank.size(topic, difficulty):
+            raise
+        logger.warning("Refill of %s failed; serving from the bank: %s", question_bank.cell(topic, difficulty), e)
+    questions = question_bank.sample(topic, difficulty, size, candidate)
+    if len(questions) < size:
+        # The candidate has seen all the bank has; a repeat beats an empty interview
+        questions += question_bank.sample_repeats(topic, difficulty, size - len(questions), questions)
+    return questions
+
+def state_candidate(state: InterviewState) -> Optional[str]:
+    return candidate_key(state.candidate_id, state.student_name, state.college)
+
 async def prepare_question_pool(state: InterviewState) -> dict:
-    question_gen_llm = get_llm().with_structured_output(QuestionBatch)
-    prompt = QUESTION_POOL_SYSTEM_PROMPT.format(topic=state.topic, difficulty=state.difficulty)
-    result = await question_gen_llm.ainvoke(prompt)
-    return {"question_pool": result.questions, "asked_questions": [], "question_count": 0}
+    questions = await draw_question_pool(state.topic, state.difficulty, state.max_questions, state_candidate(state))
+    return {"question_pool": questions, "asked_questions": [], "question_count": 0}
 
 async def ask_question(state: InterviewState) -> dict:
-    remaining_questions = [q for q in state.question_pool if q not in state.asked_questions]
-    if not remaining_questions:
-        msg = "Looks like we're out of questions."
+    asked: Set[str] = set(state.asked_questions)
+    question = next((q for q in state.question_pool if q not in asked), None)
+    if question is None:
+        msg = OUT_OF_QUESTIONS
         return {"messages": [AIMessage(content=msg)]}
-    
-    question = remaining_questions[0]
+
+    if question_bank.enabled:
+        question_bank.record(state_candidate(state), state.topic, state.difficulty, question)
     return {
         "current_question": question, 
         "asked_questions": state.asked_questions + [question], 
         "messages": [AIMessage(content=question)]
     }
 
-async def question_intent_router(state: InterviewState) -> dict:
+async def question_intent_router(state: InterviewState, config: Optional[RunnableConfig] = None) -> dict:
     user_text = (state.last_user_input or "").strip()
     if user_text == "":
         return {"intent": "silence", "messages": [HumanMessage(content=user_text)]}
-        
-    question_router_llm = get_fast_llm().with_structured_output(QuestionIntent)
-    for attempt in range(3):
-        try:
-            result = await question_router_llm.ainvoke([
-                SystemMessage(content=QUESTION_ROUTER_SYSTEM_PROMPT),
-                HumanMessage(content=f'Question: {state.current_question}\n\nUser reply:\n"{user_text}"')
-            ])
-            if result.intent == "unknown":
-                return {"intent": "answer", "messages": [HumanMessage(content=user_text)]}
-            return {"intent": result.intent, "messages": [HumanMessage(content=user_text)]}
-        except Exception as e:
-            print(f"Error in question_intent_router: {e}")
-            pass
+
+    local = classify_question_reply(user_text)
+    if local is not None:
+        return {"intent": local.intent, "messages": [HumanMessage(content=user_text)]}
+
+    try:
+        result = await router_llm(config, "question_intent_router", question_intent_llm, state, user_text)
+        if result.intent == "unknown":
+            return {"intent": "answer", "messages": [HumanMessage(content=user_text)]}
+        return {"intent": result.intent, "messages": [HumanMessage(content=user_text)]}
+    except Exception as e:
+        print(f"Error in question_intent_router: {e}")
     return {"intent": "answer", "messages": [HumanMessage(content=user_text)]}
 
 async def question_repeat(state: InterviewState) -> dict:
     if state.intent == "silence":
-        msg = "Hello? Can you hear me?"
+        msg = SILENCE_PROMPT
     else:
-        msg = f"No problem. {state.current_question}"
+        msg = QUESTION_REPEAT_TEMPLATE.format(question=state.current_question)
     return {"messages": [AIMessage(content=msg)]}
 
-async def evaluate_answer(state: InterviewState) -> dict:
-    evaluation_llm = get_fast_llm().with_structured_output(EvaluationSchema)
-    
-    for attempt in range(3):
-        try:
-            result = await evaluation_llm.ainvoke([
-                SystemMessage(content=EVALUATION_SYSTEM_PROMPT),
-                HumanMessage(content=f"Question: {state.current_question}\nAnswer: {state.last_user_input}")
-            ])
-            break
-        except Exception as e:
-            print(f"Error in evaluate_answer: {e}")
-            if attempt == 2:
-                # Fallback to a neutral valid response if parsing fails
-                result = EvaluationSchema(
-                    correct=True,
-                    short_feedback="Nice effort! Let's keep going.",
-                    correction=None
-                )
-            continue
-    
-    if result.correct:
+async def run_evaluation(question: str, answer: str) -> EvaluationSchema:
+    cached = evaluation_cache.get(question, answer)
+    if cached is not None:
+        return cached
+    try:
+        result = await invoke_structured(get_fast_llm(), EvaluationSchema, [
+            SystemMessage(content=EVALUATION_SYSTEM_PROMPT),
+            HumanMessage(content=f"Question: {question}\nAnswer: {answer}")
+        ])
+        evaluation_cache.put(question, answer, result)
+        return result
+    except Exception as e:
+        print(f"Error in evaluate_answer: {e}")
+    # Fallback to a neutral valid response if parsing fails
+    return EvaluationSchema(
+        correct=True,
+        short_feedback=FALLBACK_FEEDBACK,
+        correction=None
+    )
+
+def evaluation_record(question: str, answer: str, result: EvaluationSchema) -> QuestionEvaluation:
+    return QuestionEvaluation(
+        question=question,
+        answer=answer,
+        correct=result.correct,
+        short_feedback=result.short_feedback,
+        correction=result.correction
+    )
+
+def evaluation_update(state: InterviewState, result: EvaluationSchema, answer: str) -> dict:
+    if result.correct or not result.correction:
         message = result.short_feedback
     else:
         message = f"{result.short_feedback} A better way is: {result.correction}"
-        
+
     return {
         "correct": result.correct, 
         "short_feedback": result.short_feedback, 
         "correction": result.correction,
         "messages": [AIMessage(content=message)],
-        "question_count": state.question_count + 1
+        "question_count": state.question_count + 1,
+        "evaluations": state.evaluations + [evaluation_record(state.current_question, answer, result)]
     }
+
+async def evaluate_answer(state: InterviewState) -> dict:
+    result = await run_evaluation(state.current_question, state.last_user_input)
+    return evaluation_update(state, result, state.last_user_input)
+
+# Fused answer turn — classify and evaluate in a single call
+async def answer_turn_router(state: InterviewState, config: Optional[RunnableConfig] = None) -> dict:
+    user_text = (state.last_user_input or "").strip()
+    if user_text == "":
+        return {"intent": "silence", "messages": [HumanMessage(content=user_text)]}
+
+    local = classify_question_reply(user_text)
+    if local is not None and local.intent != "answer":
+        return {"intent": local.intent, "messages": [HumanMessage(content=user_text)]}
+
+    # Only replies that were evaluated as answers are ever cached, so a hit settles the intent too
+    cached = evaluation_cache.get(state.current_question, user_text) if local is None else None
+    result = None
+    if local is None and cached is None:
+        try:
+            result = await router_llm(config, "question_intent_router", answer_turn_llm, state, user_text)
+        except Exception as e:
+            logger.warning("answer_turn_router LLM call failed: %s", e)
+
+    if result is not None and result.intent in ("repeat", "quit"):
+        return {"intent": result.intent, "messages": [HumanMessage(content=user_text)]}
+
+    evaluation = cached or (result.evaluation if result is not None else None)
+    if evaluation is None:
+        evaluation = await run_evaluation(state.current_question, user_text)
+    elif cached is None:
+        evaluation_cache.put(state.current_question, user_text, evaluation)
+    update = evaluation_update(state, evaluation, user_text)
+    update["intent"] = "answer"
+    update["messages"] = [HumanMessage(content=user_text)] + update["messages"]
+    return update
@@ -39,3 +39,41 @@ Rules:
 QUESTION_ROUTER_SYSTEM_PROMPT = "You are a strict intent classifier.\nAllowed intents: answer, repeat, quit.\nIf user asks to hear the question again -> repeat.\nIf user wants to stop -> quit.\nOtherwise treat as answer.\nDo not explain."
 
 EVALUATION_SYSTEM_PROMPT = "You are a technical interviewer.\nKeep feedback 5–10 words.\nIf wrong, correction must be short and conversational.\nDo not explain in paragraphs."
+
+ANSWER_TURN_SYSTEM_PROMPT = "You are a technical interviewer on a phone call.\nFirst classify the user's reply. Allowed intents: answer, repeat, quit.\nIf user asks to hear the question again -> repeat.\nIf user wants to stop -> quit.\nOtherwise treat as answer.\nOnly when the intent is answer, also evaluate it: keep feedback 5–10 words, and if wrong, correction must be short and conversational.\nFor repeat or quit leave evaluation empty.\nDo not explain."
+
+STREAMING_EVALUATION_SYSTEM_PROMPT = "You are a technical interviewer on a phone call.\nReply with a JSON object with exactly these keys, in this order: \"correct\" (true or false), \"short_feedback\" (5–10 words), \"correction\" (short and conversational if wrong, otherwise null).\nDo not explain in paragraphs."
+
+REPORT_BATCH_SYSTEM_PROMPT = """\
+You are a senior technical interviewer writing post-interview feedback.
+You will get several independent screening interviews, each starting with "Candidate <ref>".
+Write one report per candidate and copy its ref exactly into candidate_ref.
+For each report:
+- summary: 2-3 sentences on how the candidate did, addressed to them.
+- strengths: up to 3 short points.
+- improvements: up to 3 short, concrete points to study.
+Judge each candidate only on their own answers. Do not compare candidates.
+"""
+
+# Fixed agent utterances — spoken verbatim, so their audio can be pre-rendered
+INTRO_TEMPLATE = "Hello! This is the interview agent. Am I speaking to {student_name}?"
+IDENTITY_CONFIRM_TEMPLATE = "Sure. I just wanted to confirm — am I speaking to {student_name}?"
+QUESTION_REPEAT_TEMPLATE = "No problem. {question}"
+
+SILENCE_PROMPT = "Hello? Can you hear me?"
+TOPIC_ASK = "Which topic would you like to be interviewed on today?"
+TOPIC_REPEAT = "No problem. Which topic would you like to go with?"
+DIFFICULTY_ASK = "What difficulty level would you prefer — beginner, medium, or hard?"
+DIFFICULTY_REPEAT = "Sure. Would you like beginner, medium, or hard?"
+OUT_OF_QUESTIONS = "Looks like we're out of questions."
+QUIT_CALL = "Sorry about that. I'll end the call here. Have a good day."
+END_CALL = "Thank you! Have a great day, Goodbye!"
+GOODBYE = "Thanks for your time. You'll receive detailed feedback soon. All the best."
+FALLBACK_FEEDBACK = "Nice effort! Let's keep going."
+ACKNOWLEDGEMENTS = ["Okay, noted.", "Got it.", "Alright, thanks.", "Okay."]
+
+STATIC_UTTERANCES = [
+    SILENCE_PROMPT, TOPIC_ASK, TOPIC_REPEAT, DIFFICULTY_ASK, DIFFICULTY_REPEAT,
+    OUT_OF_QUESTIONS, QUIT_CALL, END_CALL, GOODBYE, FALLBACK_FEEDBACK,
+    *ACKNOWLEDGEMENTS,
+]
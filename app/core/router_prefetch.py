@@ -0,0 +1,66 @@
+"""Router LLM calls started ahead of the final transcript.
+
+When a stable partial transcript is one the local classifier cannot settle,
+``IntentSpeculator`` starts the LLM call the waiting router would make as a
+background task. Nothing is written to graph state: the router takes the
+result when it runs, and only if the final transcript has the same words as
+the partial. Otherwise the task is cancelled and the router makes its own
+call, exactly as without speculation.
+"""
+
+import asyncio
+from typing import Awaitable, Dict, List, Optional, Tuple
+
+from app.core.intent import normalize
+
+
+class RouterPrefetch:
+    """At most one in-flight router LLM call per thread, with usage metrics."""
+
+    def __init__(self):
+        self._pending: Dict[str, Tuple[str, List[str], asyncio.Task]] = {}
+        self.started = 0
+        self.used = 0
+        self.wasted = 0
+
+    def start(self, thread_id: str, router: str, text: str, call: Awaitable) -> None:
+        self.discard(thread_id)
+        self._pending[thread_id] = (router, normalize(text), asyncio.ensure_future(call))
+        self.started += 1
+
+    async def take(self, thread_id: str, router: str, text: str):
+        """Return the prefetched result for this reply, or None if there is none."""
+        pending = self._pending.pop(thread_id, None)
+        if pending is None:
+            return None
+        prefetched_router, words, task = pending
+        if prefetched_router != router or words != normalize(text):
+            self._drop(task)
+            return None
+        self.used += 1
+        return await task
+
+    def discard(self, thread_id: str) -> None:
+        pending = self._pending.pop(thread_id, None)
+        if pending is not None:
+            self._drop(pending[2])
+
+    def _drop(self, task: asyncio.Task) -> None:
+        self.wasted += 1
+        if not task.done():
+            task.cancel()
+        elif not task.cancelled():
+            task.exception()  # retrieved, so a failed call is not reported as unhandled
+
+    def stats(self) -> dict:
+        finished = self.used + self.wasted
+        return {
+            "started": self.started,
+            "used": self.used,
+            "wasted": self.wasted,
+            "in_flight": len(self._pending),
+            "use_rate": self.used / finished if finished else 0.0,
+        }
+
+
+router_prefetch = RouterPrefetch()
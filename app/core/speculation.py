@@ -0,0 +1,128 @@
+"""Speculative question-pool generation.
+
+As soon as the topic is known we start generating pools for every difficulty
+in the background, so the pool is usually ready by the time the candidate
+answers the difficulty prompt. The matching pool is used and the others are
+cancelled. Costs up to 3x question-generation calls in exchange for removing
+the slowest LLM call from the critical path.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Dict, List, Optional, Tuple
+
+from langchain_core.runnables import RunnableConfig
+
+from app.core.state import InterviewState
+from app.core.nodes import draw_question_pool, state_candidate, topic_router, goodbye_node
+from app.utils.helpers import thread_id_of
+
+logger = logging.getLogger("intervu.speculation")
+
+DIFFICULTIES = ("beginner", "medium", "hard")
+
+
+class PoolSpeculator:
+    """Per-thread background pool generation with hit/miss metrics."""
+
+    def __init__(self):
+        self._tasks: Dict[str, Dict[str, asyncio.Task]] = {}
+        self._topics: Dict[str, str] = {}
+        # The pool handed out last, so a rerun of a cut-off turn gets the same one
+        self._taken: Dict[str, Tuple[str, str, asyncio.Task]] = {}
+        self.started = 0
+        self.ready = 0
+        self.waited = 0
+        self.missed = 0
+        self.cancelled = 0
+        self.wait_seconds = 0.0
+
+    def start(self, thread_id: str, topic: str, size: int, candidate: Optional[str] = None) -> None:
+        if self._topics.get(thread_id) == topic:
+            return
+        self.discard(thread_id)
+        self._topics[thread_id] = topic
+        self._tasks[thread_id] = {
+            difficulty: asyncio.create_task(draw_question_pool(topic, difficulty, size, candidate))
+            for difficulty in DIFFICULTIES
+        }
+        self.started += len(DIFFICULTIES)
+
+    async def take(self, thread_id: str, topic: str, difficulty: str) -> Optional[List[str]]:
+        """Return the speculated pool for this difficulty, or None on a miss."""
+        taken = self._taken.get(thread_id)
+        if taken is not None and taken[:2] == (topic, difficulty) and thread_id not in self._tasks:
+            try:
+                return await asyncio.shield(taken[2])
+            except Exception:
+                return None
+        tasks = self._tasks.pop(thread_id, {})
+        spec_topic = self._topics.pop(thread_id, None)
+        task = tasks.pop(difficulty, None) if spec_topic == topic else None
+        self._cancel(tasks.values())
+
+        if task is None:
+            self.missed += 1
+            return None
+        self._taken[thread_id] = (topic, difficulty, task)
+        was_ready = task.done()
+        started = time.perf_counter()
+        try:
+            # Shielded: a barge-in cancels this turn, not the pool its rerun will take
+            questions = await asyncio.shield(task)
+        except Exception as e:
+            logger.warning("Speculative pool for %s failed: %s", thread_id, e)
+            self.missed += 1
+            return None
+        if was_ready:
+            self.ready += 1
+        else:
+            self.waited += 1
+            self.wait_seconds += time.perf_counter() - started
+        return questions
+
+    def discard(self, thread_id: str) -> None:
+        self._topics.pop(thread_id, None)
+        self._taken.pop(thread_id, None)
+        self._cancel(self._tasks.pop(thread_id, {}).values())
+
+    def _cancel(self, tasks) -> None:
+        for task in tasks:
+            if not task.done():
+                task.cancel()
+                self.cancelled += 1
+
+    def stats(self) -> dict:
+        used = self.ready + self.waited
+        return {
+            "started": self.started,
+            "ready": self.ready,
+            "waited": self.waited,
+            "missed": self.missed,
+            "cancelled": self.cancelled,
+            "ready_rate": self.ready / (used + self.missed) if used + self.missed else 0.0,
+            "avg_wait_ms": 1000 * self.wait_seconds / self.waited if self.waited else 0.0,
+        }
+
+
+pool_speculator = PoolSpeculator()
+
+
+# Graph nodes used when speculation is enabled
+async def speculative_topic_router(state: InterviewState, config: RunnableConfig) -> dict:
+    update = await topic_router(state, config)
+    if update.get("intent") == "topic_valid" and update.get("topic"):
+        pool_speculator.start(thread_id_of(config), update["topic"], state.max_questions, state_candidate(state))
+    return update
+
+async def speculative_prepare_question_pool(state: InterviewState, config: RunnableConfig) -> dict:
+    questions = await pool_speculator.take(thread_id_of(config), state.topic, state.difficulty)
+    if questions is None:
+        questions = await draw_question_pool(state.topic, state.difficulty, state.max_questions,
+                                             state_candidate(state))
+    return {"question_pool": questions, "asked_questions": [], "question_count": 0}
+
+async def speculative_goodbye_node(state: InterviewState, config: RunnableConfig) -> dict:
+    pool_speculator.discard(thread_id_of(config))
+    return await goodbye_node(state)
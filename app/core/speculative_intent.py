@@ -0,0 +1,225 @@
+"""Speculative intent classification on partial transcripts.
+
+While the graph is paused before a router, a stable partial transcript is
+run through that router's local classifier (``app.core.intent``): pure
+phrase-table matching, with no LLM call and no side effects. When the final
+transcript arrives and matches the partial, the classification is committed
+with ``aupdate_state(..., as_node=router)`` and the graph continues from
+there, so the router does not run at all. If the final differs, the turn
+runs normally.
+
+Only outcomes the router node would produce by itself are committed: an
+answer to a question still goes through the router (the fused router
+evaluates it), and so does a valid topic (the speculative-pool router starts
+generating question pools from it).
+
+When the local classifier cannot settle the partial and LLM speculation is
+on, the LLM call the router would make is started instead
+(``app.core.router_prefetch``). That writes no state: the router runs as
+usual and takes the result only if the final transcript matches, so the
+call overlaps the end of the candidate's speech.
+"""
+
+from typing import AsyncIterable, Callable, Dict, Optional, Tuple
+
+from langchain_core.messages import HumanMessage
+
+from app import config as app_config
+from app.core.state import InterviewState
+from app.core.intent import (
+    LocalIntent, classify_difficulty, classify_identity, classify_question_reply, classify_topic,
+    intent_stats, normalize,
+)
+from app.core.nodes import answer_turn_llm, difficulty_llm, identity_llm, question_intent_llm, topic_llm
+from app.core.router_prefetch import router_prefetch
+from app.services.stt_service import Transcript, PartialStabilizer
+from app.utils.helpers import thread_id_of
+
+
+class SpeculationStats:
+    """How often a speculative classification was usable."""
+
+    def __init__(self):
+        self.started = 0
+        self.hits = 0
+        self.misses = 0
+        self.cancelled = 0
+        self.committed = 0
+        self.prefetched = 0
+
+    def reset(self) -> None:
+        self.__init__()
+
+    def snapshot(self) -> dict:
+        finals = self.hits + self.misses
+        return {
+            "started": self.started,
+            "hits": self.hits,
+            "misses": self.misses,
+            "cancelled": self.cancelled,
+            "committed": self.committed,
+            "prefetched": self.prefetched,
+            "hit_rate": self.hits / finals if finals else 0.0,
+        }
+
+
+speculation_stats = SpeculationStats()
+
+
+def _identity(state: InterviewState, local: LocalIntent) -> Optional[dict]:
+    return {"intent": local.intent}
+
+
+def _topic(state: InterviewState, local: LocalIntent) -> Optional[dict]:
+    if local.intent == "topic_valid":
+        return None
+    return {"intent": local.intent, "topic": local.value or state.topic}
+
+
+def _difficulty(state: InterviewState, local: LocalIntent) -> Optional[dict]:
+    return {"intent": local.intent, "difficulty": local.value or state.difficulty}
+
+
+def _question_reply(state: InterviewState, local: LocalIntent) -> Optional[dict]:
+    if local.intent == "answer":
+        return None
+    return {"intent": local.intent}
+
+
+# router node -> (intent_stats key, side-effect-free local classifier, the update to commit or None)
+CLASSIFIERS: Dict[str, Tuple[str, Callable[[InterviewState, str], Optional[LocalIntent]],
+                             Callable[[InterviewState, LocalIntent], Optional[dict]]]] = {
+    "identity_router": (
+        "identity", lambda state, text: classify_identity(text, state.student_name, record=False), _identity),
+    "topic_router": ("topic", lambda state, text: classify_topic(text, record=False), _topic),
+    "difficulty_router": ("difficulty", lambda state, text: classify_difficulty(text, record=False), _difficulty),
+    "question_intent_router": (
+        "question", lambda state, text: classify_question_reply(text, record=False), _question_reply),
+}
+
+# router node -> the LLM call it makes when its local classifier cannot settle the reply
+LLM_CALLS = {
+    "identity_router": identity_llm,
+    "topic_router": topic_llm,
+    "difficulty_router": difficulty_llm,
+    "question_intent_router": question_intent_llm,
+}
+
+
+class IntentSpeculator:
+    """Per-session speculative router results, driven by STT updates."""
+
+    def __init__(self, graph, config: dict, stabilizer: Optional[PartialStabilizer] = None,
+                 llm: bool = app_config.SPECULATIVE_INTENT_LLM_ENABLED):
+        self.graph = graph
+        self.config = config
+        self.stabilizer = stabilizer or PartialStabilizer()
+        self.llm_calls = dict(LLM_CALLS) if llm else {}
+        if llm and "evaluate_answer" not in graph.nodes:
+            # Fused graph: the question router classifies and evaluates in one call
+            self.llm_calls["question_intent_router"] = answer_turn_llm
+        self._update: Optional[dict] = None
+        self._prefetched = False
+        self._text: Optional[str] = None
+        self._router: Optional[str] = None
+        self._checkpoint_id: Optional[str] = None
+
+    @property
+    def thread_id(self) -> str:
+        return thread_id_of(self.config)
+
+    async def on_partial(self, text: str) -> None:
+        """Classify this partial if the graph is waiting on a router."""
+        if self._text is not None and normalize(text) == normalize(self._text):
+            return
+        self._cancel()
+        if not text.strip():
+            return
+        snapshot = await self.graph.aget_state(self.config)
+        router = snapshot.next[0] if snapshot.next else None
+        if router not in self.graph.interrupt_before_nodes or router not in CLASSIFIERS:
+            return
+        state = InterviewState(**snapshot.values)
+        _, classify, committable = CLASSIFIERS[router]
+        local = classify(state, text)
+        if local is not None:
+            update = committable(state, local)
+            if update is None:
+                return
+            self._update = update
+        elif router in self.llm_calls:
+            router_prefetch.start(self.thread_id, router, text, self.llm_calls[router](state, text.strip()))
+            self._prefetched = True
+        else:
+            return
+        self._text = text
+        self._router = router
+        self._checkpoint_id = snapshot.config["configurable"].get("checkpoint_id")
+        speculation_stats.started += 1
+
+    async def on_final(self, text: str):
+        """Run the turn for the final transcript, reusing a matching speculation."""
+        await self.apply_final(text)
+        await self.graph.ainvoke(None, config=self.config)
+        return await self.graph.aget_state(self.config)
+
+    async def apply_final(self, text: str) -> None:
+        """Record the final transcript, committing a matching speculative result.
+
+        Leaves the graph ready to resume, for callers that drive the turn
+        themselves (e.g. streaming it to TTS). A matching LLM prefetch is left
+        for the router to take when it runs.
+        """
+        hit, update, router = await self._take(text), self._update, self._router
+        self._update = self._text = self._router = self._checkpoint_id = None
+        self._prefetched = False
+        self.stabilizer.reset()
+        if hit and update is not None:
+            await self.graph.aupdate_state(
+                self.config,
+                {**update, "messages": [HumanMessage(content=text)], "last_user_input": text},
+                as_node=router,
+            )
+            # The router did not run, so count its local answer here
+            intent_stats.record(CLASSIFIERS[router][0], True)
+            speculation_stats.committed += 1
+        else:
+            if hit:
+                speculation_stats.prefetched += 1
+            await self.graph.aupdate_state(self.config, {"last_user_input": text})
+
+    def reset(self) -> None:
+        """Drop any speculation, e.g. when the turn it was for is rolled back."""
+        self._cancel()
+        self.stabilizer.reset()
+
+    async def run(self, transcripts: AsyncIterable[Transcript]):
+        """Consume one utterance's STT updates and run the resulting turn."""
+        async for transcript in transcripts:
+            if transcript.is_final:
+                return await self.on_final(transcript.text)
+            stable = self.stabilizer.update(transcript)
+            if stable:
+                await self.on_partial(stable)
+        self.reset()
+        return None
+
+    async def _take(self, text: str) -> bool:
+        if self._text is None:
+            return False
+        snapshot = await self.graph.aget_state(self.config)
+        unchanged = snapshot.config["configurable"].get("checkpoint_id") == self._checkpoint_id
+        if not unchanged or normalize(text) != normalize(self._text):
+            speculation_stats.misses += 1
+            router_prefetch.discard(self.thread_id)
+            return False
+        speculation_stats.hits += 1
+        return True
+
+    def _cancel(self) -> None:
+        if self._text is not None:
+            speculation_stats.cancelled += 1
+        if self._prefetched:
+            router_prefetch.discard(self.thread_id)
+        self._update = self._text = self._router = self._checkpoint_id = None
+        self._prefetched = False
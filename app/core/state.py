@@ -3,9 +3,17 @@ from pydantic import BaseModel, Field
 from langchain_core.messages import AnyMessage
 from langgraph.graph.message import add_messages
 
+class QuestionEvaluation(BaseModel):
+    question: Optional[str] = None
+    answer: Optional[str] = None
+    correct: bool
+    short_feedback: str
+    correction: Optional[str] = None
+
 class InterviewState(BaseModel):
     messages: Annotated[List[AnyMessage], add_messages] = Field(default_factory=list)
     
+    candidate_id: Optional[str] = None
     student_name: str = ""
     college: str = ""
     course: str = ""
@@ -26,3 +34,5 @@ class InterviewState(BaseModel):
     short_feedback: Optional[str] = None
     correction: Optional[str] = None
     correct: Optional[bool] = None
+
+    evaluations: List[QuestionEvaluation] = Field(default_factory=list)
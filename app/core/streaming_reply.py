@@ -0,0 +1,259 @@
+"""Token-to-speech streaming for generated replies.
+
+Evaluation feedback is streamed from the model as JSON; the spoken fields are
+pulled out token by token, cut at sentence/clause boundaries, and each clause
+is published on the graph's ``custom`` stream as soon as it is complete.
+``speak_turn`` runs a turn, feeds those clauses (and any other new agent
+message, e.g. the next pooled question) into TTS, and yields audio in order.
+Fixed lines and anything already in the audio cache are played whole from
+the cache instead of being split and synthesized again.
+Time to first audio becomes "first clause + first TTS chunk" instead of
+"full completion + full synthesis".
+"""
+
+import asyncio
+import logging
+import re
+import uuid
+from collections import defaultdict
+from typing import AsyncIterator, Callable, Dict, Iterable, List, Optional, Set, Union
+
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
+from langgraph.config import get_stream_writer
+
+from app.core.state import InterviewState
+from app.core.prompts import FALLBACK_FEEDBACK, STATIC_UTTERANCES, STREAMING_EVALUATION_SYSTEM_PROMPT
+from app.core.nodes import run_evaluation, evaluation_update
+from app.models.schemas import EvaluationSchema
+from app.services.audio_cache import AudioCache, audio_cache
+from app.services.evaluation_cache import evaluation_cache
+from app.services.llm_service import get_fast_llm, astream_text, JsonFieldStreamer
+from app.services.tts_service import (
+    TTSService, ClauseSplitter, LatencyBreakdown, Utterance, get_tts, split_clauses, stream_speech
+)
+from app.utils.helpers import percentile
+
+logger = logging.getLogger("intervu.speech")
+
+_CORRECT_FIELD = re.compile(r'"correct"\s*:\s*(true|false)')
+CORRECTION_PREFIX = "A better way is: "
+_STATIC = frozenset(STATIC_UTTERANCES)
+
+
+class SpeechLatency:
+    """Per-turn latency breakdowns (ms from turn start) for streamed replies."""
+
+    def __init__(self):
+        self.samples: Dict[str, List[float]] = defaultdict(list)
+
+    def record(self, breakdown: LatencyBreakdown) -> None:
+        for name, ms in breakdown.as_dict().items():
+            self.samples[name].append(ms)
+
+    def reset(self) -> None:
+        self.samples.clear()
+
+    def stats(self) -> dict:
+        return {
+            name: {"count": len(values), "p50_ms": percentile(values, 50), "p95_ms": percentile(values, 95)}
+            for name, values in self.samples.items() if values
+        }
+
+
+speech_latency = SpeechLatency()
+
+
+async def stream_evaluation(
+    question: str,
+    answer: str,
+    on_clause: Callable[[str], None],
+    on_event: Optional[Callable[[str], None]] = None,
+) -> EvaluationSchema:
+    """Evaluate an answer, handing spoken clauses to ``on_clause`` as they complete."""
+    fields = JsonFieldStreamer()
+    splitter = ClauseSplitter()
+    spoken = False
+    verdict: Optional[bool] = None
+    feedback, correction = "", ""
+    correction_said = 0
+
+    def emit(clauses: List[str]) -> None:
+        nonlocal spoken
+        for clause in clauses:
+            spoken = True
+            on_clause(clause)
+
+    def say_correction() -> None:
+        # Only spoken for a wrong answer, same as evaluation_update, so it is
+        # held back until the verdict has streamed in
+        nonlocal correction_said
+        if verdict is not False or len(correction) == correction_said:
+            return
+        text = correction[correction_said:]
+        if correction_said == 0:
+            emit(splitter.flush())
+            text = CORRECTION_PREFIX + text
+        correction_said = len(correction)
+        emit(splitter.feed(text))
+
+    cached = evaluation_cache.get(question, answer)
+    if cached is not None:
+        emit(split_clauses(_reply_text(cached)))
+        return cached
+
+    try:
+        async for delta in astream_text(
+            get_fast_llm(),
+            [
+                SystemMessage(content=STREAMING_EVALUATION_SYSTEM_PROMPT),
+                HumanMessage(content=f"Question: {question}\nAnswer: {answer}")
+            ],
+            name="StreamingEvaluation",
+            response_format={"type": "json_object"},
+        ):
+            if on_event and not fields.raw:
+                on_event("first_token")
+            for field, text in fields.feed(delta):
+                if field == "short_feedback":
+                    feedback += text
+                    emit(splitter.feed(text))
+                elif field == "correction":
+                    correction += text
+            if verdict is None:
+                match = _CORRECT_FIELD.search(fields.raw)
+                verdict = match.group(1) == "true" if match else None
+            say_correction()
+        if on_event:
+            on_event("llm_done")
+        emit(splitter.flush())
+        result = EvaluationSchema.model_validate_json(fields.raw)
+        evaluation_cache.put(question, answer, result)
+        return result
+    except asyncio.CancelledError:
+        raise
+    except Exception as e:
+        logger.warning("stream_evaluation failed: %s", e)
+
+    if spoken:
+        # Part of the feedback is already out; a fresh evaluation could contradict it
+        return EvaluationSchema(
+            correct=verdict is not False,
+            short_feedback=feedback.strip() or FALLBACK_FEEDBACK,
+            correction=correction.strip() or None,
+        )
+    result = await run_evaluation(question, answer)
+    emit(split_clauses(_reply_text(result)))
+    return result
+
+
+def _reply_text(result: EvaluationSchema) -> str:
+    if result.correct or not result.correction:
+        return result.short_feedback
+    return f"{result.short_feedback} {CORRECTION_PREFIX}{result.correction}"
+
+
+# Graph node
+async def streaming_evaluate_answer(state: InterviewState) -> dict:
+    writer = get_stream_writer()
+    message_id = str(uuid.uuid4())
+
+    def on_clause(text: str) -> None:
+        writer({"type": "speech", "message_id": message_id, "text": text})
+
+    def on_event(name: str) -> None:
+        writer({"type": "timing", "event": name})
+
+    result = await stream_evaluation(state.current_question, state.last_user_input, on_clause, on_event)
+    update = evaluation_update(state, result, state.last_user_input)
+    # Same id as the streamed clauses, so the voice layer does not speak it twice
+    update["messages"] = [AIMessage(content=update["messages"][0].content, id=message_id)]
+    return update
+
+
+# Voice side
+def _utterances(text: str, tts: TTSService, cache: AudioCache) -> List[Union[str, Utterance]]:
+    """Fixed lines and cached text play whole from the cache; anything else is split into clauses."""
+    if text in _STATIC or cache.lookup(text, tts) is not None:
+        return [Utterance(text, pinned=text in _STATIC)]
+    return split_clauses(text)
+
+
+async def speak_lines(
+    lines: Iterable[str],
+    tts: Optional[TTSService] = None,
+    cache: Optional[AudioCache] = None,
+) -> AsyncIterator[bytes]:
+    """Yield PCM for agent lines said outside a turn (the greeting, a reconnect), as ``speak_turn`` would."""
+    tts = tts or get_tts()
+    cache = cache or audio_cache
+
+    async def items() -> AsyncIterator[Union[str, Utterance]]:
+        for line in lines:
+            for item in _utterances(line, tts, cache):
+                yield item
+
+    async for chunk in stream_speech(items(), tts, cache=cache):
+        yield chunk
+
+
+async def speak_turn(
+    graph,
+    config: dict,
+    tts: Optional[TTSService] = None,
+    breakdown: Optional[LatencyBreakdown] = None,
+    cache: Optional[AudioCache] = None,
+    on_graph_done: Optional[Callable[[str], None]] = None,
+) -> AsyncIterator[bytes]:
+    """Resume the graph for one turn and yield the agent's reply as PCM, in order.
+
+    Call after ``aupdate_state`` has stored the candidate's reply, exactly
+    where ``app.main`` calls ``ainvoke(None)``. Streamed clauses are spoken as
+    they arrive; any other new agent message is spoken once its node finishes.
+    ``on_graph_done`` gets the full reply text as soon as the graph has
+    finished, while its audio may still be playing.
+    """
+    tts = tts or get_tts()
+    cache = cache or audio_cache
+    breakdown = breakdown or LatencyBreakdown()
+    clauses: asyncio.Queue = asyncio.Queue()
+    streamed: Set[str] = set()
+    spoken: List[str] = []
+
+    async def run_graph() -> None:
+        try:
+            async for mode, chunk in graph.astream(None, config=config, stream_mode=["custom", "updates"]):
+                if mode == "custom":
+                    if chunk.get("type") == "speech":
+                        streamed.add(chunk["message_id"])
+                        spoken.append(chunk["text"])
+                        await clauses.put(chunk["text"])
+                    elif chunk.get("type") == "timing":
+                        breakdown.mark(chunk["event"])
+                    continue
+                for update in chunk.values():
+                    if not isinstance(update, dict):
+                        continue  # interrupt markers
+                    for msg in update.get("messages", []):
+                        if not isinstance(msg, AIMessage) or msg.id in streamed:
+                            continue
+                        spoken.append(msg.content)
+                        for item in _utterances(msg.content, tts, cache):
+                            await clauses.put(item)
+            breakdown.mark("graph_done")
+            if on_graph_done is not None:
+                on_graph_done(" ".join(spoken))
+        finally:
+            await clauses.put(None)
+
+    async def clause_stream() -> AsyncIterator[str]:
+        while (clause := await clauses.get()) is not None:
+            yield clause
+
+    runner = asyncio.create_task(run_graph())
+    try:
+        async for chunk in stream_speech(clause_stream(), tts, breakdown, cache=cache):
+            yield chunk
+        await runner
+        speech_latency.record(breakdown)
+    finally:
+        runner.cancel()
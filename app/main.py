@@ -1,19 +1,23 @@
 import asyncio
 """Entry point — runs the interview workflow in the terminal."""
 
+import sys
 import uuid
 import warnings
 
 warnings.filterwarnings('ignore', category=UserWarning, module='pydantic')
 
-from app.core.graph import build_graph
+from app.core.graph import get_graph
+from app.services.report_service import report_worker
 from langchain_core.messages import AIMessage
 
 QUIT_KEYWORDS = {"quit", "exit", "stop", "end", "bye", "done"}
 
-async def run():
-    graph = build_graph()
-    config = {"configurable": {"thread_id": f"interview-{uuid.uuid4().hex[:8]}"}}
+async def run(thread_id: str = None):
+    graph = get_graph()
+    checkpointer = graph.checkpointer
+    config = {"configurable": {"thread_id": thread_id or f"interview-{uuid.uuid4().hex[:8]}"}}
+    print(f"Session: {config['configurable']['thread_id']}")
 
     # Initialize state with student_name
     initial_state = {
@@ -23,8 +27,10 @@ async def run():
         "messages": []
     }
 
-    # Start the graph
-    await graph.ainvoke(initial_state, config=config)
+    # Start the graph, or pick up a dropped call where it left off
+    existing = await graph.aget_state(config)
+    if not existing.values:
+        await graph.ainvoke(initial_state, config=config)
     
     # Helper to print AI messages
     def print_ai_messages(state_snapshot, start_idx):
@@ -43,7 +49,12 @@ async def run():
     while True:
         state = await graph.aget_state(config)
         if not state.next:
+            if hasattr(checkpointer, "mark_finished"):
+                checkpointer.mark_finished(config["configurable"]["thread_id"])
             print("\n✅ Interview complete!")
+            if report_worker.enqueued:
+                await report_worker.drain()
+                print(f"📝 Feedback report saved in {report_worker.reports_dir}")
             break
 
         user_input = (await asyncio.to_thread(input, "\n👤 You: ")).strip()
@@ -64,4 +75,5 @@ async def run():
         msg_count = print_ai_messages(state, msg_count)
 
 if __name__ == "__main__":
-    asyncio.run(run())
+    # Optional thread_id argument resumes a dropped interview
+    asyncio.run(run(sys.argv[1] if len(sys.argv) > 1 else None))
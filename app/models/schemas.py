@@ -22,3 +22,16 @@ class EvaluationSchema(BaseModel):
     correct: bool
     short_feedback: str
     correction: str | None
+
+class AnswerTurn(BaseModel):
+    intent: Literal["answer", "repeat", "quit", "unknown"]
+    evaluation: Optional[EvaluationSchema] = None
+
+class CandidateReport(BaseModel):
+    candidate_ref: str
+    summary: str
+    strengths: List[str]
+    improvements: List[str]
+
+class ReportBatch(BaseModel):
+    reports: List[CandidateReport]
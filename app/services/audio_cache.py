@@ -0,0 +1,201 @@
+"""Content-addressed cache of synthesized agent audio.
+
+Entries are keyed by (text, voice, encoding, sample rate) and stored as raw
+PCM files. Hits are served straight from a read-only ``mmap``, so playback
+starts with no network round trip and no copy. The fixed node utterances are
+pre-rendered by the warm-up command and pinned; dynamic text (generated
+questions, feedback, templated intros) is evicted LRU once the cache grows
+past its byte budget.
+
+    python -m app.services.audio_cache warm [--names Jayanth Priya ...]
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import mmap
+import os
+import time
+from typing import AsyncIterator, Dict, Iterable, Optional
+
+import xxhash
+
+from app import config
+from app.core.prompts import INTRO_TEMPLATE, IDENTITY_CONFIRM_TEMPLATE, STATIC_UTTERANCES
+from app.services.tts_service import TTSService, get_tts
+
+logger = logging.getLogger("intervu.audio")
+
+
+class AudioCache:
+    def __init__(
+        self,
+        directory: str = config.AUDIO_CACHE_DIR,
+        max_bytes: int = config.AUDIO_CACHE_MAX_BYTES,
+        tts: Optional[TTSService] = None,
+    ):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._tts = tts
+        self._index: Dict[str, dict] = {}
+        self._maps: Dict[str, memoryview] = {}
+        self._loaded = False
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def tts(self) -> TTSService:
+        return self._tts or get_tts()
+
+    @staticmethod
+    def key(text: str, voice: str, encoding: str, sample_rate: int) -> str:
+        return xxhash.xxh3_128_hexdigest(f"{voice}\0{encoding}\0{sample_rate}\0{text}".encode("utf-8"))
+
+    def _key_for(self, text: str, tts: TTSService) -> str:
+        return self.key(text, tts.voice, tts.encoding, tts.sample_rate)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], f"{key}.pcm")
+
+    # Lookup
+    def lookup(self, text: str, tts: Optional[TTSService] = None) -> Optional[memoryview]:
+        """Memory-mapped PCM for this text, or None on a miss."""
+        self._load()
+        key = self._key_for(text, tts or self.tts)
+        entry = self._index.get(key)
+        if entry is None:
+            return None
+        view = self._maps.get(key)
+        if view is None:
+            try:
+                with open(self._path(key), "rb") as f:
+                    view = memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+            except (OSError, ValueError):
+                self._index.pop(key, None)
+                return None
+            self._maps[key] = view
+        entry["last_used"] = time.time()
+        return view
+
+    async def stream(self, text: str, tts: Optional[TTSService] = None,
+                     chunk_bytes: int = 4800, pinned: bool = False) -> AsyncIterator[bytes]:
+        """Yield PCM for ``text``: from the cache on a hit, else from TTS while recording it."""
+        tts = tts or self.tts
+        view = self.lookup(text, tts)
+        if view is not None:
+            self.hits += 1
+            for start in range(0, len(view), chunk_bytes):
+                yield view[start:start + chunk_bytes]
+            return
+
+        self.misses += 1
+        audio = bytearray()
+        async for chunk in tts.stream(text):
+            audio += chunk
+            yield chunk
+        # Only reached if the playback was not cancelled part-way through
+        self.put(text, bytes(audio), tts, pinned=pinned)
+
+    # Store
+    def put(self, text: str, audio: bytes, tts: Optional[TTSService] = None, pinned: bool = False) -> None:
+        if not audio:
+            return
+        self._load()
+        key = self._key_for(text, tts or self.tts)
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(audio)
+        os.replace(tmp_path, path)
+        previous = self._index.get(key, {})
+        self._index[key] = {
+            "text": text,
+            "size": len(audio),
+            "pinned": pinned or previous.get("pinned", False),
+            "last_used": time.time(),
+        }
+        self._maps.pop(key, None)
+        self._evict()
+        self._save()
+
+    async def warm(self, texts: Iterable[str], tts: Optional[TTSService] = None, pinned: bool = True) -> int:
+        """Pre-render texts that are not cached yet; returns how many were synthesized."""
+        tts = tts or self.tts
+        rendered = 0
+        for text in dict.fromkeys(texts):
+            if self.lookup(text, tts) is not None:
+                if pinned:
+                    self._index[self._key_for(text, tts)]["pinned"] = True
+                continue
+            self.put(text, await tts.synthesize(text), tts, pinned=pinned)
+            rendered += 1
+        self._save()
+        return rendered
+
+    def _evict(self) -> None:
+        dynamic = [(e["last_used"], k) for k, e in self._index.items() if not e["pinned"]]
+        total = sum(self._index[k]["size"] for _, k in dynamic)
+        for _, key in sorted(dynamic):
+            if total <= self.max_bytes:
+                break
+            total -= self._index.pop(key)["size"]
+            # Live playback keeps its mapping alive; the file can go now
+            self._maps.pop(key, None)
+            try:
+                os.remove(self._path(key))
+            except OSError:
+                pass
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._index),
+            "pinned": sum(1 for e in self._index.values() if e["pinned"]),
+            "bytes": sum(e["size"] for e in self._index.values()),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+    # Index persistence
+    def _index_path(self) -> str:
+        return os.path.join(self.directory, "index.json")
+
+    def _load(self) -> None:
+        if self._loaded:
+            return
+        self._loaded = True
+        try:
+            with open(self._index_path(), "r", encoding="utf-8") as f:
+                self._index = json.load(f)
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as e:
+            logger.warning("Error loading audio cache index: %s", e)
+
+    def _save(self) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        tmp_path = f"{self._index_path()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self._index, f)
+        os.replace(tmp_path, self._index_path())
+
+
+audio_cache = AudioCache()
+
+
+async def _warm(names: Iterable[str]) -> None:
+    rendered = await audio_cache.warm(STATIC_UTTERANCES)
+    dynamic = [t.format(student_name=n) for n in names for t in (INTRO_TEMPLATE, IDENTITY_CONFIRM_TEMPLATE)]
+    rendered += await audio_cache.warm(dynamic, pinned=False)
+    print(f"Rendered {rendered} utterances. {audio_cache.stats()}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Pre-render the agent's fixed utterances.")
+    parser.add_argument("command", choices=["warm"])
+    parser.add_argument("--names", nargs="*", default=[], help="also render intros for these candidates")
+    args = parser.parse_args()
+    asyncio.run(_warm(args.names))
@@ -0,0 +1,473 @@
+"""Outbound interview campaigns.
+
+``CampaignScheduler`` works through a candidate list: highest priority
+first, at most ``concurrency`` calls at once, admissions paced by a token
+bucket and held back while the shared LLM client reports little headroom
+(e.g. after 429s). A call nobody answers, or one that drops mid-interview,
+is retried later up to ``max_attempts`` times; a dropped interview picks up
+from its checkpoint because every candidate keeps one graph thread_id.
+
+Progress lives in SQLite (``CAMPAIGN_DB_PATH``), so a restarted scheduler
+skips finished candidates and re-dials the ones that were mid-call.
+
+Telephony is behind the small ``Telephony``/``CallConnection`` interface;
+``SimulatedTelephony`` stands in for a carrier in tests and benchmarks::
+
+    python -m app.services.call_service candidates.csv --campaign spring --simulate
+"""
+
+import argparse
+import asyncio
+import csv
+import hashlib
+import json
+import logging
+import os
+import random
+import re
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional, Sequence, Set
+
+from langchain_core.messages import AIMessage
+from pydantic import BaseModel
+
+from app import config
+from app.core.evaluation_queue import evaluation_queue
+from app.core.speculation import pool_speculator
+from app.services.llm_service import TokenBucket, llm_client
+from app.services.report_service import report_worker
+from app.utils.logger import current_thread_id
+
+logger = logging.getLogger("intervu.calls")
+
+# Campaign call states; "completed" and "unreachable" are final
+PENDING, IN_PROGRESS, COMPLETED, UNREACHABLE = "pending", "in_progress", "completed", "unreachable"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS campaign_calls (
+    campaign_id TEXT NOT NULL,
+    candidate_id TEXT NOT NULL,
+    candidate TEXT NOT NULL,
+    priority INTEGER NOT NULL DEFAULT 0,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt_at REAL NOT NULL DEFAULT 0,
+    last_outcome TEXT,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (campaign_id, candidate_id)
+);
+CREATE INDEX IF NOT EXISTS campaign_calls_due
+    ON campaign_calls (campaign_id, status, priority DESC, next_attempt_at);
+"""
+
+
+class Candidate(BaseModel):
+    candidate_id: str
+    student_name: str
+    college: str = ""
+    course: str = ""
+    phone: Optional[str] = None
+    priority: int = 0
+
+
+class CampaignCall(BaseModel):
+    campaign_id: str
+    candidate: Candidate
+    status: str = PENDING
+    attempts: int = 0
+    next_attempt_at: float = 0.0
+    last_outcome: Optional[str] = None
+
+    @property
+    def thread_id(self) -> str:
+        return f"{self.campaign_id}-{self.candidate.candidate_id}"
+
+
+# Telephony
+class CallConnection:
+    """A live call: the agent speaks text, the candidate's replies come back as text."""
+
+    async def say(self, text: str) -> None:
+        raise NotImplementedError
+
+    async def listen(self, timeout: float) -> Optional[str]:
+        """The candidate's next reply, "" on silence, None once they hang up."""
+        raise NotImplementedError
+
+    async def hangup(self) -> None:
+        pass
+
+
+class Telephony:
+    async def dial(self, candidate: Candidate) -> Optional[CallConnection]:
+        """Ring the candidate; None when nobody answers."""
+        raise NotImplementedError
+
+
+DEFAULT_REPLIES = [
+    "yes, speaking",
+    "python",
+    "medium",
+    "A list is mutable and a tuple is immutable, so tuples can be dictionary keys.",
+    "A decorator wraps a function to add behaviour without changing its code.",
+    "Generators yield values lazily, so they use constant memory.",
+]
+
+
+class SimulatedCall(CallConnection):
+    def __init__(self, replies: Sequence[str], think_seconds: float, drop_prob: float, rng: random.Random):
+        self.replies = list(replies)
+        self.think_seconds = think_seconds
+        self.drop_prob = drop_prob
+        self.rng = rng
+        self.heard: List[str] = []
+        self.turns = 0
+
+    async def say(self, text: str) -> None:
+        self.heard.append(text)
+
+    async def listen(self, timeout: float) -> Optional[str]:
+        await asyncio.sleep(min(timeout, self.think_seconds * self.rng.uniform(0.5, 1.5)))
+        if self.rng.random() < self.drop_prob:
+            return None
+        reply = self.replies[self.turns] if self.turns < len(self.replies) else self.replies[-1]
+        self.turns += 1
+        return reply
+
+
+class SimulatedTelephony(Telephony):
+    """Carrier stand-in: some calls go unanswered, some drop mid-interview."""
+
+    def __init__(
+        self,
+        answer_prob: float = 0.8,
+        drop_prob: float = 0.0,
+        ring_seconds: float = 0.2,
+        think_seconds: float = 0.2,
+        replies: Sequence[str] = DEFAULT_REPLIES,
+        seed: Optional[int] = None,
+    ):
+        self.answer_prob = answer_prob
+        self.drop_prob = drop_prob
+        self.ring_seconds = ring_seconds
+        self.think_seconds = think_seconds
+        self.replies = replies
+        self.rng = random.Random(seed)
+        self.dialed = 0
+        self.answered = 0
+
+    async def dial(self, candidate: Candidate) -> Optional[CallConnection]:
+        self.dialed += 1
+        await asyncio.sleep(self.ring_seconds)
+        if self.rng.random() >= self.answer_prob:
+            return None
+        self.answered += 1
+        return SimulatedCall(self.replies, self.think_seconds, self.drop_prob, random.Random(self.rng.random()))
+
+
+# Persistence
+class CampaignStore:
+    def __init__(self, path: str = config.CAMPAIGN_DB_PATH):
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+
+    def add(self, campaign_id: str, candidates: Sequence[Candidate]) -> int:
+        """Enqueue candidates; ones already in the campaign are left as they are."""
+        now = time.time()
+        with self._lock:
+            before = self._conn.total_changes
+            self._conn.execute("BEGIN")
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO campaign_calls "
+                "(campaign_id, candidate_id, candidate, priority, status, updated_at) VALUES (?, ?, ?, ?, ?, ?)",
+                [(campaign_id, c.candidate_id, c.model_dump_json(), c.priority, PENDING, now) for c in candidates],
+            )
+            self._conn.execute("COMMIT")
+            return self._conn.total_changes - before
+
+    def requeue_interrupted(self, campaign_id: str) -> int:
+        """Calls that were live when the process died go back in the queue."""
+        with self._lock:
+            return self._conn.execute(
+                "UPDATE campaign_calls SET status = ?, next_attempt_at = 0 WHERE campaign_id = ? AND status = ?",
+                (PENDING, campaign_id, IN_PROGRESS),
+            ).rowcount
+
+    def next_due(self, campaign_id: str, now: float) -> Optional[CampaignCall]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT candidate, status, attempts, next_attempt_at, last_outcome FROM campaign_calls "
+                "WHERE campaign_id = ? AND status = ? AND next_attempt_at <= ? "
+                "ORDER BY priority DESC, next_attempt_at LIMIT 1",
+                (campaign_id, PENDING, now),
+            ).fetchone()
+        if row is None:
+            return None
+        return CampaignCall(campaign_id=campaign_id, candidate=Candidate.model_validate_json(row[0]),
+                            status=row[1], attempts=row[2], next_attempt_at=row[3], last_outcome=row[4])
+
+    def next_due_time(self, campaign_id: str) -> Optional[float]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT MIN(next_attempt_at) FROM campaign_calls WHERE campaign_id = ? AND status = ?",
+                (campaign_id, PENDING),
+            ).fetchone()
+        return row[0]
+
+    def save(self, call: CampaignCall) -> None:
+        with self._lock:
+            self._conn.execute(
+                "UPDATE campaign_calls SET status = ?, attempts = ?, next_attempt_at = ?, last_outcome = ?, "
+                "updated_at = ? WHERE campaign_id = ? AND candidate_id = ?",
+                (call.status, call.attempts, call.next_attempt_at, call.last_outcome, time.time(),
+                 call.campaign_id, call.candidate.candidate_id),
+            )
+
+    def counts(self, campaign_id: str) -> Dict[str, int]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT status, COUNT(*) FROM campaign_calls WHERE campaign_id = ? GROUP BY status", (campaign_id,)
+            ).fetchall()
+        return dict(rows)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+# Scheduling
+class CampaignScheduler:
+    def __init__(
+        self,
+        campaign_id: str,
+        telephony: Telephony,
+        graph=None,
+        store: Optional[CampaignStore] = None,
+        concurrency: int = config.CAMPAIGN_CONCURRENCY,
+        max_attempts: int = config.CAMPAIGN_MAX_ATTEMPTS,
+        retry_delay_seconds: float = config.CAMPAIGN_RETRY_DELAY_SECONDS,
+        admissions_per_second: float = config.CAMPAIGN_ADMISSIONS_PER_SECOND,
+        min_llm_headroom: float = config.CAMPAIGN_MIN_LLM_HEADROOM,
+        reply_timeout_seconds: float = config.CAMPAIGN_REPLY_TIMEOUT_SECONDS,
+    ):
+        if graph is None:
+            from app.core.graph import get_graph
+            graph = get_graph()
+        self.campaign_id = campaign_id
+        self.telephony = telephony
+        self.graph = graph
+        self.store = store or CampaignStore()
+        self.concurrency = concurrency
+        self.max_attempts = max_attempts
+        self.retry_delay_seconds = retry_delay_seconds
+        self.admissions = TokenBucket(admissions_per_second, max(1, int(admissions_per_second)))
+        self.min_llm_headroom = min_llm_headroom
+        self.reply_timeout_seconds = reply_timeout_seconds
+        self.active: Set[asyncio.Task] = set()
+        self.outcomes: Dict[str, int] = {}
+        self.headroom_waits = 0
+        self._stopping = False
+        self._started = 0.0
+
+    def add(self, candidates: Sequence[Candidate]) -> int:
+        return self.store.add(self.campaign_id, candidates)
+
+    def stop(self) -> None:
+        """Stop admitting calls; live interviews run to completion."""
+        self._stopping = True
+
+    async def run(self) -> dict:
+        """Dial until every candidate is completed or unreachable (or ``stop()``)."""
+        self._started = time.monotonic()
+        self.store.requeue_interrupted(self.campaign_id)
+        try:
+            while not self._stopping:
+                if len(self.active) >= self.concurrency:
+                    await asyncio.wait(self.active, return_when=asyncio.FIRST_COMPLETED)
+                    continue
+                call = self.store.next_due(self.campaign_id, time.time())
+                if call is None:
+                    due = self.store.next_due_time(self.campaign_id)
+                    if due is None and not self.active:
+                        break
+                    # Sleep until a retry falls due or a live call frees a slot
+                    delay = 1.0 if due is None else min(1.0, max(0.0, due - time.time()))
+                    if self.active:
+                        await asyncio.wait(self.active, timeout=delay, return_when=asyncio.FIRST_COMPLETED)
+                    else:
+                        await asyncio.sleep(delay)
+                    continue
+                await self._admit()
+                call.status = IN_PROGRESS
+                call.attempts += 1
+                self.store.save(call)
+                task = asyncio.create_task(self._attempt(call))
+                self.active.add(task)
+                task.add_done_callback(self.active.discard)
+            if self.active:
+                await asyncio.wait(self.active)
+        finally:
+            for task in self.active:
+                task.cancel()
+        return self.stats()
+
+    async def _admit(self) -> None:
+        await self.admissions.acquire()
+        # New calls add LLM load right away; wait while the provider is pushing back
+        while llm_client.headroom() < self.min_llm_headroom:
+            self.headroom_waits += 1
+            await asyncio.sleep(0.25)
+
+    async def _attempt(self, call: CampaignCall) -> None:
+        current_thread_id.set(call.thread_id)
+        try:
+            connection = await self.telephony.dial(call.candidate)
+            if connection is None:
+                outcome = "no_answer"
+            else:
+                try:
+                    outcome = await self._interview(call, connection)
+                finally:
+                    pool_speculator.discard(call.thread_id)
+                    await connection.hangup()
+                    await evaluation_queue.persist(self.graph, {"configurable": {"thread_id": call.thread_id}},
+                                                   wait=True, timeout=config.EVALUATION_QUEUE_DRAIN_SECONDS)
+        except Exception as e:
+            logger.error("Error in campaign call %s: %s", call.thread_id, e)
+            outcome = "failed"
+        self._finish(call, outcome)
+
+    def _finish(self, call: CampaignCall, outcome: str) -> None:
+        self.outcomes[outcome] = self.outcomes.get(outcome, 0) + 1
+        call.last_outcome = outcome
+        if outcome == "completed":
+            call.status = COMPLETED
+        elif call.attempts >= self.max_attempts:
+            call.status = UNREACHABLE
+        else:
+            call.status = PENDING
+            # Back off further on every attempt, with jitter so retries spread out
+            call.next_attempt_at = time.time() + self.retry_delay_seconds * call.attempts * random.uniform(0.8, 1.2)
+        self.store.save(call)
+
+    async def _interview(self, call: CampaignCall, connection: CallConnection) -> str:
+        """Run (or resume) the interview on a live call, the way app/main.py does."""
+        graph = self.graph
+        cfg = {"configurable": {"thread_id": call.thread_id}}
+        existing = await graph.aget_state(cfg)
+        if not existing.values:
+            await graph.ainvoke({
+                "candidate_id": call.candidate.candidate_id,
+                "student_name": call.candidate.student_name,
+                "college": call.candidate.college,
+                "course": call.candidate.course,
+                "messages": [],
+            }, config=cfg)
+            spoken = 0
+        elif existing.next and existing.next[0] not in graph.interrupt_before_nodes:
+            # Dropped mid-turn: finish that turn first
+            spoken = len(existing.values.get("messages", []))
+            await graph.ainvoke(None, config=cfg)
+        else:
+            # Dropped while waiting for the candidate: repeat the last thing said
+            messages = existing.values.get("messages", [])
+            spoken = max((i for i, m in enumerate(messages) if isinstance(m, AIMessage)), default=len(messages))
+
+        while True:
+            state = await graph.aget_state(cfg)
+            messages = state.values.get("messages", [])
+            for msg in messages[spoken:]:
+                if isinstance(msg, AIMessage):
+                    await connection.say(msg.content)
+            spoken = len(messages)
+            if not state.next:
+                checkpointer = graph.checkpointer
+                if hasattr(checkpointer, "mark_finished"):
+                    checkpointer.mark_finished(call.thread_id)
+                return "completed"
+
+            reply = await connection.listen(self.reply_timeout_seconds)
+            if reply is None:
+                return "dropped"
+            await graph.aupdate_state(cfg, {"last_user_input": reply})
+            await graph.ainvoke(None, config=cfg)
+            await evaluation_queue.persist(graph, cfg)
+
+    def stats(self) -> dict:
+        elapsed = time.monotonic() - self._started if self._started else 0.0
+        completed = self.outcomes.get("completed", 0)
+        return {
+            "campaign_id": self.campaign_id,
+            "status": self.store.counts(self.campaign_id),
+            "outcomes": dict(self.outcomes),
+            "active": len(self.active),
+            "headroom_waits": self.headroom_waits,
+            "completed_per_minute": round(60 * completed / elapsed, 2) if elapsed else 0.0,
+        }
+
+
+def candidate_id_for_phone(phone: str) -> str:
+    """Stable id for a candidate listed without one: the same number always maps to the same id."""
+    digits = re.sub(r"\D", "", phone)
+    if not digits:
+        raise ValueError(f"phone number {phone!r} has no digits")
+    return "p-" + hashlib.sha1(digits.encode()).hexdigest()[:16]
+
+
+def load_candidates(path: str) -> List[Candidate]:
+    """Candidates from a CSV (header: student_name, college, course[, candidate_id, phone, priority]) or JSON list.
+
+    Each row needs a ``candidate_id`` or a ``phone`` to derive one from; the
+    id keys the candidate's graph thread, so it must survive reordering the
+    list between runs. Duplicate ids are rejected rather than merged.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        rows = json.load(f) if path.endswith(".json") else list(csv.DictReader(f))
+    candidates, seen = [], {}
+    for line, row in enumerate(rows, start=1):
+        fields = {k: v for k, v in row.items() if v not in (None, "")}
+        if "candidate_id" not in fields:
+            if "phone" not in fields:
+                raise ValueError(f"{path}: candidate {line} has neither a candidate_id nor a phone")
+            fields["candidate_id"] = candidate_id_for_phone(str(fields["phone"]))
+        candidate = Candidate(**fields)
+        if candidate.candidate_id in seen:
+            raise ValueError(f"{path}: candidates {seen[candidate.candidate_id]} and {line} "
+                             f"share candidate_id {candidate.candidate_id!r}")
+        seen[candidate.candidate_id] = line
+        candidates.append(candidate)
+    return candidates
+
+
+async def _main(args) -> None:
+    if not args.simulate:
+        raise SystemExit("No carrier integration is configured yet; run with --simulate")
+    scheduler = CampaignScheduler(
+        args.campaign,
+        SimulatedTelephony(answer_prob=args.answer_prob, drop_prob=args.drop_prob),
+        concurrency=args.concurrency,
+        retry_delay_seconds=args.retry_delay,
+    )
+    print(f"Queued {scheduler.add(load_candidates(args.candidates))} new candidates")
+    print(json.dumps(await scheduler.run(), indent=2))
+    # Reports queue up during the campaign; finish the stragglers before exiting
+    print(json.dumps(await report_worker.drain(), indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run an outbound interview campaign.")
+    parser.add_argument("candidates", help="CSV or JSON candidate list")
+    parser.add_argument("--campaign", required=True, help="campaign id; rerun with the same id to resume")
+    parser.add_argument("--concurrency", type=int, default=config.CAMPAIGN_CONCURRENCY)
+    parser.add_argument("--retry-delay", type=float, default=config.CAMPAIGN_RETRY_DELAY_SECONDS)
+    parser.add_argument("--simulate", action="store_true", help="use the simulated telephony stand-in")
+    parser.add_argument("--answer-prob", type=float, default=0.8)
+    parser.add_argument("--drop-prob", type=float, default=0.0)
+    asyncio.run(_main(parser.parse_args()))
@@ -0,0 +1,144 @@
+"""Cross-session cache of answer evaluations.
+
+Keyed by question and normalized answer: lowercased, punctuation and
+disfluencies ("um", "uh", "you know") stripped, so "Um, a list is mutable."
+and "a list is mutable" share an entry. Only an exact match of the
+normalized answer reuses a verdict; answers that differ by a single word
+("logarithmic" vs "linear") are separate entries, since one word can flip
+correctness.
+
+Entries are evicted LRU, persisted to a local JSON file (written every few
+puts and on ``flush()``), and dropped wholesale when the evaluation prompt
+changes.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import time
+from collections import OrderedDict
+from typing import List, Optional
+
+from app import config
+from app.core.intent import normalize
+from app.core.prompts import EVALUATION_SYSTEM_PROMPT, STREAMING_EVALUATION_SYSTEM_PROMPT
+from app.models.schemas import EvaluationSchema
+from app.utils.logger import registry
+
+logger = logging.getLogger("intervu.evaluations")
+
+# Sounds and phrases that carry no content; everything else is kept
+DISFLUENCIES = frozenset({"um", "umm", "uh", "uhh", "uhm", "er", "erm", "hmm", "like"})
+_YOU_KNOW = re.compile(r"\byou know\b")
+
+# Cached verdicts are only valid for the prompt that produced them
+PROMPT_VERSION = hashlib.sha1(
+    (EVALUATION_SYSTEM_PROMPT + STREAMING_EVALUATION_SYSTEM_PROMPT).encode()
+).hexdigest()[:12]
+
+_LOOKUPS = registry.counter("intervu_evaluation_cache_lookups_total", "Evaluation cache lookups.", ("result",))
+
+
+def normalize_answer(text: str) -> List[str]:
+    return [t for t in normalize(_YOU_KNOW.sub(" ", (text or "").lower())) if t not in DISFLUENCIES]
+
+
+class EvaluationCache:
+    def __init__(
+        self,
+        path: Optional[str] = config.EVALUATION_CACHE_PATH,
+        max_entries: int = config.EVALUATION_CACHE_MAX_ENTRIES,
+        enabled: bool = config.EVALUATION_CACHE_ENABLED,
+        save_every: int = 50,
+    ):
+        self.path = path
+        self.max_entries = max_entries
+        self.enabled = enabled
+        self.save_every = save_every
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, dict]" = OrderedDict()
+        self._unsaved = 0
+        self._loaded = False
+
+    @staticmethod
+    def key(question: str, answer: str) -> Optional[str]:
+        tokens = normalize_answer(answer)
+        if not tokens:
+            return None
+        return f"{' '.join(normalize(question))}|{' '.join(tokens)}"
+
+    def get(self, question: str, answer: str) -> Optional[EvaluationSchema]:
+        if not self.enabled:
+            return None
+        self._load()
+        key = self.key(question, answer)
+        if key is None:
+            return None
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            _LOOKUPS.inc(1, "miss")
+            return None
+        self.hits += 1
+        _LOOKUPS.inc(1, "hit")
+        self._entries.move_to_end(key)
+        return EvaluationSchema(**entry["result"])
+
+    def put(self, question: str, answer: str, result: EvaluationSchema) -> None:
+        if not self.enabled:
+            return
+        self._load()
+        key = self.key(question, answer)
+        if key is None:
+            return
+        self._entries[key] = {"result": result.model_dump(), "created": time.time()}
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        self._unsaved += 1
+        if self._unsaved >= self.save_every:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self.path or not self._unsaved:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"prompt_version": PROMPT_VERSION, "entries": self._entries}, f)
+            os.replace(tmp_path, self.path)
+            self._unsaved = 0
+        except OSError as e:
+            logger.warning("Error saving evaluation cache: %s", e)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+        }
+
+    def _load(self) -> None:
+        if self._loaded:
+            return
+        self._loaded = True
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning("Error loading evaluation cache: %s", e)
+            return
+        if data.get("prompt_version") != PROMPT_VERSION:
+            return
+        self._entries = OrderedDict(list(data.get("entries", {}).items())[-self.max_entries:])
+
+
+evaluation_cache = EvaluationCache()
@@ -1,32 +1,424 @@
+"""Shared LLM client layer.
+
+Every model call in the app goes through ``llm_client``, which bounds
+concurrency globally and per model, paces requests with a token bucket that
+backs off when the provider returns 429s, retries with exponential backoff
+and full jitter, and hedges a duplicate request once a call runs past that
+call site's recent p95 latency. Structured-output runnables are built once
+per (model, schema) and reused.
+
+Point ``LLM_BASE_URL`` at ``benchmarks.fake_openai`` to exercise all of this
+against a local OpenAI-compatible server.
+"""
+
+import asyncio
 import os
+import random
+import time
+from collections import defaultdict, deque
+from typing import TYPE_CHECKING, Any, AsyncIterator, Deque, Dict, List, Optional, Tuple, Type
 
 from dotenv import load_dotenv
-from langchain_openai import ChatOpenAI
+from langchain_core.callbacks import AsyncCallbackHandler
+from langchain_core.runnables import Runnable
+from pydantic import BaseModel
+
+from app import config
+from app.utils.helpers import percentile
+from app.utils.logger import LLM_RETRIES, LLM_TOKENS, LLM_TTFT_SECONDS, span
+
+if TYPE_CHECKING:
+    from langchain_openai import ChatOpenAI
 
 load_dotenv()
 
-_api_key = os.getenv("OPENAI_API_KEY")
-
-# Main LLM — used for asking questions and evaluating answers
-_llm = ChatOpenAI(
-    model="gpt-4o-mini",
-    temperature=0.4,
-    max_tokens=1024,
-    api_key=_api_key,
-)
-
-# Fast LLM — used for simple extractions (name, topic) with fewer tokens
-_llm_fast = ChatOpenAI(
-    model="gpt-4o-mini",
-    temperature=0.0,
-    max_tokens=256,
-    api_key=_api_key,
-)
-
-def get_llm() -> ChatOpenAI:
+# Clients are built on first use: importing langchain_openai/openai is the
+# single biggest cost of a cold worker start, and nothing needs it until the
+# first model call (see warm_up()).
+_llm: Optional["ChatOpenAI"] = None
+_llm_fast: Optional["ChatOpenAI"] = None
+
+
+def _build_llm(temperature: float, max_tokens: int) -> "ChatOpenAI":
+    from langchain_openai import ChatOpenAI
+
+    # Retries are owned by LLMClient, so the SDK's own retry loop is turned off
+    return ChatOpenAI(
+        model="gpt-4o-mini",
+        temperature=temperature,
+        max_tokens=max_tokens,
+        api_key=os.getenv("OPENAI_API_KEY"),
+        base_url=config.LLM_BASE_URL,
+        timeout=config.LLM_TIMEOUT_SECONDS,
+        max_retries=0,
+    )
+
+def get_llm() -> "ChatOpenAI":
     """Return the main LLM for questions and evaluation."""
+    global _llm
+    if _llm is None:
+        _llm = _build_llm(temperature=0.4, max_tokens=1024)
     return _llm
 
-def get_fast_llm() -> ChatOpenAI:
+def get_fast_llm() -> "ChatOpenAI":
     """Return the fast LLM for lightweight extractions."""
+    global _llm_fast
+    if _llm_fast is None:
+        _llm_fast = _build_llm(temperature=0.0, max_tokens=256)
     return _llm_fast
+
+def use_llms(llm, fast_llm=None) -> None:
+    """Replace both clients, e.g. with a fake for offline benchmarks."""
+    global _llm, _llm_fast
+    _llm = llm
+    _llm_fast = fast_llm if fast_llm is not None else llm
+
+def warm_up() -> None:
+    """Build both clients ahead of the first call; safe to run in a thread at startup."""
+    get_llm()
+    get_fast_llm()
+
+
+class TokenBucket:
+    """Request pacing with AIMD: halve the rate on a 429, creep back up on success."""
+
+    def __init__(self, rate: float, capacity: int, min_rate: float = 1.0):
+        self.max_rate = rate
+        self.rate = rate
+        self.min_rate = min(min_rate, rate)
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock: Optional[asyncio.Lock] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_acquire(self) -> bool:
+        self._refill()
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True
+        return False
+
+    async def acquire(self) -> None:
+        # The lock keeps waiters in FIFO order instead of racing for refills; it is
+        # made for the running loop, since the shared client outlives any one loop
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._lock, self._loop = asyncio.Lock(), loop
+        async with self._lock:
+            while not self.try_acquire():
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+    def throttle(self) -> None:
+        self._refill()
+        self.rate = max(self.min_rate, self.rate / 2)
+
+    def recover(self) -> None:
+        if self.rate < self.max_rate:
+            self._refill()
+            self.rate = min(self.max_rate, self.rate + self.max_rate / 50)
+
+
+class LLMClient:
+    """Concurrency limits, pacing, retries and hedging around LangChain runnables."""
+
+    def __init__(
+        self,
+        max_concurrency: int = config.LLM_MAX_CONCURRENCY,
+        model_concurrency: int = config.LLM_MODEL_CONCURRENCY,
+        requests_per_second: float = config.LLM_REQUESTS_PER_SECOND,
+        burst: int = config.LLM_BURST,
+        max_attempts: int = config.LLM_MAX_ATTEMPTS,
+        backoff_base: float = config.LLM_BACKOFF_BASE_SECONDS,
+        backoff_max: float = config.LLM_BACKOFF_MAX_SECONDS,
+        hedge: bool = config.LLM_HEDGE_ENABLED,
+        hedge_min_samples: int = config.LLM_HEDGE_MIN_SAMPLES,
+        hedge_budget: float = config.LLM_HEDGE_BUDGET,
+    ):
+        # Semaphores are made for the running loop on first use (see _bind_loop)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._global: Optional[asyncio.Semaphore] = None
+        self.max_concurrency = max_concurrency
+        self.in_flight = 0
+        self._model_concurrency = model_concurrency
+        self._models: Dict[str, asyncio.Semaphore] = {}
+        self.bucket = TokenBucket(requests_per_second, burst)
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.hedge = hedge
+        self.hedge_min_samples = hedge_min_samples
+        self.hedge_budget = hedge_budget
+        self._structured: Dict[Tuple[int, type], Tuple[Any, Runnable]] = {}
+        self._latency: Dict[str, Deque[float]] = defaultdict(lambda: deque(maxlen=200))
+        self.counts: Dict[str, int] = defaultdict(int)
+
+    # Runnables
+    def structured(self, llm, schema: Type[BaseModel]) -> Runnable:
+        """``llm.with_structured_output(schema)``, built once per model and schema."""
+        key = (id(llm), schema)
+        cached = self._structured.get(key)
+        if cached is None or cached[0] is not llm:
+            cached = self._structured[key] = (llm, llm.with_structured_output(schema))
+        return cached[1]
+
+    async def invoke_structured(self, llm, schema: Type[BaseModel], prompt, name: Optional[str] = None):
+        return await self.invoke(self.structured(llm, schema), prompt, name or schema.__name__, _model_of(llm))
+
+    def _bind_loop(self) -> None:
+        """Use semaphores made for the running loop.
+
+        The client is a module-level singleton, created at import with no loop
+        running, and tests and benchmarks run one ``asyncio.run`` after another.
+        """
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._global = asyncio.Semaphore(self.max_concurrency)
+            self._models = {}
+
+    # Calls
+    async def invoke(self, runnable: Runnable, prompt, name: str, model: str = "default"):
+        """Call ``runnable.ainvoke(prompt)`` with retries; raises the last error."""
+        self._bind_loop()
+        with span("llm", name, model=model) as trace:
+            usage = TokenUsage() if config.METRICS_ENABLED else None
+            try:
+                return await self._retrying(runnable, prompt, name, model, usage, trace)
+            finally:
+                if usage is not None:
+                    usage.record(name, trace)
+
+    async def _retrying(self, runnable: Runnable, prompt, name: str, model: str, usage, trace):
+        for attempt in range(self.max_attempts):
+            trace.set(attempts=attempt + 1)
+            try:
+                result = await self._hedged(runnable, prompt, name, model, usage)
+                self.bucket.recover()
+                return result
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.counts["errors"] += 1
+                if _is_rate_limit(e):
+                    self.counts["rate_limited"] += 1
+                    self.bucket.throttle()
+                if attempt == self.max_attempts - 1 or not _is_retryable(e):
+                    raise
+                self.counts["retries"] += 1
+                LLM_RETRIES.inc(1, name)
+                # Full jitter keeps retrying sessions from synchronizing
+                await asyncio.sleep(random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt)))
+
+    async def astream(self, runnable: Runnable, prompt, model: str = "default",
+                      name: str = "stream") -> AsyncIterator[Any]:
+        """Stream under the same limits; not retried or hedged once output has started."""
+        self._bind_loop()
+        with span("llm", name, model=model) as trace:
+            usage = TokenUsage() if config.METRICS_ENABLED else None
+            await self.bucket.acquire()
+            async with self._global, self._model_semaphore(model):
+                self.counts["requests"] += 1
+                self.in_flight += 1
+                started = time.perf_counter()
+                first = usage is not None
+                try:
+                    async for chunk in runnable.astream(prompt, {"callbacks": [usage]} if usage else None):
+                        if first:
+                            first = False
+                            LLM_TTFT_SECONDS.observe(time.perf_counter() - started, name)
+                            trace.set(ttft_ms=round(1000 * (time.perf_counter() - started), 1))
+                        yield chunk
+                finally:
+                    self.in_flight -= 1
+            if usage is not None:
+                usage.record(name, trace)
+
+    async def _call(self, runnable: Runnable, prompt, name: str, model: str, usage=None, hedge: bool = False):
+        if not hedge:
+            await self.bucket.acquire()
+        async with self._global, self._model_semaphore(model):
+            self.counts["hedges" if hedge else "requests"] += 1
+            self.in_flight += 1
+            started = time.perf_counter()
+            try:
+                result = await runnable.ainvoke(prompt, {"callbacks": [usage]} if usage else None)
+            finally:
+                self.in_flight -= 1
+            self._latency[name].append(time.perf_counter() - started)
+            return result
+
+    async def _hedged(self, runnable: Runnable, prompt, name: str, model: str, usage=None):
+        delay = self._hedge_delay(name)
+        primary = asyncio.ensure_future(self._call(runnable, prompt, name, model, usage))
+        backup = None
+        try:
+            if delay is None:
+                return await primary
+            done, _ = await asyncio.wait({primary}, timeout=delay)
+            # A hedge must never queue: only send it if it can start right away
+            if done or self._global.locked() or self._model_semaphore(model).locked() or not self.bucket.try_acquire():
+                return await primary
+
+            backup = asyncio.ensure_future(self._call(runnable, prompt, name, model, usage, hedge=True))
+            pending = {primary, backup}
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is backup:
+                            self.counts["hedge_wins"] += 1
+                        return task.result()
+            # Both copies failed; the retry loop takes it from here
+            return primary.result()
+        finally:
+            for task in (primary, backup):
+                if task is not None:
+                    task.cancel()
+
+    def _hedge_delay(self, name: str) -> Optional[float]:
+        samples = self._latency[name]
+        if not self.hedge or len(samples) < self.hedge_min_samples:
+            return None
+        if self.counts["hedges"] >= self.hedge_budget * max(1, self.counts["requests"]):
+            return None
+        return percentile(list(samples), 95)
+
+    def _model_semaphore(self, model: str) -> asyncio.Semaphore:
+        semaphore = self._models.get(model)
+        if semaphore is None:
+            semaphore = self._models[model] = asyncio.Semaphore(self._model_concurrency)
+        return semaphore
+
+    def headroom(self) -> float:
+        """Spare request capacity in [0, 1]: drops when 429s throttle the rate or calls pile up."""
+        rate = self.bucket.rate / self.bucket.max_rate
+        slots = 1 - self.in_flight / self.max_concurrency
+        return max(0.0, min(rate, slots))
+
+    def stats(self) -> dict:
+        return {
+            **self.counts,
+            "rate": self.bucket.rate,
+            "in_flight": self.in_flight,
+            "headroom": round(self.headroom(), 3),
+            "p95_ms": {name: 1000 * percentile(list(v), 95) for name, v in self._latency.items() if v},
+        }
+
+
+class TokenUsage(AsyncCallbackHandler):
+    """Collects prompt/completion token counts reported by the chat model."""
+
+    run_inline = True
+
+    def __init__(self):
+        self.prompt = 0
+        self.completion = 0
+
+    async def on_llm_end(self, response, **kwargs) -> None:
+        for generations in response.generations:
+            for generation in generations:
+                usage = getattr(getattr(generation, "message", None), "usage_metadata", None)
+                if usage:
+                    self.prompt += usage.get("input_tokens", 0)
+                    self.completion += usage.get("output_tokens", 0)
+
+    def record(self, name: str, trace) -> None:
+        LLM_TOKENS.inc(self.prompt, name, "prompt")
+        LLM_TOKENS.inc(self.completion, name, "completion")
+        trace.set(prompt_tokens=self.prompt, completion_tokens=self.completion)
+
+
+def _model_of(llm) -> str:
+    return getattr(llm, "model_name", None) or getattr(llm, "model", None) or "default"
+
+
+def _is_rate_limit(error: Exception) -> bool:
+    return getattr(error, "status_code", None) == 429 or type(error).__name__ == "RateLimitError"
+
+
+def _is_retryable(error: Exception) -> bool:
+    """Rate limits, server errors, timeouts and dropped connections; not other 4xx responses."""
+    status = getattr(error, "status_code", None)
+    if not isinstance(status, int) or status < 400 or status >= 500:
+        return True
+    return status in (408, 409, 429) or _is_rate_limit(error)
+
+
+llm_client = LLMClient()
+
+
+async def invoke_structured(llm, schema: Type[BaseModel], prompt, name: Optional[str] = None):
+    """Structured-output call through the shared client."""
+    return await llm_client.invoke_structured(llm, schema, prompt, name)
+
+
+async def astream_text(llm: "ChatOpenAI", messages, name: str = "stream", **bind_kwargs) -> AsyncIterator[str]:
+    """Yield content deltas from a streaming chat completion."""
+    runnable = llm.bind(**bind_kwargs) if bind_kwargs else llm
+    async for chunk in llm_client.astream(runnable, messages, _model_of(llm), name):
+        if chunk.content:
+            yield chunk.content
+
+
+class JsonFieldStreamer:
+    """Incrementally extracts top-level string fields from a streamed JSON object.
+
+    ``feed`` returns ``(field, text)`` pieces as soon as their characters
+    arrive, so a spoken field can go to TTS before the object is complete.
+    """
+
+    _ESCAPES = {'"': '"', "\\": "\\", "/": "/", "b": "\b", "f": "\f", "n": "\n", "r": "\r", "t": "\t"}
+
+    def __init__(self):
+        self.raw = ""
+        self._state = "scan"
+        self._key = ""
+        self._field: Optional[str] = None
+        self._escape = ""
+
+    def feed(self, delta: str) -> List[Tuple[str, str]]:
+        self.raw += delta
+        pieces: List[Tuple[str, str]] = []
+        text = ""
+        for ch in delta:
+            if self._state == "scan":
+                if ch == '"':
+                    self._state, self._key = "key", ""
+            elif self._state == "key":
+                if ch == '"':
+                    self._state = "colon"
+                else:
+                    self._key += ch
+            elif self._state == "colon":
+                if ch == '"':
+                    self._state, self._field = "value", self._key
+                elif ch in ",}":
+                    self._state = "scan"
+            elif self._state == "value":
+                if self._escape:
+                    self._escape += ch
+                    if self._escape[1] == "u":
+                        if len(self._escape) == 6:
+                            text += chr(int(self._escape[2:], 16))
+                            self._escape = ""
+                    else:
+                        text += self._ESCAPES.get(ch, ch)
+                        self._escape = ""
+                elif ch == "\\":
+                    self._escape = ch
+                elif ch == '"':
+                    if text:
+                        pieces.append((self._field, text))
+                        text = ""
+                    self._state, self._field = "scan", None
+                else:
+                    text += ch
+        if text:
+            pieces.append((self._field, text))
+        return pieces
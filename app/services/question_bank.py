@@ -0,0 +1,278 @@
+"""Local question bank.
+
+Questions are stored in SQLite (``QUESTION_BANK_PATH``) and held in memory
+as one id list per cell, where a cell is a normalized topic plus difficulty.
+New questions are dropped when a question already in the cell is a
+near-duplicate (MinHash/LSH, ``QUESTION_BANK_SIMILARITY``). Every asked
+question is recorded against the candidate, so a student who retakes the
+interview is never asked the same question twice.
+
+``sample()`` draws a pool with a sparse Fisher-Yates shuffle: O(1) per
+question drawn (plus one step per already-seen question skipped), without
+copying or reordering the cell. A cell with fewer than
+``QUESTION_BANK_MIN_CELL`` questions is "thin": the interview is served from
+what the bank has when it can, and generated questions are added back.
+
+    python -m app.services.question_bank stats
+    python -m app.services.question_bank import questions.json
+"""
+
+import argparse
+import json
+import os
+import random
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Iterator, List, Optional, Sequence, Set
+
+from app import config
+from app.core.intent import FILLER_WORDS, canonical_topic, normalize
+from app.utils.similarity import LSHIndex
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS questions (
+    id INTEGER PRIMARY KEY,
+    cell TEXT NOT NULL,
+    text TEXT NOT NULL,
+    source TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    UNIQUE (cell, text)
+);
+CREATE TABLE IF NOT EXISTS asked_questions (
+    candidate TEXT NOT NULL,
+    question_id INTEGER NOT NULL,
+    asked_at REAL NOT NULL,
+    PRIMARY KEY (candidate, question_id)
+);
+"""
+
+# Phrasing that does not change what is being asked
+_QUESTION_STOPWORDS = FILLER_WORDS | {
+    "what", "whats", "explain", "describe", "define", "briefly", "tell", "us", "are", "does", "of", "by", "mean",
+    "meant", "difference", "between", "how", "why", "when", "which", "your", "own", "words",
+}
+# Recent candidates whose history is kept in memory
+_HISTORY_CACHE_SIZE = 4096
+
+
+def normalize_topic(topic: str) -> str:
+    """'reactjs', 'React JS', 'react.js' -> 'react'."""
+    canonical = canonical_topic(topic or "")
+    if canonical:
+        return canonical.lower()
+    return " ".join(normalize(topic or ""))
+
+
+def question_tokens(text: str) -> List[str]:
+    return [t for t in normalize(text) if t not in _QUESTION_STOPWORDS] or normalize(text)
+
+
+def candidate_key(candidate_id: Optional[str], student_name: str = "", college: str = "") -> Optional[str]:
+    """Stable identity for question history; name and college when there is no candidate id."""
+    if candidate_id:
+        return f"id:{candidate_id}"
+    if student_name:
+        return f"name:{' '.join(normalize(student_name))}|{' '.join(normalize(college))}"
+    return None
+
+
+def _shuffled(ids: List[int]) -> Iterator[int]:
+    """Sparse Fisher-Yates: yields ``ids`` in random order, O(1) per item, without copying the list."""
+    swaps: Dict[int, int] = {}
+    for i in range(len(ids)):
+        j = random.randrange(i, len(ids))
+        chosen = swaps.get(j, j)
+        swaps[j] = swaps.get(i, i)
+        yield ids[chosen]
+
+
+class QuestionBank:
+    def __init__(
+        self,
+        path: Optional[str] = config.QUESTION_BANK_PATH,
+        min_cell: int = config.QUESTION_BANK_MIN_CELL,
+        similarity: float = config.QUESTION_BANK_SIMILARITY,
+        enabled: bool = config.QUESTION_BANK_ENABLED,
+    ):
+        self.path = path
+        self.min_cell = min_cell
+        self.similarity = similarity
+        self.enabled = enabled
+        self.served = 0
+        self.thin = 0
+        self.repeats = 0
+        self.added = 0
+        self.duplicates = 0
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._cells: Dict[str, List[int]] = {}
+        self._texts: Dict[int, str] = {}
+        self._ids: Dict[str, int] = {}
+        self._index = LSHIndex()
+        self._history: "OrderedDict[str, Set[int]]" = OrderedDict()
+
+    @staticmethod
+    def cell(topic: str, difficulty: Optional[str]) -> str:
+        return f"{normalize_topic(topic)}|{difficulty or ''}"
+
+    def size(self, topic: str, difficulty: Optional[str]) -> int:
+        self._load()
+        return len(self._cells.get(self.cell(topic, difficulty), ()))
+
+    def is_thin(self, topic: str, difficulty: Optional[str]) -> bool:
+        return self.size(topic, difficulty) < self.min_cell
+
+    def add(self, topic: str, difficulty: Optional[str], questions: Sequence[str], source: str = "llm") -> int:
+        """Store new questions, skipping near-duplicates of ones already in the cell; returns how many were added."""
+        self._load()
+        cell = self.cell(topic, difficulty)
+        added = 0
+        with self._lock:
+            for text in questions:
+                text = " ".join((text or "").split())
+                tokens = question_tokens(text)
+                if not tokens:
+                    continue
+                if f"{cell}|{text}" in self._ids or self._index.query(tokens, cell, self.similarity):
+                    self.duplicates += 1
+                    continue
+                question_id = self._conn.execute(
+                    "INSERT INTO questions (cell, text, source, created_at) VALUES (?, ?, ?, ?)",
+                    (cell, text, source, time.time()),
+                ).lastrowid
+                self._remember(question_id, cell, text, tokens)
+                added += 1
+        self.added += added
+        return added
+
+    def sample(self, topic: str, difficulty: Optional[str], size: int, candidate: Optional[str] = None) -> List[str]:
+        """Up to ``size`` random questions from the cell that ``candidate`` has not been asked."""
+        self._load()
+        ids = self._cells.get(self.cell(topic, difficulty), [])
+        seen = self._seen(candidate)
+        picked: List[str] = []
+        for question_id in _shuffled(ids):
+            if question_id in seen:
+                continue
+            picked.append(self._texts[question_id])
+            if len(picked) == size:
+                break
+        if len(picked) == size:
+            self.served += 1
+        else:
+            self.thin += 1
+        return picked
+
+    def sample_repeats(self, topic: str, difficulty: Optional[str], size: int, exclude: Sequence[str]) -> List[str]:
+        """Up to ``size`` questions the candidate has already been asked, to pad a short pool.
+
+        Counted as ``repeats``, not as a draw: the lookup that came up short
+        was already counted as ``thin``.
+        """
+        self._load()
+        exclude = set(exclude)
+        picked: List[str] = []
+        for question_id in _shuffled(self._cells.get(self.cell(topic, difficulty), [])):
+            if len(picked) == size:
+                break
+            if self._texts[question_id] not in exclude:
+                picked.append(self._texts[question_id])
+        self.repeats += len(picked)
+        return picked
+
+    def record(self, candidate: Optional[str], topic: str, difficulty: Optional[str], question: str) -> None:
+        """Remember that ``candidate`` was asked ``question``; repeats are already on record."""
+        if not candidate:
+            return
+        self._load()
+        question_id = self._ids.get(f"{self.cell(topic, difficulty)}|{' '.join(question.split())}")
+        seen = self._seen(candidate)
+        if question_id is None or question_id in seen:
+            return
+        seen.add(question_id)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR IGNORE INTO asked_questions (candidate, question_id, asked_at) VALUES (?, ?, ?)",
+                (candidate, question_id, time.time()),
+            )
+
+    def cell_sizes(self) -> Dict[str, int]:
+        self._load()
+        return {cell: len(ids) for cell, ids in sorted(self._cells.items())}
+
+    def stats(self) -> dict:
+        lookups = self.served + self.thin
+        return {
+            "cells": len(self._cells),
+            "questions": len(self._texts),
+            "served": self.served,
+            "thin": self.thin,
+            "repeats": self.repeats,
+            "added": self.added,
+            "duplicates": self.duplicates,
+            "hit_rate": round(self.served / lookups, 3) if lookups else 0.0,
+        }
+
+    def _remember(self, question_id: int, cell: str, text: str, tokens: List[str]) -> None:
+        self._cells.setdefault(cell, []).append(question_id)
+        self._texts[question_id] = text
+        self._ids[f"{cell}|{text}"] = question_id
+        self._index.add(question_id, tokens, cell)
+
+    def _seen(self, candidate: Optional[str]) -> Set[int]:
+        if not candidate:
+            return set()
+        seen = self._history.get(candidate)
+        if seen is None:
+            with self._lock:
+                rows = self._conn.execute(
+                    "SELECT question_id FROM asked_questions WHERE candidate = ?", (candidate,)
+                ).fetchall()
+            seen = self._history[candidate] = {row[0] for row in rows}
+            while len(self._history) > _HISTORY_CACHE_SIZE:
+                self._history.popitem(last=False)
+        self._history.move_to_end(candidate)
+        return seen
+
+    def _load(self) -> None:
+        if self._conn is not None:
+            return
+        with self._lock:
+            if self._conn is not None:
+                return
+            path = self.path or ":memory:"
+            if path != ":memory:":
+                os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(SCHEMA)
+            for question_id, cell, text in conn.execute("SELECT id, cell, text FROM questions ORDER BY id"):
+                self._remember(question_id, cell, text, question_tokens(text))
+            self._conn = conn
+
+
+question_bank = QuestionBank()
+
+
+def _import(path: str) -> None:
+    """JSON list of {"topic": ..., "difficulty": ..., "questions": [...]}."""
+    with open(path, "r", encoding="utf-8") as f:
+        groups = json.load(f)
+    added = sum(question_bank.add(g["topic"], g.get("difficulty"), g["questions"], source="import") for g in groups)
+    print(f"Added {added} questions ({question_bank.duplicates} near-duplicates skipped)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Inspect or seed the local question bank.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("stats")
+    seed = commands.add_parser("import")
+    seed.add_argument("file", help="JSON list of {topic, difficulty, questions}")
+    args = parser.parse_args()
+    if args.command == "import":
+        _import(args.file)
+    else:
+        print(json.dumps(question_bank.cell_sizes(), indent=2))
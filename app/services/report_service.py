@@ -0,0 +1,422 @@
+"""Post-interview feedback reports, generated off the call path.
+
+When an interview ends, its questions, answers and verdicts are queued in
+SQLite (``REPORT_QUEUE_PATH``); the terminal node only pays for one insert.
+``ReportWorker`` collects queued interviews into batches of up to
+``REPORT_BATCH_SIZE`` (waiting at most ``REPORT_BATCH_WAIT_SECONDS`` for a
+batch to fill), writes one LLM call per batch, and runs at most
+``REPORT_CONCURRENCY`` batches at once. It only starts a batch while the shared
+LLM client has headroom, so reports yield to live calls. Reports land in
+``REPORTS_DIR`` as one JSON file per thread_id.
+
+A batch that fails is retried up to ``REPORT_MAX_ATTEMPTS`` times, each retry
+held back (``not_before``) for ``REPORT_RETRY_BACKOFF_SECONDS``, doubling per
+attempt; after that, a report is written from the verdicts alone, with no
+summary. A candidate the model's reply does not name by its ref also gets the
+verdicts-only report: reports are never matched to candidates by position.
+Jobs claimed by a process that died are requeued on the next start.
+
+    python -m app.services.report_service   # drain the queue and exit
+"""
+
+import asyncio
+import inspect
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional, Set, Tuple
+
+from langchain_core.messages import HumanMessage, SystemMessage
+from langchain_core.runnables import RunnableConfig
+from pydantic import BaseModel, Field
+
+from app import config
+from app.core.prompts import REPORT_BATCH_SYSTEM_PROMPT
+from app.core.state import InterviewState, QuestionEvaluation
+from app.models.schemas import CandidateReport, ReportBatch
+from app.services.llm_service import get_llm, invoke_structured, llm_client
+from app.utils.helpers import percentile, thread_id_of
+from app.utils.logger import registry, span
+
+# Report job states
+PENDING, IN_PROGRESS, DONE = "pending", "in_progress", "done"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS report_jobs (
+    thread_id TEXT PRIMARY KEY,
+    job TEXT NOT NULL,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    not_before REAL NOT NULL DEFAULT 0,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS report_jobs_pending ON report_jobs (status, created_at);
+"""
+
+# Long answers are cut down before they go into a batch prompt
+MAX_ANSWER_CHARS = 600
+
+_REPORTS = registry.counter("intervu_reports_total", "Feedback reports written.", ("source",))
+
+logger = logging.getLogger("intervu.reports")
+
+
+class ReportJob(BaseModel):
+    thread_id: str
+    candidate_id: Optional[str] = None
+    student_name: str = ""
+    college: str = ""
+    course: str = ""
+    topic: Optional[str] = None
+    difficulty: Optional[str] = None
+    evaluations: List[QuestionEvaluation] = Field(default_factory=list)
+    finished_at: float = Field(default_factory=time.time)
+
+
+class ReportStore:
+    def __init__(self, path: str = config.REPORT_QUEUE_PATH):
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(report_jobs)")}
+        if "not_before" not in columns:
+            # Queue files from before retry backoff
+            self._conn.execute("ALTER TABLE report_jobs ADD COLUMN not_before REAL NOT NULL DEFAULT 0")
+
+    def add(self, job: ReportJob) -> bool:
+        """Queue a finished interview; False if the thread already had a job.
+
+        A job still waiting is replaced, so the rerun of a cut-off final turn
+        queues its own evaluations; one already claimed is kept.
+        """
+        now = time.time()
+        with self._lock:
+            if self._conn.execute(
+                "INSERT OR IGNORE INTO report_jobs (thread_id, job, status, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (job.thread_id, job.model_dump_json(), PENDING, now, now),
+            ).rowcount > 0:
+                return True
+            self._conn.execute(
+                "UPDATE report_jobs SET job = ?, updated_at = ? WHERE thread_id = ? AND status = ?",
+                (job.model_dump_json(), now, job.thread_id, PENDING),
+            )
+            return False
+
+    def requeue_interrupted(self) -> int:
+        with self._lock:
+            return self._conn.execute(
+                "UPDATE report_jobs SET status = ? WHERE status = ?", (PENDING, IN_PROGRESS)
+            ).rowcount
+
+    def pending(self) -> Tuple[int, Optional[float], Optional[float]]:
+        """Queued jobs that can run now, when the oldest of them was queued, and when the next held-back one can."""
+        now = time.time()
+        with self._lock:
+            count, oldest = self._conn.execute(
+                "SELECT COUNT(*), MIN(created_at) FROM report_jobs WHERE status = ? AND not_before <= ?",
+                (PENDING, now),
+            ).fetchone()
+            next_retry = self._conn.execute(
+                "SELECT MIN(not_before) FROM report_jobs WHERE status = ? AND not_before > ?", (PENDING, now)
+            ).fetchone()[0]
+        return count, oldest, next_retry
+
+    def claim(self, limit: int) -> List[Tuple[ReportJob, int]]:
+        """Oldest queued jobs that are not held back, marked in progress, with their attempt counts so far."""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            rows = self._conn.execute(
+                "SELECT thread_id, job, attempts FROM report_jobs WHERE status = ? AND not_before <= ? "
+                "ORDER BY created_at LIMIT ?",
+                (PENDING, time.time(), limit),
+            ).fetchall()
+            self._conn.executemany(
+                "UPDATE report_jobs SET status = ?, updated_at = ? WHERE thread_id = ?",
+                [(IN_PROGRESS, time.time(), row[0]) for row in rows],
+            )
+            self._conn.execute("COMMIT")
+        return [(ReportJob.model_validate_json(row[1]), row[2]) for row in rows]
+
+    def retry(self, thread_id: str, delay: float = 0.0) -> None:
+        """Queue the job again, not to be claimed for ``delay`` seconds."""
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "UPDATE report_jobs SET status = ?, attempts = attempts + 1, not_before = ?, updated_at = ? "
+                "WHERE thread_id = ?",
+                (PENDING, now + delay, now, thread_id),
+            )
+
+    def finish(self, thread_id: str) -> None:
+        with self._lock:
+            self._conn.execute(
+                "UPDATE report_jobs SET status = ?, updated_at = ? WHERE thread_id = ?",
+                (DONE, time.time(), thread_id),
+            )
+
+    def counts(self) -> Dict[str, int]:
+        with self._lock:
+            rows = self._conn.execute("SELECT status, COUNT(*) FROM report_jobs GROUP BY status").fetchall()
+        return dict(rows)
+
+
+def transcript(ref: str, job: ReportJob) -> str:
+    lines = [f"Candidate {ref} — topic: {job.topic or 'unknown'}, difficulty: {job.difficulty or 'unknown'}"]
+    for i, evaluation in enumerate(job.evaluations, 1):
+        answer = (evaluation.answer or "").strip()
+        if len(answer) > MAX_ANSWER_CHARS:
+            answer = answer[:MAX_ANSWER_CHARS] + "..."
+        verdict = "correct" if evaluation.correct else f"wrong — correction: {evaluation.correction or 'none given'}"
+        lines += [f"Q{i}: {evaluation.question}", f"Answer: {answer or '(no answer)'}", f"Verdict: {verdict}"]
+    return "\n".join(lines)
+
+
+def report_document(job: ReportJob, report: Optional[CandidateReport]) -> dict:
+    correct = sum(1 for e in job.evaluations if e.correct)
+    return {
+        "thread_id": job.thread_id,
+        "candidate_id": job.candidate_id,
+        "student_name": job.student_name,
+        "college": job.college,
+        "course": job.course,
+        "topic": job.topic,
+        "difficulty": job.difficulty,
+        "finished_at": job.finished_at,
+        "generated_at": time.time(),
+        "score": {"correct": correct, "total": len(job.evaluations)},
+        "questions": [
+            {"question": e.question, "answer": e.answer, "correct": e.correct,
+             "feedback": e.short_feedback, "correction": e.correction}
+            for e in job.evaluations
+        ],
+        "summary": report.summary if report else None,
+        "strengths": report.strengths if report else [],
+        "improvements": report.improvements if report else [],
+        "source": "llm" if report else "fallback",
+    }
+
+
+def write_report(reports_dir: str, job: ReportJob, report: Optional[CandidateReport]) -> str:
+    os.makedirs(reports_dir, exist_ok=True)
+    path = os.path.join(reports_dir, re.sub(r"[^A-Za-z0-9_.-]", "_", job.thread_id) + ".json")
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(report_document(job, report), f, indent=2)
+    os.replace(tmp_path, path)
+    return path
+
+
+class ReportWorker:
+    def __init__(
+        self,
+        queue_path: str = config.REPORT_QUEUE_PATH,
+        reports_dir: str = config.REPORTS_DIR,
+        batch_size: int = config.REPORT_BATCH_SIZE,
+        batch_wait_seconds: float = config.REPORT_BATCH_WAIT_SECONDS,
+        concurrency: int = config.REPORT_CONCURRENCY,
+        max_attempts: int = config.REPORT_MAX_ATTEMPTS,
+        retry_backoff_seconds: float = config.REPORT_RETRY_BACKOFF_SECONDS,
+        min_llm_headroom: float = config.REPORT_MIN_LLM_HEADROOM,
+    ):
+        self.queue_path = queue_path
+        self.reports_dir = reports_dir
+        self.batch_size = batch_size
+        self.batch_wait_seconds = batch_wait_seconds
+        self.concurrency = concurrency
+        self.max_attempts = max_attempts
+        self.retry_backoff_seconds = retry_backoff_seconds
+        self.min_llm_headroom = min_llm_headroom
+        self.active: Set[asyncio.Task] = set()
+        self.enqueued = 0
+        self.written: Dict[str, int] = {"llm": 0, "fallback": 0}
+        self.batches = 0
+        self.retries = 0
+        self.unmatched = 0
+        self.batch_seconds: List[float] = []
+        self.headroom_waits = 0
+        self._store: Optional[ReportStore] = None
+        self._task: Optional[asyncio.Task] = None
+        self._wake: Optional[asyncio.Event] = None
+        self._flushing = False
+        self._stopping = False
+        self._first_claim: Optional[float] = None
+        self._last_written: Optional[float] = None
+
+    @property
+    def store(self) -> ReportStore:
+        # Opened on first use so importing the graph does not create the queue file
+        if self._store is None:
+            self._store = ReportStore(self.queue_path)
+        return self._store
+
+    def enqueue(self, job: ReportJob) -> None:
+        if self.store.add(job):
+            self.enqueued += 1
+        self.start()
+
+    def start(self) -> None:
+        """Run the worker on the current event loop, if it is not running already."""
+        if self._task is None or self._task.done():
+            self._stopping = False
+            self._wake = asyncio.Event()
+            self._task = asyncio.create_task(self._run())
+        self._wake.set()
+
+    async def drain(self) -> dict:
+        """Write every queued report now, without waiting for batches to fill."""
+        self._flushing = True
+        try:
+            self.start()
+            while True:
+                counts = self.store.counts()
+                if not counts.get(PENDING) and not counts.get(IN_PROGRESS) and not self.active:
+                    return self.stats()
+                await asyncio.sleep(0.05)
+        finally:
+            self._flushing = False
+
+    async def stop(self, timeout: float = 5.0) -> None:
+        """Stop claiming batches; give in-flight ones ``timeout`` seconds, the rest stay queued."""
+        if self._task is None:
+            return
+        self._stopping = True
+        self._wake.set()
+        await asyncio.gather(self._task, return_exceptions=True)
+        if self.active:
+            await asyncio.wait(self.active, timeout=timeout)
+        for task in self.active:
+            task.cancel()
+
+    async def _run(self) -> None:
+        self.store.requeue_interrupted()
+        while not self._stopping:
+            self._wake.clear()
+            if len(self.active) >= self.concurrency:
+                await asyncio.wait(self.active, return_when=asyncio.FIRST_COMPLETED)
+                continue
+            count, oldest, next_retry = self.store.pending()
+            if not count:
+                # Nothing to do until a held-back job comes due or a new one is queued
+                await self._sleep(None if next_retry is None else max(next_retry - time.time(), 0.01))
+                continue
+            wait = oldest + self.batch_wait_seconds - time.time()
+            if count < self.batch_size and wait > 0 and not self._flushing:
+                await self._sleep(wait)
+                continue
+            if llm_client.headroom() < self.min_llm_headroom:
+                # Live calls come first; check again shortly
+                self.headroom_waits += 1
+                await self._sleep(0.25)
+                continue
+            jobs = self.store.claim(self.batch_size)
+            if self._first_claim is None:
+                self._first_claim = time.monotonic()
+            task = asyncio.create_task(self._run_batch(jobs))
+            self.active.add(task)
+            task.add_done_callback(self.active.discard)
+
+    async def _sleep(self, timeout: Optional[float]) -> None:
+        try:
+            await asyncio.wait_for(self._wake.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+
+    async def _run_batch(self, jobs: List[Tuple[ReportJob, int]]) -> None:
+        started = time.perf_counter()
+        with span("report", "batch", size=len(jobs)):
+            try:
+                reports = await self._generate([job for job, _ in jobs])
+            except Exception as e:
+                logger.warning("Report batch of %d failed: %s", len(jobs), e)
+                reports = None
+        self.batches += 1
+        self.batch_seconds.append(time.perf_counter() - started)
+
+        for job, attempts in jobs:
+            report = reports.get(job.thread_id) if reports is not None else None
+            if reports is None and attempts + 1 < self.max_attempts:
+                self._retry(job.thread_id, attempts)
+                continue
+            if reports is not None and report is None:
+                # The model answered but did not name this candidate; a guess could be someone else's report
+                self.unmatched += 1
+                logger.warning("No report for %s in its batch; writing verdicts only", job.thread_id)
+            try:
+                await asyncio.to_thread(write_report, self.reports_dir, job, report)
+            except OSError as e:
+                logger.error("Error writing report %s: %s", job.thread_id, e)
+                self._retry(job.thread_id, attempts)
+                continue
+            self.store.finish(job.thread_id)
+            source = "llm" if report else "fallback"
+            self.written[source] += 1
+            _REPORTS.inc(1, source)
+            self._last_written = time.monotonic()
+        self._wake.set()
+
+    async def _generate(self, jobs: List[ReportJob]) -> Dict[str, CandidateReport]:
+        refs = {f"c{i}": job for i, job in enumerate(jobs, 1)}
+        result = await invoke_structured(get_llm(), ReportBatch, [
+            SystemMessage(content=REPORT_BATCH_SYSTEM_PROMPT),
+            HumanMessage(content="\n\n".join(transcript(ref, job) for ref, job in refs.items())),
+        ])
+        return {refs[r.candidate_ref.strip()].thread_id: r for r in result.reports if r.candidate_ref.strip() in refs}
+
+    def _retry(self, thread_id: str, attempts: int) -> None:
+        self.retries += 1
+        self.store.retry(thread_id, self.retry_backoff_seconds * 2 ** attempts)
+
+    def stats(self) -> dict:
+        written = sum(self.written.values())
+        elapsed = (self._last_written - self._first_claim) if self._last_written and self._first_claim else 0.0
+        return {
+            "queue": self.store.counts(),
+            "enqueued": self.enqueued,
+            "written": dict(self.written),
+            "batches": self.batches,
+            "retries": self.retries,
+            "unmatched": self.unmatched,
+            "avg_batch_size": round(written / self.batches, 2) if self.batches else 0.0,
+            "batch_p95_ms": round(1000 * percentile(self.batch_seconds, 95), 1),
+            "headroom_waits": self.headroom_waits,
+            "reports_per_minute": round(60 * written / elapsed, 1) if elapsed else 0.0,
+        }
+
+
+report_worker = ReportWorker()
+
+
+def enqueues_report(node):
+    """Wrap a terminal node so a finished interview with answers is queued for its report."""
+    takes_config = "config" in inspect.signature(node).parameters
+
+    async def wrapper(state: InterviewState, config: RunnableConfig) -> dict:
+        update = await (node(state, config) if takes_config else node(state))
+        evaluations = update.get("evaluations", state.evaluations)
+        if evaluations:
+            try:
+                report_worker.enqueue(ReportJob(
+                    thread_id=thread_id_of(config), candidate_id=state.candidate_id,
+                    student_name=state.student_name, college=state.college, course=state.course,
+                    topic=state.topic, difficulty=state.difficulty, evaluations=evaluations,
+                ))
+            except Exception as e:
+                logger.error("Error queueing report for %s: %s", thread_id_of(config), e)
+        return update
+
+    wrapper.__name__ = node.__name__
+    return wrapper
+
+
+if __name__ == "__main__":
+    print(json.dumps(asyncio.run(report_worker.drain()), indent=2))
@@ -0,0 +1,132 @@
+"""Streaming speech-to-text.
+
+Backends consume 16 kHz linear16 audio as it arrives and yield ``Transcript``
+updates: interim partials while the candidate is talking, then one final
+transcript at end of utterance. ``PartialStabilizer`` flags a partial once it
+has stopped changing, which is when callers may act on it speculatively.
+"""
+
+import asyncio
+import re
+import wave
+from typing import AsyncIterable, AsyncIterator, Optional
+
+import numpy as np
+from pydantic import BaseModel
+
+from app import config
+from app.streaming.audio_stream import STT_RATE
+from app.streaming.vad import VoiceActivityDetector
+from app.utils.logger import span
+
+
+class Transcript(BaseModel):
+    text: str
+    is_final: bool = False
+    audio_ms: float = 0.0
+
+
+class STTService:
+    """Turns a stream of PCM chunks into partial and final transcripts."""
+
+    sample_rate: int = STT_RATE
+
+    def transcribe(self, audio: AsyncIterable[bytes]) -> AsyncIterator[Transcript]:
+        raise NotImplementedError
+
+
+class WavReplaySTT(STTService):
+    """Offline stand-in that replays a WAV file as one reply with a known transcript.
+
+    The file is scanned once up front to measure its voiced audio. During
+    replay, words are revealed in proportion to the voiced audio heard so
+    far, with the word in progress shown as a prefix the way real recognizers
+    revise their tail. The final transcript is emitted on the file's last VAD
+    end-of-utterance event, so its timing follows the audio just like a live
+    backend's would.
+    """
+
+    def __init__(self, path: str, transcript: str, realtime: bool = True,
+                 partial_interval_ms: int = config.STT_PARTIAL_INTERVAL_MS):
+        self.path = path
+        self.transcript = transcript.strip()
+        self.realtime = realtime
+        self.partial_interval_ms = partial_interval_ms
+        self._voiced_ms, self._utterances = self._scan(path)
+
+    def _scan(self, path: str):
+        vad = VoiceActivityDetector(sample_rate=self.sample_rate)
+        with wave.open(path, "rb") as wav:
+            samples = np.frombuffer(wav.readframes(wav.getnframes()), dtype=np.int16)
+        voiced_ms = 0.0
+        utterances = 0
+        for start in range(0, len(samples), vad.frame_len):
+            utterances += sum(e.type == "speech_end" for e in vad.process(samples[start:start + vad.frame_len]))
+            voiced_ms += vad.frame_ms if vad.in_speech and vad.last_frame_is_speech else 0
+        return voiced_ms, utterances + len(vad.flush())
+
+    def _partial(self, voiced_ms: float) -> str:
+        shown = int(len(self.transcript) * min(1.0, voiced_ms / self._voiced_ms)) if self._voiced_ms else 0
+        text = self.transcript[:shown]
+        return text if shown == len(self.transcript) else text.rstrip()
+
+    async def transcribe(self, audio: Optional[AsyncIterable[bytes]] = None) -> AsyncIterator[Transcript]:
+        audio = audio or wav_chunks(self.path, realtime=self.realtime)
+        vad = VoiceActivityDetector(sample_rate=self.sample_rate)
+        voiced_ms = 0.0
+        ended = 0
+        last_partial_ms = 0.0
+        async for chunk in audio:
+            with span("stt", "chunk"):
+                samples = np.frombuffer(chunk, dtype=np.int16)
+                for start in range(0, len(samples), vad.frame_len):
+                    ended += sum(e.type == "speech_end" for e in vad.process(samples[start:start + vad.frame_len]))
+                    voiced_ms += vad.frame_ms if vad.in_speech and vad.last_frame_is_speech else 0
+            audio_ms = vad.frames_processed * vad.frame_ms
+            if ended and ended >= self._utterances:
+                yield Transcript(text=self.transcript, is_final=True, audio_ms=audio_ms)
+                return
+            if voiced_ms and audio_ms - last_partial_ms >= self.partial_interval_ms:
+                last_partial_ms = audio_ms
+                text = self._partial(voiced_ms)
+                if text:
+                    yield Transcript(text=text, audio_ms=audio_ms)
+        yield Transcript(text=self.transcript, is_final=True, audio_ms=vad.frames_processed * vad.frame_ms)
+
+
+async def wav_chunks(path: str, chunk_ms: int = 20, realtime: bool = True) -> AsyncIterator[bytes]:
+    """Yield a 16 kHz mono linear16 WAV file in fixed chunks, optionally paced in real time."""
+    with wave.open(path, "rb") as wav:
+        if wav.getnchannels() != 1 or wav.getsampwidth() != 2 or wav.getframerate() != STT_RATE:
+            raise ValueError(f"{path} must be {STT_RATE} Hz mono 16-bit PCM")
+        frames_per_chunk = STT_RATE * chunk_ms // 1000
+        while chunk := wav.readframes(frames_per_chunk):
+            yield chunk
+            await asyncio.sleep(chunk_ms / 1000 if realtime else 0)
+
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+class PartialStabilizer:
+    """Reports a partial once it has come back unchanged ``repeats`` times in a row."""
+
+    def __init__(self, repeats: int = config.STT_STABLE_PARTIALS):
+        self.repeats = repeats
+        self._text = ""
+        self._count = 0
+        self._reported: Optional[str] = None
+
+    def update(self, transcript: Transcript) -> Optional[str]:
+        text = _WHITESPACE.sub(" ", transcript.text).strip()
+        if text.lower() == self._text.lower():
+            self._count += 1
+        else:
+            self._text, self._count = text, 1
+        if text and self._count >= self.repeats and text != self._reported:
+            self._reported = text
+            return text
+        return None
+
+    def reset(self) -> None:
+        self._text, self._count, self._reported = "", 0, None
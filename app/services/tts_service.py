@@ -0,0 +1,229 @@
+import asyncio
+import re
+import time
+from typing import AsyncIterable, AsyncIterator, Dict, List, NamedTuple, Optional, Union
+
+import numpy as np
+
+from app import config
+from app.utils.logger import observe, span
+
+
+class TTSService:
+    """Streams 16-bit mono PCM for a piece of text."""
+
+    voice: str = ""
+    encoding: str = "linear16"
+    sample_rate: int = config.TTS_SAMPLE_RATE
+
+    def stream(self, text: str) -> AsyncIterator[bytes]:
+        raise NotImplementedError
+
+    async def synthesize(self, text: str) -> bytes:
+        return b"".join([chunk async for chunk in self.stream(text)])
+
+
+class OpenAITTS(TTSService):
+    """OpenAI speech API with ``pcm`` output (24 kHz, 16-bit, mono)."""
+
+    def __init__(self, model: str = config.TTS_MODEL, voice: str = config.TTS_VOICE, chunk_size: int = 4800):
+        self.model = model
+        self.voice = voice
+        self.chunk_size = chunk_size
+        self._client = None
+
+    def _get_client(self):
+        if self._client is None:
+            from openai import AsyncOpenAI
+            self._client = AsyncOpenAI()
+        return self._client
+
+    async def stream(self, text: str) -> AsyncIterator[bytes]:
+        async with self._get_client().audio.speech.with_streaming_response.create(
+            model=self.model,
+            voice=self.voice,
+            input=text,
+            response_format="pcm",
+        ) as response:
+            async for chunk in response.iter_bytes(chunk_size=self.chunk_size):
+                if chunk:
+                    yield chunk
+
+
+class LocalTTS(TTSService):
+    """Offline stand-in: a quiet tone whose length follows the text, with simulated latency."""
+
+    def __init__(self, voice: str = "local", chars_per_second: float = 14.0,
+                 first_chunk_delay: float = 0.0, chunk_ms: int = 100):
+        self.voice = voice
+        self.chars_per_second = chars_per_second
+        self.first_chunk_delay = first_chunk_delay
+        self.chunk_ms = chunk_ms
+
+    async def stream(self, text: str) -> AsyncIterator[bytes]:
+        n = int(self.sample_rate * max(len(text), 1) / self.chars_per_second)
+        t = np.arange(n) / self.sample_rate
+        pcm = (1000 * np.sin(2 * np.pi * 220 * t)).astype("<i2").tobytes()
+        if self.first_chunk_delay:
+            await asyncio.sleep(self.first_chunk_delay)
+        step = self.sample_rate * self.chunk_ms // 1000 * 2
+        for start in range(0, len(pcm), step):
+            yield pcm[start:start + step]
+            await asyncio.sleep(0)
+
+
+# Sentence-level streaming — speak generated text while the model is still writing it
+_SENTENCE_END = re.compile(r"[.!?]+[\"')\]]*(?=\s)")
+_CLAUSE_BREAK = re.compile(r"[,;:\u2014](?=\s)")
+_ABBREVIATIONS = {"e.g", "i.e", "etc", "vs", "mr", "mrs", "ms", "dr", "eg", "ie"}
+
+
+class ClauseSplitter:
+    """Cuts streamed text into speakable chunks.
+
+    Sentences are emitted at ``.!?`` followed by whitespace (skipping common
+    abbreviations and decimals); inside a long sentence a clause break
+    (``, ; : —``) is used once at least ``min_clause_chars`` are buffered, so
+    the first chunk reaches TTS quickly without chopping short phrases.
+    """
+
+    def __init__(self, min_clause_chars: int = 24, max_chars: int = 200):
+        self.min_clause_chars = min_clause_chars
+        self.max_chars = max_chars
+        self._buffer = ""
+
+    def feed(self, text: str) -> List[str]:
+        self._buffer += text
+        clauses = []
+        while True:
+            cut = self._find_cut()
+            if cut is None:
+                break
+            clause, self._buffer = self._buffer[:cut].strip(), self._buffer[cut:].lstrip()
+            if clause:
+                clauses.append(clause)
+        return clauses
+
+    def flush(self) -> List[str]:
+        clause, self._buffer = self._buffer.strip(), ""
+        return [clause] if clause else []
+
+    def _find_cut(self) -> Optional[int]:
+        buffer = self._buffer
+        for match in _SENTENCE_END.finditer(buffer):
+            words = buffer[:match.start()].split()
+            last_word = words[-1].lower() if words else ""
+            if match.group().startswith(".") and last_word in _ABBREVIATIONS:
+                continue
+            return match.end()
+        if len(buffer) >= self.min_clause_chars:
+            for match in _CLAUSE_BREAK.finditer(buffer, self.min_clause_chars - 1):
+                return match.end()
+        if len(buffer) > self.max_chars:
+            # Run-on text: fall back to the last word boundary
+            space = buffer.rfind(" ", 0, self.max_chars)
+            return space if space > 0 else self.max_chars
+        return None
+
+
+def split_clauses(text: str, min_clause_chars: int = 24) -> List[str]:
+    """Split already-complete text (e.g. a pooled question) the same way."""
+    splitter = ClauseSplitter(min_clause_chars)
+    return splitter.feed(text) + splitter.flush()
+
+
+class LatencyBreakdown:
+    """Per-turn timestamps, reported in ms since the turn started."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.marks: Dict[str, float] = {}
+
+    def mark(self, name: str) -> None:
+        # Only the first occurrence counts (first_token, first_clause, ...)
+        self.marks.setdefault(name, time.perf_counter())
+
+    def as_dict(self) -> Dict[str, float]:
+        return {name: round(1000 * (t - self.started), 1) for name, t in self.marks.items()}
+
+
+class Utterance(NamedTuple):
+    """A whole agent line, played from the audio cache (and recorded there on a miss) rather than split."""
+
+    text: str
+    pinned: bool = False
+
+
+async def stream_speech(
+    clauses: AsyncIterable[Union[str, Utterance]],
+    tts: Optional[TTSService] = None,
+    breakdown: Optional[LatencyBreakdown] = None,
+    lookahead: int = 2,
+    cache=None,
+) -> AsyncIterator[bytes]:
+    """Synthesize clauses as they arrive and yield their audio in order.
+
+    Up to ``lookahead`` clauses are synthesized ahead of the one playing, so
+    the gap between clauses is hidden behind playback of the previous one.
+    ``Utterance`` items go through ``cache`` (an ``AudioCache``) when given.
+    """
+    tts = tts or get_tts()
+    queues: asyncio.Queue = asyncio.Queue()
+    slots = asyncio.Semaphore(lookahead + 1)
+    tasks: List[asyncio.Task] = []
+
+    async def synthesize(item: Union[str, Utterance], out: asyncio.Queue) -> None:
+        if isinstance(item, Utterance):
+            text = item.text
+            source = cache.stream(text, tts, pinned=item.pinned) if cache is not None else tts.stream(text)
+        else:
+            text, source = item, tts.stream(item)
+        try:
+            with span("tts", "clause", chars=len(text)):
+                started = time.perf_counter()
+                async for chunk in source:
+                    if started is not None:
+                        observe("tts", "first_chunk", time.perf_counter() - started)
+                        started = None
+                    await out.put(chunk)
+        finally:
+            await out.put(None)
+
+    async def produce() -> None:
+        try:
+            async for clause in clauses:
+                if breakdown:
+                    breakdown.mark("first_clause")
+                await slots.acquire()
+                out: asyncio.Queue = asyncio.Queue()
+                tasks.append(asyncio.create_task(synthesize(clause, out)))
+                await queues.put(out)
+        finally:
+            await queues.put(None)
+
+    producer = asyncio.create_task(produce())
+    try:
+        while (out := await queues.get()) is not None:
+            while (chunk := await out.get()) is not None:
+                if breakdown:
+                    breakdown.mark("first_audio")
+                yield chunk
+            slots.release()
+        await producer
+        if breakdown:
+            breakdown.mark("audio_done")
+    finally:
+        producer.cancel()
+        for task in tasks:
+            task.cancel()
+
+
+_tts: Optional[TTSService] = None
+
+
+def get_tts() -> TTSService:
+    """Return the process-wide TTS backend selected by TTS_PROVIDER."""
+    global _tts
+    if _tts is None:
+        _tts = LocalTTS() if config.TTS_PROVIDER == "local" else OpenAITTS()
+    return _tts
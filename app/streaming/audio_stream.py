@@ -0,0 +1,308 @@
+"""Per-call PCM streaming core.
+
+Telephony carries 8 kHz mu-law; VAD/STT want 16 kHz linear16 and TTS produces
+24 kHz linear16. Everything here works on preallocated buffers: ring buffers
+are fixed ``bytearray``s accessed through ``memoryview``, and codec/resampling
+steps write into scratch arrays sized once per call, so the steady-state path
+does not allocate per chunk.
+
+Outbound audio is never dropped to make room: ``feed_outbound_pcm`` waits
+for the telephony side to drain frames, so TTS that runs ahead of playback
+is held back rather than overwritten. Queued agent audio is only discarded
+by ``clear_outbound`` (barge-in or an explicit flush).
+"""
+
+import asyncio
+from math import gcd
+from typing import Dict, Iterator, Optional, Tuple, Union
+
+import numpy as np
+from numpy.lib.stride_tricks import as_strided
+
+BytesLike = Union[bytes, bytearray, memoryview]
+
+TELEPHONY_RATE = 8000
+STT_RATE = 16000
+TTS_RATE = 24000
+
+
+# mu-law (G.711) — table driven, so encode/decode are a single np.take
+def _build_mulaw_decode_table() -> np.ndarray:
+    codes = ~np.arange(256, dtype=np.uint8)
+    sign = codes & 0x80
+    exponent = (codes >> 4) & 0x07
+    mantissa = codes & 0x0F
+    magnitude = ((mantissa.astype(np.int32) << 3) + 0x84) << exponent
+    return np.where(sign != 0, 0x84 - magnitude, magnitude - 0x84).astype(np.int16)
+
+
+def _build_mulaw_encode_table() -> np.ndarray:
+    # Reference G.711 encoder on 14-bit magnitudes, evaluated for every int16
+    samples = np.arange(-32768, 32768, dtype=np.int32)
+    pcm = samples >> 2
+    mask = np.where(pcm < 0, 0x7F, 0xFF)
+    pcm = np.minimum(np.abs(pcm), 8159) + 0x21
+    segment = np.searchsorted(np.array([0x3F, 0x7F, 0xFF, 0x1FF, 0x3FF, 0x7FF, 0xFFF, 0x1FFF]), pcm)
+    codes = np.where(segment >= 8, 0x7F, (segment << 4) | ((pcm >> (segment + 1)) & 0x0F)) ^ mask
+    # Index by the raw uint16 bit pattern of each int16 sample
+    table = np.empty(65536, dtype=np.uint8)
+    table[samples.astype(np.int16).view(np.uint16)] = codes.astype(np.uint8)
+    return table
+
+
+MULAW_DECODE_TABLE = _build_mulaw_decode_table()
+MULAW_ENCODE_TABLE = _build_mulaw_encode_table()
+
+
+def mulaw_decode(data: BytesLike, out: Optional[np.ndarray] = None) -> np.ndarray:
+    codes = np.frombuffer(data, dtype=np.uint8)
+    if out is None:
+        return MULAW_DECODE_TABLE[codes]
+    return np.take(MULAW_DECODE_TABLE, codes, out=out[:len(codes)])
+
+
+def mulaw_encode(samples: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
+    index = samples.view(np.uint16)
+    if out is None:
+        return MULAW_ENCODE_TABLE[index]
+    return np.take(MULAW_ENCODE_TABLE, index, out=out[:len(samples)])
+
+
+class RingBuffer:
+    """Fixed-capacity byte FIFO. On overflow the oldest audio is dropped."""
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self._buf = bytearray(capacity)
+        self._view = memoryview(self._buf)
+        self._read = 0
+        self._size = 0
+        self.dropped = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def clear(self) -> None:
+        self._read = 0
+        self._size = 0
+
+    def write(self, data: BytesLike) -> int:
+        src = memoryview(data).cast("B")
+        n = len(src)
+        if n > self.capacity:
+            self.dropped += n - self.capacity
+            src = src[n - self.capacity:]
+            n = self.capacity
+        overflow = self._size + n - self.capacity
+        if overflow > 0:
+            self.dropped += overflow
+            self._read = (self._read + overflow) % self.capacity
+            self._size -= overflow
+
+        write = (self._read + self._size) % self.capacity
+        first = min(n, self.capacity - write)
+        self._view[write:write + first] = src[:first]
+        if first < n:
+            self._view[:n - first] = src[first:]
+        self._size += n
+        return n
+
+    def read_into(self, out: BytesLike, n: Optional[int] = None) -> int:
+        """Copy up to n bytes into ``out``; returns the number copied."""
+        dst = memoryview(out).cast("B")
+        n = min(self._size, len(dst) if n is None else n)
+        first = min(n, self.capacity - self._read)
+        dst[:first] = self._view[self._read:self._read + first]
+        if first < n:
+            dst[first:n] = self._view[:n - first]
+        self._read = (self._read + n) % self.capacity
+        self._size -= n
+        return n
+
+
+class Resampler:
+    """Streaming rational resampler (8k/16k/24k) using linear interpolation.
+
+    Downsampling is preceded by a short windowed-sinc low-pass to limit
+    aliasing. Index/weight tables are cached per chunk length, so repeated
+    fixed-size frames reuse the same arrays.
+    """
+
+    def __init__(self, in_rate: int, out_rate: int, max_chunk: int = 4800, taps: int = 31):
+        g = gcd(in_rate, out_rate)
+        self.up, self.down = out_rate // g, in_rate // g
+        self.max_chunk = max_chunk
+        self._ext = np.zeros(max_chunk + 1, dtype=np.float32)
+        self._work = np.empty(max_chunk * self.up // self.down + 1, dtype=np.float32)
+        self._left = np.empty_like(self._work)
+        self._out = np.empty_like(self._work, dtype=np.int16)
+        self._plans: Dict[int, Union[Tuple[np.ndarray, np.ndarray, np.ndarray], np.ndarray]] = {}
+
+        self._fir = None
+        if out_rate < in_rate:
+            cutoff = 0.9 * out_rate / in_rate
+            n = np.arange(taps) - (taps - 1) / 2
+            fir = cutoff * np.sinc(cutoff * n) * np.hamming(taps)
+            self._fir = (fir / fir.sum()).astype(np.float32)
+            self._history = np.zeros(max_chunk + taps - 1, dtype=np.float32)
+
+    def _plan(self, n: int):
+        plan = self._plans.get(n)
+        if plan is None:
+            m = n * self.up // self.down
+            # Output k sits at input position (k + 1) * down / up, measured
+            # from the previous chunk's last sample, so chunks join seamlessly.
+            pos = (np.arange(1, m + 1) * self.down / self.up).astype(np.float64)
+            idx = np.floor(pos).astype(np.intp)
+            frac = (pos - idx).astype(np.float32)
+            nxt = np.minimum(idx + 1, n)
+            plan = self._plans[n] = (idx, nxt, frac)
+        return plan
+
+    def _windows(self, n: int, m: int) -> np.ndarray:
+        # Strided view over the filter history: row k is the FIR input for
+        # output k, aligned with input sample (k + 1) * down - 1
+        windows = self._plans.get(-n)
+        if windows is None:
+            item = self._history.itemsize
+            windows = self._plans[-n] = as_strided(
+                self._history[self.down - 1:],
+                shape=(m, len(self._fir)),
+                strides=(self.down * item, item),
+                writeable=False,
+            )
+        return windows
+
+    def process(self, samples: np.ndarray) -> np.ndarray:
+        """Resample int16 samples; the result is a view reused on the next call.
+
+        ``len(samples)`` must be a multiple of the rate ratio's denominator
+        (e.g. 3 for 24k -> 8k); 10/20 ms frames always are.
+        """
+        n = len(samples)
+        if n > self.max_chunk:
+            raise ValueError(f"chunk of {n} samples exceeds max_chunk={self.max_chunk}")
+        if n % self.down:
+            raise ValueError(f"chunk length must be a multiple of {self.down}")
+
+        m = n * self.up // self.down
+        work = self._work[:m]
+        if self._fir is not None and self.up == 1:
+            # Integer decimation: evaluate the low-pass only at the kept samples
+            taps = len(self._fir)
+            hist = self._history
+            hist[taps - 1:taps - 1 + n] = samples
+            np.dot(self._windows(n, m), self._fir, out=work)
+            hist[:taps - 1] = hist[n:n + taps - 1]
+        else:
+            ext = self._ext
+            if self._fir is None:
+                ext[1:n + 1] = samples
+            else:
+                taps = len(self._fir)
+                hist = self._history
+                hist[taps - 1:taps - 1 + n] = samples
+                ext[1:n + 1] = np.convolve(hist[:taps - 1 + n], self._fir, mode="valid")
+                hist[:taps - 1] = hist[n:n + taps - 1]
+
+            idx, nxt, frac = self._plan(n)
+            left = self._left[:m]
+            ext.take(nxt, out=work)
+            ext.take(idx, out=left)
+            work -= left
+            work *= frac
+            work += left
+            ext[0] = ext[n]
+
+        np.rint(work, out=work)
+        np.clip(work, -32768, 32767, out=work)
+        out = self._out[:m]
+        out[:] = work
+        return out
+
+
+class CallAudioStream:
+    """Inbound/outbound audio path for one call.
+
+    Inbound:  8 kHz mu-law -> 16 kHz linear16 ring -> fixed frames for VAD/STT
+    Outbound: 24 kHz linear16 (TTS) -> 8 kHz mu-law ring -> fixed telephony frames,
+              with backpressure on the TTS side
+    """
+
+    def __init__(self, frame_ms: int = 20, buffer_seconds: float = 2.0):
+        self.frame_ms = frame_ms
+        self.inbound_frame_bytes = STT_RATE * frame_ms // 1000 * 2
+        self.outbound_frame_bytes = TELEPHONY_RATE * frame_ms // 1000
+        tts_frame_bytes = TTS_RATE * frame_ms // 1000 * 2
+
+        self.inbound = RingBuffer(int(STT_RATE * 2 * buffer_seconds))
+        self.outbound = RingBuffer(int(TELEPHONY_RATE * buffer_seconds))
+        self._tts_staging = RingBuffer(int(TTS_RATE * 2 * buffer_seconds))
+
+        self._up = Resampler(TELEPHONY_RATE, STT_RATE, max_chunk=TELEPHONY_RATE)
+        self._down = Resampler(TTS_RATE, TELEPHONY_RATE, max_chunk=TTS_RATE * frame_ms // 1000)
+        self._decoded = np.empty(TELEPHONY_RATE, dtype=np.int16)
+        self._encoded = np.empty(TELEPHONY_RATE * frame_ms // 1000, dtype=np.uint8)
+        self._tts_frame = np.empty(tts_frame_bytes // 2, dtype=np.int16)
+        self._inbound_frame = bytearray(self.inbound_frame_bytes)
+        self._outbound_frame = bytearray(self.outbound_frame_bytes)
+        self._space = asyncio.Event()
+        self._flushes = 0
+        # Total mu-law bytes ever queued for the telephony socket
+        self.outbound_queued = 0
+
+    # Inbound
+    def feed_inbound_mulaw(self, payload: BytesLike) -> None:
+        view = memoryview(payload).cast("B")
+        step = len(self._decoded)
+        for start in range(0, len(view), step):
+            pcm8k = mulaw_decode(view[start:start + step], out=self._decoded)
+            self.inbound.write(self._up.process(pcm8k))
+
+    def inbound_frames(self) -> Iterator[memoryview]:
+        """Yield complete 16 kHz frames; each view is reused, consume it before the next."""
+        frame = memoryview(self._inbound_frame)
+        while len(self.inbound) >= self.inbound_frame_bytes:
+            self.inbound.read_into(frame)
+            yield frame
+
+    # Outbound
+    async def feed_outbound_pcm(self, pcm24k: BytesLike) -> int:
+        """Queue TTS audio, waiting while the outbound ring is full.
+
+        Returns the number of bytes taken; it is short of ``len(pcm24k)`` only
+        when ``clear_outbound`` ran while this call was waiting.
+        """
+        src = memoryview(pcm24k).cast("B")
+        flushes = self._flushes
+        frame_bytes = self._tts_frame.nbytes
+        taken = 0
+        while taken < len(src):
+            n = min(len(src) - taken, self._tts_staging.capacity - len(self._tts_staging))
+            self._tts_staging.write(src[taken:taken + n])
+            taken += n
+            while len(self._tts_staging) >= frame_bytes:
+                while self.outbound.capacity - len(self.outbound) < self.outbound_frame_bytes:
+                    self._space.clear()
+                    await self._space.wait()
+                    if self._flushes != flushes:
+                        return taken
+                self._tts_staging.read_into(self._tts_frame)
+                pcm8k = self._down.process(self._tts_frame)
+                self.outbound_queued += self.outbound.write(mulaw_encode(pcm8k, out=self._encoded))
+        return taken
+
+    def outbound_frames(self) -> Iterator[memoryview]:
+        """Yield complete mu-law frames for the telephony socket (view reused)."""
+        frame = memoryview(self._outbound_frame)
+        while len(self.outbound) >= self.outbound_frame_bytes:
+            self.outbound.read_into(frame)
+            self._space.set()
+            yield frame
+
+    def clear_outbound(self) -> None:
+        """Drop queued agent audio, e.g. on barge-in; a waiting feed returns early."""
+        self._tts_staging.clear()
+        self.outbound.clear()
+        self._flushes += 1
+        self._space.set()
@@ -0,0 +1,258 @@
+"""Barge-in handling for a live call.
+
+When the candidate starts speaking over the agent we stop talking at once:
+queued outbound audio is dropped synchronously on the VAD ``speech_start``
+event (so the next telephony frame is already silent), and the session's
+TTS producer and in-flight graph/LLM work are cancelled. We record how much
+of the agent's message was actually heard, then feed the candidate's new
+utterance into the graph the same way ``app.main`` does.
+
+If a graph turn is cancelled before it finished, the new utterance is
+appended to the reply that was being processed and the turn is rerun from
+the checkpoint it started on, so no half-finished node output is kept. That
+checkpoint is pinned for the duration of the turn when the checkpointer
+supports it; if it is gone anyway the rerun fails rather than continuing
+from a half-finished state.
+"""
+
+import asyncio
+import time
+from typing import Awaitable, Callable, List, Optional, Set
+
+from pydantic import BaseModel
+
+from app.streaming.audio_stream import CallAudioStream, TELEPHONY_RATE
+from app.streaming.vad import VADEvent
+
+# Rough speaking rate, used to estimate duration while synthesis is still running
+CHARS_PER_SECOND = 14.0
+
+
+class Interruption(BaseModel):
+    text: str
+    played_text: str
+    played_ms: float
+    total_ms: float
+    at_ms: float
+
+    @property
+    def played_fraction(self) -> float:
+        return self.played_ms / self.total_ms if self.total_ms else 0.0
+
+
+class Playback:
+    """One agent utterance being synthesized into a call's outbound stream.
+
+    Without a ``stream`` the caller sends the TTS audio itself (e.g. over the
+    WebSocket) and ``bytes_per_second`` is that audio's rate.
+    """
+
+    def __init__(self, text: str, stream: Optional[CallAudioStream] = None,
+                 bytes_per_second: int = TELEPHONY_RATE):
+        self.text = text
+        self.stream = stream
+        self.bytes_per_second = bytes_per_second
+        self.queued_bytes = 0
+        self.sent_bytes = 0
+        self.synthesis_done = False
+        self.cancelled = False
+
+    async def feed(self, pcm24k: bytes) -> bool:
+        """Queue TTS audio, waiting for room; returns False once the playback was cancelled."""
+        if self.cancelled:
+            return False
+        if self.stream is None:
+            self.queued_bytes += len(pcm24k)
+            return True
+        before = self.stream.outbound_queued
+        await self.stream.feed_outbound_pcm(pcm24k)
+        self.queued_bytes += self.stream.outbound_queued - before
+        return not self.cancelled
+
+    def finish(self) -> None:
+        self.synthesis_done = True
+
+    def mark_sent(self, n_bytes: int) -> None:
+        if not self.cancelled:
+            self.sent_bytes += n_bytes
+
+    @property
+    def done(self) -> bool:
+        return self.cancelled or (self.synthesis_done and self.sent_bytes >= self.queued_bytes)
+
+    @property
+    def played_ms(self) -> float:
+        return 1000 * self.sent_bytes / self.bytes_per_second
+
+    @property
+    def total_ms(self) -> float:
+        queued_ms = 1000 * self.queued_bytes / self.bytes_per_second
+        if self.synthesis_done:
+            return queued_ms
+        return max(queued_ms, 1000 * len(self.text) / CHARS_PER_SECOND)
+
+    def played_text(self) -> str:
+        if not self.total_ms:
+            return ""
+        cut = int(len(self.text) * min(1.0, self.played_ms / self.total_ms))
+        if cut >= len(self.text):
+            return self.text
+        # Snap back to the last whole word the candidate heard
+        return self.text[:cut].rsplit(" ", 1)[0] if " " in self.text[:cut] else ""
+
+    def cancel(self) -> None:
+        self.cancelled = True
+        if self.stream is not None:
+            self.stream.clear_outbound()
+
+
+class InterruptHandler:
+    """Per-session barge-in controller.
+
+    ``speculator`` (an ``IntentSpeculator``) records the final transcript of a
+    normal turn; ``respond`` resumes the graph and plays the reply, and must
+    call ``settle()`` once the graph has finished (default: ``ainvoke``).
+    """
+
+    def __init__(
+        self,
+        graph,
+        config: dict,
+        stream: Optional[CallAudioStream] = None,
+        speculator=None,
+        respond: Optional[Callable[[], Awaitable[None]]] = None,
+        bytes_per_second: int = TELEPHONY_RATE,
+    ):
+        self.graph = graph
+        self.config = config
+        self.stream = stream
+        self.speculator = speculator
+        self.respond = respond
+        self.bytes_per_second = bytes_per_second
+        self.playback: Optional[Playback] = None
+        self.interruptions: List[Interruption] = []
+        self._playback_task: Optional[asyncio.Task] = None
+        self._tasks: Set[asyncio.Task] = set()
+        self._turn: Optional[asyncio.Task] = None
+        self._pending_input: Optional[str] = None
+        self._turn_base: Optional[dict] = None
+        self._started = time.monotonic()
+
+    # Agent output
+    def start_playback(self, text: str, producer: Optional[asyncio.Task] = None) -> Playback:
+        """Register the utterance now being spoken and the task synthesizing it."""
+        if self.playback is not None and not self.playback.done:
+            self.playback.cancel()
+        self.playback = Playback(text, self.stream, self.bytes_per_second)
+        self._playback_task = producer
+        return self.playback
+
+    def on_frame_sent(self, n_bytes: int) -> None:
+        if self.playback is not None:
+            self.playback.mark_sent(n_bytes)
+
+    def track(self, task: asyncio.Task) -> asyncio.Task:
+        """Register LLM work for this session so a barge-in can cancel it."""
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    @property
+    def pending(self) -> bool:
+        """A cut-off turn will be rerun with the next utterance."""
+        return bool(self._pending_input)
+
+    @property
+    def agent_busy(self) -> bool:
+        speaking = self.playback is not None and not self.playback.done
+        thinking = self._turn is not None and not self._turn.done()
+        return speaking or thinking or bool(self._tasks)
+
+    # Candidate input
+    def on_vad_event(self, event: VADEvent) -> Optional[Interruption]:
+        if event.type != "speech_start" or not self.agent_busy:
+            return None
+        return self.barge_in()
+
+    def barge_in(self) -> Optional[Interruption]:
+        """Stop speaking and cancel in-flight work. Synchronous on purpose."""
+        interruption = None
+        playback = self.playback
+        if playback is not None and not playback.done:
+            playback.cancel()
+            interruption = Interruption(
+                text=playback.text,
+                played_text=playback.played_text(),
+                played_ms=playback.played_ms,
+                total_ms=playback.total_ms,
+                at_ms=1000 * (time.monotonic() - self._started),
+            )
+            self.interruptions.append(interruption)
+        elif self.stream is not None:
+            self.stream.clear_outbound()
+
+        if self._playback_task is not None and not self._playback_task.done():
+            self._playback_task.cancel()
+        if self._turn is not None and not self._turn.done():
+            self._turn.cancel()
+        for task in list(self._tasks):
+            task.cancel()
+        return interruption
+
+    async def submit_utterance(self, text: str) -> asyncio.Task:
+        """Feed a finished utterance into the graph and run the turn."""
+        if self._turn is not None and not self._turn.done():
+            self._turn.cancel()
+            try:
+                await self._turn
+            except asyncio.CancelledError:
+                pass
+        rerun = self.pending
+        if rerun:
+            # The previous turn never completed — treat both as one reply
+            text = f"{self._pending_input} {text}".strip()
+        else:
+            self._turn_base = (await self.graph.aget_state(self.config)).config
+            pin = getattr(self.graph.checkpointer, "pin", None)
+            if pin is not None:
+                pin(self._turn_base)
+        self._pending_input = text
+        self._turn = asyncio.create_task(self._run_turn(text, rerun))
+        return self._turn
+
+    def settle(self) -> None:
+        """The graph has finished the turn; a later barge-in only cuts the audio."""
+        self._pending_input = None
+        base, self._turn_base = self._turn_base, None
+        unpin = getattr(self.graph.checkpointer, "unpin", None)
+        if base is not None and unpin is not None:
+            unpin(base)
+
+    async def _run_turn(self, text: str, rerun: bool):
+        if rerun:
+            # Fork from the turn's starting checkpoint, dropping the cancelled run's writes
+            base = self._turn_base
+            if base is None or await self.graph.checkpointer.aget_tuple(base) is None:
+                raise RuntimeError(f"checkpoint {base} for the interrupted turn is no longer retained")
+            if self.speculator is not None:
+                self.speculator.reset()
+            await self.graph.aupdate_state(base, {"last_user_input": text})
+        elif self.speculator is not None:
+            await self.speculator.apply_final(text)
+        else:
+            await self.graph.aupdate_state(self.config, {"last_user_input": text})
+        if self.respond is not None:
+            await self.respond()
+        else:
+            await self.graph.ainvoke(None, config=self.config)
+        self.settle()
+        return await self.graph.aget_state(self.config)
+
+    def stats(self) -> dict:
+        return {
+            "interruptions": len(self.interruptions),
+            "avg_played_fraction": (
+                sum(i.played_fraction for i in self.interruptions) / len(self.interruptions)
+                if self.interruptions else 0.0
+            ),
+        }
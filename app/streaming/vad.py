@@ -0,0 +1,162 @@
+"""Energy / zero-crossing voice activity detector with endpointing.
+
+Audio is 16-bit mono PCM, fed incrementally in chunks of any size. Frame
+features (log energy, zero-crossing rate) are computed with NumPy for every
+complete frame in a chunk at once; only the small per-frame state machine
+runs in Python. The noise floor adapts to the line, so the same thresholds
+work for quiet phone audio and noisy rooms.
+
+Events:
+- ``speech_start`` after ``start_ms`` of consecutive speech frames
+- ``speech_end`` once ``end_of_utterance_ms`` of non-speech follows the
+  ``hangover_ms`` after the last speech frame; the event is timestamped at
+  that last speech frame
+"""
+
+from typing import List, Literal, Union
+
+import numpy as np
+from pydantic import BaseModel
+
+from app import config
+
+_INT16_FULL_SCALE = 32768.0 ** 2
+
+
+class VADEvent(BaseModel):
+    type: Literal["speech_start", "speech_end"]
+    timestamp_ms: float
+
+
+class VoiceActivityDetector:
+    def __init__(
+        self,
+        sample_rate: int = 16000,
+        frame_ms: int = config.VAD_FRAME_MS,
+        threshold_db: float = config.VAD_THRESHOLD_DB,
+        min_energy_db: float = config.VAD_MIN_ENERGY_DB,
+        start_ms: int = config.VAD_START_MS,
+        hangover_ms: int = config.VAD_HANGOVER_MS,
+        end_of_utterance_ms: int = config.VAD_END_OF_UTTERANCE_MS,
+        max_zcr: float = 0.45,
+        noise_adapt: float = 0.05,
+    ):
+        if not 10 <= frame_ms <= 30:
+            raise ValueError("frame_ms must be between 10 and 30")
+        self.sample_rate = sample_rate
+        self.frame_ms = frame_ms
+        self.frame_len = sample_rate * frame_ms // 1000
+        self.threshold_db = threshold_db
+        self.min_energy_db = min_energy_db
+        self.start_frames = max(1, start_ms // frame_ms)
+        self.hangover_frames = hangover_ms // frame_ms
+        self.end_frames = max(1, end_of_utterance_ms // frame_ms)
+        self.max_zcr = max_zcr
+        self.noise_adapt = noise_adapt
+
+        self._pending = np.empty(self.frame_len, dtype=np.int16)
+        self._pending_len = 0
+        self.reset()
+
+    def reset(self) -> None:
+        self._pending_len = 0
+        self.frames_processed = 0
+        self.noise_floor_db = None
+        self.in_speech = False
+        self._speech_run = 0
+        self._silence_run = 0
+        self._hangover = 0
+        self.last_frame_is_speech = False
+
+    def process(self, chunk: Union[bytes, bytearray, memoryview, np.ndarray]) -> List[VADEvent]:
+        """Feed a chunk of int16 PCM and return any events it completes."""
+        samples = chunk if isinstance(chunk, np.ndarray) else np.frombuffer(chunk, dtype=np.int16)
+        events: List[VADEvent] = []
+
+        # Top up a partial frame left over from the previous chunk
+        if self._pending_len:
+            take = min(self.frame_len - self._pending_len, len(samples))
+            self._pending[self._pending_len:self._pending_len + take] = samples[:take]
+            self._pending_len += take
+            samples = samples[take:]
+            if self._pending_len < self.frame_len:
+                return events
+            self._pending_len = 0
+            events.extend(self._run(self._pending[np.newaxis, :]))
+
+        n_frames = len(samples) // self.frame_len
+        if n_frames:
+            frames = samples[:n_frames * self.frame_len].reshape(n_frames, self.frame_len)
+            events.extend(self._run(frames))
+
+        rest = len(samples) - n_frames * self.frame_len
+        if rest:
+            self._pending[:rest] = samples[n_frames * self.frame_len:]
+            self._pending_len = rest
+        return events
+
+    def flush(self) -> List[VADEvent]:
+        """End of stream: close an open utterance."""
+        self._pending_len = 0
+        if not self.in_speech:
+            return []
+        self.in_speech = False
+        return [VADEvent(type="speech_end", timestamp_ms=self.frames_processed * self.frame_ms)]
+
+    def frame_features(self, frames: np.ndarray):
+        """Per-frame log energy (dBFS) and zero-crossing rate, vectorized."""
+        f = frames.astype(np.float32)
+        energy = np.einsum("ij,ij->i", f, f) / frames.shape[1]
+        energy_db = 10.0 * np.log10(energy / _INT16_FULL_SCALE + 1e-10)
+        signs = np.signbit(frames)
+        zcr = np.count_nonzero(signs[:, 1:] != signs[:, :-1], axis=1) / (frames.shape[1] - 1)
+        return energy_db, zcr
+
+    def _run(self, frames: np.ndarray) -> List[VADEvent]:
+        energy_db, zcr = self.frame_features(frames)
+        events = []
+        if self.noise_floor_db is None:
+            self.noise_floor_db = float(energy_db[0])
+
+        for e, z in zip(energy_db.tolist(), zcr.tolist()):
+            index = self.frames_processed
+            self.frames_processed += 1
+            above = e - self.noise_floor_db
+            # High ZCR at modest energy is hiss/static rather than voice
+            is_speech = (
+                e > self.min_energy_db
+                and above > self.threshold_db
+                and (z < self.max_zcr or above > 2 * self.threshold_db)
+            )
+
+            # Noise floor: drop quickly, rise slowly, and barely move during speech
+            if e < self.noise_floor_db:
+                self.noise_floor_db += 0.5 * (e - self.noise_floor_db)
+            elif not is_speech:
+                self.noise_floor_db += self.noise_adapt * (e - self.noise_floor_db)
+            else:
+                self.noise_floor_db += 0.001 * (e - self.noise_floor_db)
+
+            if is_speech:
+                self._speech_run += 1
+                self._silence_run = 0
+                self._hangover = self.hangover_frames
+            elif self._hangover:
+                # Dips right after speech (stops, trailing consonants) still count as speech
+                self._speech_run = 0
+                self._hangover -= 1
+            else:
+                self._speech_run = 0
+                self._silence_run += 1
+            self.last_frame_is_speech = self._silence_run == 0
+
+            if not self.in_speech and self._speech_run >= self.start_frames:
+                self.in_speech = True
+                start = index - self.start_frames + 1
+                events.append(VADEvent(type="speech_start", timestamp_ms=start * self.frame_ms))
+            elif self.in_speech and self._silence_run >= self.end_frames:
+                self.in_speech = False
+                # The utterance ended at the last speech frame, before the hangover
+                end = index - self._silence_run - self.hangover_frames + 1
+                events.append(VADEvent(type="speech_end", timestamp_ms=end * self.frame_ms))
+        return events
@@ -0,0 +1,18 @@
+import math
+from typing import List, Optional, Sequence
+
+from langchain_core.runnables import RunnableConfig
+
+
+def thread_id_of(config: Optional[RunnableConfig]) -> str:
+    """Return the graph thread_id carried by a node's RunnableConfig."""
+    return ((config or {}).get("configurable") or {}).get("thread_id", "default")
+
+
+def percentile(values: Sequence[float], pct: float) -> float:
+    """Nearest-rank percentile; 0.0 for an empty sequence."""
+    if not values:
+        return 0.0
+    ordered: List[float] = sorted(values)
+    rank = max(0, min(len(ordered) - 1, math.ceil(pct / 100 * len(ordered)) - 1))
+    return ordered[rank]
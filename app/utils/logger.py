@@ -0,0 +1,235 @@
+"""Structured timing spans and Prometheus-format histograms.
+
+``span(kind, name)`` times a block: graph nodes, LLM calls, checkpoint reads
+and writes, STT and TTS stages. A finished span is observed into the
+``intervu_span_seconds{kind,name}`` histogram and, with TRACE_LOG_ENABLED,
+logged as one JSON line tagged with the session's thread_id. The thread_id
+comes from ``current_thread_id``, which every traced graph node sets for the
+duration of the node (and so for any LLM call or task it starts).
+
+``render_prometheus()`` returns everything in the Prometheus text format; the
+API serves it on ``/metrics``. With METRICS_ENABLED off, ``span()`` hands back
+a shared no-op and nodes and checkpointers are not wrapped at all.
+"""
+
+import functools
+import inspect
+import json
+import logging
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from app import config
+from app.utils.helpers import thread_id_of
+
+current_thread_id: ContextVar[Optional[str]] = ContextVar("current_thread_id", default=None)
+
+# Seconds; wide enough for sub-millisecond nodes and multi-second LLM tails
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+trace_logger = logging.getLogger("intervu.trace")
+trace_logger.setLevel(logging.INFO)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Histogram:
+    def __init__(self, name: str, help: str, labels: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help
+        self.label_names = tuple(labels)
+        self.buckets = tuple(sorted(buckets))
+        # label values -> [per-bucket counts..., +Inf count, sum]
+        self._series: Dict[Tuple[str, ...], List[float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labels: str) -> None:
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+            series[bisect_left(self.buckets, value)] += 1
+            series[-1] += value
+
+    def render(self) -> Iterable[str]:
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} histogram"
+        with self._lock:
+            series = {k: list(v) for k, v in self._series.items()}
+        for labels, values in sorted(series.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), values[:-1]):
+                cumulative += count
+                le = 'le="+Inf"' if bound == float("inf") else f'le="{bound}"'
+                yield f"{self.name}_bucket{_labels(self.label_names, labels, le)} {cumulative}"
+            yield f"{self.name}_sum{_labels(self.label_names, labels)} {values[-1]}"
+            yield f"{self.name}_count{_labels(self.label_names, labels)} {cumulative}"
+
+
+class Counter:
+    def __init__(self, name: str, help: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.label_names = tuple(labels)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, *labels: str) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def render(self) -> Iterable[str]:
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} counter"
+        with self._lock:
+            values = dict(self._values)
+        for labels, value in sorted(values.items()):
+            yield f"{self.name}{_labels(self.label_names, labels)} {value}"
+
+
+class Registry:
+    def __init__(self):
+        self.metrics: List = []
+
+    def histogram(self, *args, **kwargs) -> Histogram:
+        self.metrics.append(Histogram(*args, **kwargs))
+        return self.metrics[-1]
+
+    def counter(self, *args, **kwargs) -> Counter:
+        self.metrics.append(Counter(*args, **kwargs))
+        return self.metrics[-1]
+
+    def render(self) -> str:
+        return "\n".join(line for metric in self.metrics for line in metric.render()) + "\n"
+
+
+registry = Registry()
+SPAN_SECONDS = registry.histogram("intervu_span_seconds", "Duration of traced stages.", ("kind", "name"))
+SPAN_ERRORS = registry.counter("intervu_span_errors_total", "Traced stages that raised.", ("kind", "name"))
+LLM_TTFT_SECONDS = registry.histogram("intervu_llm_ttft_seconds", "Time to first streamed token.", ("name",))
+LLM_TOKENS = registry.counter("intervu_llm_tokens_total", "LLM tokens by call site.", ("name", "type"))
+LLM_RETRIES = registry.counter("intervu_llm_retries_total", "LLM call retries by call site.", ("name",))
+
+
+def render_prometheus() -> str:
+    return registry.render()
+
+
+class Span:
+    """One timed stage; ``set()`` attaches extra fields for the trace log."""
+
+    __slots__ = ("kind", "name", "thread_id", "attrs", "started")
+
+    def __init__(self, kind: str, name: str, thread_id: Optional[str], attrs: dict):
+        self.kind = kind
+        self.name = name
+        self.thread_id = thread_id
+        self.attrs = attrs
+        self.started = 0.0
+
+    def set(self, **attrs) -> None:
+        self.attrs.update(attrs)
+
+    def __enter__(self) -> "Span":
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        seconds = time.perf_counter() - self.started
+        SPAN_SECONDS.observe(seconds, self.kind, self.name)
+        if exc_type is not None:
+            SPAN_ERRORS.inc(1, self.kind, self.name)
+            self.attrs["error"] = exc_type.__name__
+        if config.TRACE_LOG_ENABLED:
+            _log(self.kind, self.name, self.thread_id, seconds, self.attrs)
+
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def set(self, **attrs) -> None:
+        pass
+
+    def __enter__(self) -> "_NoopSpan":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        pass
+
+
+_NOOP = _NoopSpan()
+
+
+def span(kind: str, name: str, thread_id: Optional[str] = None, **attrs):
+    """Context manager timing one stage; a shared no-op when metrics are off."""
+    if not config.METRICS_ENABLED:
+        return _NOOP
+    return Span(kind, name, thread_id or current_thread_id.get(), attrs)
+
+
+def observe(kind: str, name: str, seconds: float, thread_id: Optional[str] = None, **attrs) -> None:
+    """Record a stage that was timed elsewhere."""
+    if not config.METRICS_ENABLED:
+        return
+    SPAN_SECONDS.observe(seconds, kind, name)
+    if config.TRACE_LOG_ENABLED:
+        _log(kind, name, thread_id or current_thread_id.get(), seconds, attrs)
+
+
+def _log(kind: str, name: str, thread_id: Optional[str], seconds: float, attrs: dict) -> None:
+    if not trace_logger.handlers and not logging.getLogger().handlers:
+        trace_logger.addHandler(logging.StreamHandler())
+    trace_logger.info(json.dumps({
+        "ts": round(time.time(), 3), "kind": kind, "name": name, "thread_id": thread_id,
+        "ms": round(1000 * seconds, 3), **attrs,
+    }, default=str))
+
+
+def traced_node(name: str, fn):
+    """Wrap a graph node in a span and make its thread_id current; unwrapped when metrics are off."""
+    if not config.METRICS_ENABLED:
+        return fn
+    takes_config = "config" in inspect.signature(fn).parameters
+
+    # Not functools.wraps: LangGraph reads the signature to decide whether to
+    # pass ``config``, and __wrapped__ would hide this wrapper's own
+    async def node(state, config):
+        thread_id = thread_id_of(config)
+        token = current_thread_id.set(thread_id)
+        try:
+            with span("node", name, thread_id):
+                return await (fn(state, config) if takes_config else fn(state))
+        finally:
+            current_thread_id.reset(token)
+
+    node.__name__ = getattr(fn, "__name__", name)
+    return node
+
+
+def trace_checkpointer(checkpointer):
+    """Time the async checkpoint reads/writes the graph makes; unchanged when metrics are off."""
+    if not config.METRICS_ENABLED:
+        return checkpointer
+
+    def timed(op: str, method):
+        @functools.wraps(method)
+        async def wrapper(config, *args, **kwargs):
+            with span("checkpoint", op, thread_id_of(config)):
+                return await method(config, *args, **kwargs)
+        return wrapper
+
+    for op in ("aget_tuple", "aput", "aput_writes"):
+        setattr(checkpointer, op, timed(op, getattr(checkpointer, op)))
+    return checkpointer
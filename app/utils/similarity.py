@@ -0,0 +1,77 @@
+"""MinHash/LSH index for near-duplicate short texts.
+
+Texts are compared as sets of word unigrams and bigrams. Each entry gets a
+MinHash signature; signatures are split into bands and bucketed per group
+(one group per question, per topic cell, ...), so a query only scores the
+entries that share at least one band with it.
+"""
+
+import zlib
+from collections import defaultdict
+from typing import Dict, Hashable, Iterable, List, Sequence, Set, Tuple
+
+import numpy as np
+
+# Largest prime below 2**32: a*h + b for a, b, h below it cannot overflow uint64
+_PRIME = 4294967291
+
+
+def shingles(tokens: Sequence[str]) -> Set[str]:
+    # Words plus adjacent pairs, so reordered fillers barely move the signature but swapped terms do
+    return set(tokens) | {f"{a} {b}" for a, b in zip(tokens, tokens[1:])}
+
+
+class MinHasher:
+    def __init__(self, num_perm: int = 64, seed: int = 7):
+        rng = np.random.default_rng(seed)
+        self.a = rng.integers(1, _PRIME, num_perm, dtype=np.uint64)
+        self.b = rng.integers(0, _PRIME, num_perm, dtype=np.uint64)
+
+    def signature(self, items: Iterable[str]) -> np.ndarray:
+        # crc32 rather than hash(): signatures must match across processes
+        items = list(items) or [""]
+        hashes = np.fromiter((zlib.crc32(s.encode()) % _PRIME for s in items), dtype=np.uint64, count=len(items))
+        return ((np.outer(self.a, hashes) + self.b[:, None]) % np.uint64(_PRIME)).min(axis=1)
+
+
+class LSHIndex:
+    def __init__(self, num_perm: int = 64, bands: int = 16, seed: int = 7):
+        self.hasher = MinHasher(num_perm, seed)
+        self.bands = bands
+        self.rows = num_perm // bands
+        self._signatures: Dict[Hashable, Tuple[str, np.ndarray]] = {}
+        self._buckets: Dict[Tuple[str, int, bytes], Set[Hashable]] = defaultdict(set)
+
+    def __len__(self) -> int:
+        return len(self._signatures)
+
+    def add(self, key: Hashable, tokens: Sequence[str], group: str = "") -> None:
+        self.remove(key)
+        signature = self.hasher.signature(shingles(tokens))
+        self._signatures[key] = (group, signature)
+        for bucket in self._bands(group, signature):
+            self._buckets[bucket].add(key)
+
+    def remove(self, key: Hashable) -> None:
+        entry = self._signatures.pop(key, None)
+        if entry is None:
+            return
+        for bucket in self._bands(*entry):
+            keys = self._buckets.get(bucket)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._buckets[bucket]
+
+    def query(self, tokens: Sequence[str], group: str = "", threshold: float = 0.0) -> List[Tuple[Hashable, float]]:
+        """Entries in ``group`` with estimated Jaccard >= threshold, most similar first."""
+        signature = self.hasher.signature(shingles(tokens))
+        candidates: Set[Hashable] = set()
+        for bucket in self._bands(group, signature):
+            candidates |= self._buckets.get(bucket, set())
+        scored = [(key, float(np.mean(self._signatures[key][1] == signature))) for key in candidates]
+        return sorted(((k, s) for k, s in scored if s >= threshold), key=lambda ks: -ks[1])
+
+    def _bands(self, group: str, signature: np.ndarray):
+        for band in range(self.bands):
+            yield group, band, signature[band * self.rows:(band + 1) * self.rows].tobytes()
@@ -0,0 +1 @@
+"""Offline performance benchmarks — run modules with ``python -m benchmarks.<name>``."""
@@ -0,0 +1,56 @@
+"""Throughput of the per-call PCM streaming core.
+
+Every simulated call receives 20 ms of 8 kHz mu-law and sends 20 ms of
+24 kHz TTS audio per tick; inbound 16 kHz frames and outbound mu-law frames
+are drained as the VAD/STT and telephony socket would. Reports call-seconds
+processed per CPU-second.
+
+    python -m benchmarks.audio_stream_bench --calls 200 --seconds 10
+"""
+
+import argparse
+import asyncio
+import time
+
+import numpy as np
+
+from app.streaming.audio_stream import CallAudioStream, mulaw_encode, TTS_RATE, TELEPHONY_RATE
+
+
+async def run(args) -> None:
+    rng = np.random.default_rng(0)
+    ticks = int(args.seconds * 1000 / args.frame_ms)
+    inbound = mulaw_encode(
+        rng.integers(-8000, 8000, TELEPHONY_RATE * args.frame_ms // 1000).astype(np.int16)
+    ).tobytes()
+    outbound = rng.integers(-8000, 8000, TTS_RATE * args.frame_ms // 1000).astype(np.int16).tobytes()
+
+    streams = [CallAudioStream(frame_ms=args.frame_ms) for _ in range(args.calls)]
+    in_frames = out_frames = 0
+    started = time.process_time()
+    for _ in range(ticks):
+        for stream in streams:
+            stream.feed_inbound_mulaw(inbound)
+            for _frame in stream.inbound_frames():
+                in_frames += 1
+            await stream.feed_outbound_pcm(outbound)
+            for _frame in stream.outbound_frames():
+                out_frames += 1
+    cpu = time.process_time() - started
+
+    call_seconds = args.calls * ticks * args.frame_ms / 1000
+    print(f"{args.calls} calls x {args.seconds:.0f}s: {in_frames} inbound / {out_frames} outbound frames")
+    print(f"CPU: {cpu:.3f}s -> {call_seconds / cpu:.0f} call-seconds per CPU-second")
+    print(f"per call-tick (in + out): {1e6 * cpu / (args.calls * ticks):.1f} us")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=200)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--frame-ms", type=int, default=20)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
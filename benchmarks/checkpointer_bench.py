@@ -0,0 +1,114 @@
+"""Checkpoint write latency and resident memory: SQLiteCheckpointer vs MemorySaver.
+
+Simulates N interview sessions, each writing one checkpoint per graph step with
+a growing ``messages`` list, the way the interview graph does. Each backend runs
+in its own subprocess so resident memory is measured in isolation.
+
+    python -m benchmarks.checkpointer_bench --sessions 10000
+"""
+
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
+from langgraph.checkpoint.base import empty_checkpoint
+from langgraph.checkpoint.base.id import uuid6
+from langgraph.checkpoint.memory import MemorySaver
+
+from app.core.checkpointer import SQLiteCheckpointer
+from app.utils.helpers import percentile
+
+STEPS_PER_SESSION = 14
+
+
+def rss_mb() -> float:
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def simulate(saver, sessions: int) -> dict:
+    latencies = []
+    for s in range(sessions):
+        thread_id = f"bench-{s}"
+        config = {"configurable": {"thread_id": thread_id, "checkpoint_ns": ""}}
+        messages = [SystemMessage(content="You are arjun, an expert interviewer. " * 8)]
+        for step in range(STEPS_PER_SESSION):
+            if step % 2:
+                messages.append(HumanMessage(content=f"Candidate reply number {step} about lists and tuples."))
+            else:
+                messages.append(AIMessage(content=f"Question {step}: what is the difference between a list and a tuple?"))
+            checkpoint = empty_checkpoint()
+            checkpoint["id"] = str(uuid6(clock_seq=step))
+            values = {
+                "messages": list(messages),
+                "student_name": "Jayanth",
+                "topic": "Python",
+                "difficulty": "medium",
+                "question_count": step // 4,
+                "last_user_input": messages[-1].content,
+            }
+            checkpoint["channel_values"] = values
+            checkpoint["channel_versions"] = {k: step + 1 for k in values}
+            started = time.perf_counter()
+            config = saver.put(config, checkpoint, {"source": "loop", "step": step}, dict(checkpoint["channel_versions"]))
+            latencies.append(time.perf_counter() - started)
+        if hasattr(saver, "mark_finished"):
+            saver.mark_finished(thread_id)
+    return {
+        "writes": len(latencies),
+        "write_p50_us": 1e6 * percentile(latencies, 50),
+        "write_p95_us": 1e6 * percentile(latencies, 95),
+        "write_p99_us": 1e6 * percentile(latencies, 99),
+        "rss_mb": rss_mb(),
+    }
+
+
+def run_backend(backend: str, sessions: int) -> dict:
+    baseline = rss_mb()
+    if backend == "memory":
+        result = simulate(MemorySaver(), sessions)
+    else:
+        with tempfile.TemporaryDirectory() as tmp:
+            saver = SQLiteCheckpointer(path=os.path.join(tmp, "bench.sqlite"))
+            result = simulate(saver, sessions)
+            result["db_mb"] = sum(
+                os.path.getsize(os.path.join(tmp, f)) for f in os.listdir(tmp)
+            ) / 1e6
+            saver.close()
+    result["rss_growth_mb"] = result["rss_mb"] - baseline
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=10_000)
+    parser.add_argument("--backend", choices=["memory", "sqlite"])
+    args = parser.parse_args()
+
+    if args.backend:
+        print(json.dumps(run_backend(args.backend, args.sessions)))
+        return
+
+    for backend in ("memory", "sqlite"):
+        out = subprocess.run(
+            [sys.executable, "-m", "benchmarks.checkpointer_bench", "--sessions", str(args.sessions), "--backend", backend],
+            capture_output=True, text=True, check=True,
+        ).stdout
+        result = json.loads(out.strip().splitlines()[-1])
+        print(f"{backend:>7}: " + "  ".join(f"{k}={v:.1f}" if isinstance(v, float) else f"{k}={v}" for k, v in result.items()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,237 @@
+"""Local OpenAI-compatible chat-completions server for load tests and benchmarks.
+
+Answers ``/v1/chat/completions`` (plain, ``json_schema``/``json_object``
+response formats, tool calls, and SSE streaming) with schema-valid sample
+output, after a configurable latency. It can also inject 429s and slow
+outliers, which is what the shared LLM client's backoff and hedging are for.
+
+    python -m benchmarks.fake_openai --port 8765 --latency-ms 300 --rate-limit 0.05
+    LLM_BASE_URL=http://127.0.0.1:8765/v1 OPENAI_API_KEY=fake python -m app.main
+
+In-process use::
+
+    async with serve(FakeOpenAI(latency_ms=50)) as base_url:
+        ...
+"""
+
+import argparse
+import asyncio
+import contextlib
+import json
+import random
+import socket
+import time
+import uuid
+from typing import Any, Callable, Dict, Optional
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from starlette.requests import ClientDisconnect
+
+# What a json_object request (the streamed evaluation) gets back by default
+DEFAULT_JSON_OBJECT = {"correct": False, "short_feedback": "Close, but not quite.",
+                       "correction": "Mention the key trade-off as well."}
+
+
+def sample_from_schema(schema: dict, defs: Optional[dict] = None, name: str = "") -> Any:
+    """A deterministic instance of a JSON schema (first enum value, non-null branch)."""
+    defs = defs or schema.get("$defs", {})
+    if "$ref" in schema:
+        return sample_from_schema(defs[schema["$ref"].rsplit("/", 1)[-1]], defs, name)
+    for key in ("anyOf", "oneOf"):
+        if key in schema:
+            options = [s for s in schema[key] if s.get("type") != "null"] or schema[key]
+            return sample_from_schema(options[0], defs, name)
+    if "enum" in schema:
+        return schema["enum"][0]
+    if "const" in schema:
+        return schema["const"]
+    kind = schema.get("type")
+    if kind == "object":
+        return {k: sample_from_schema(v, defs, k) for k, v in schema.get("properties", {}).items()}
+    if kind == "array":
+        return [
+            f"Sample {name.rstrip('s') or 'item'} {i + 1}?" if schema.get("items", {}).get("type") == "string"
+            else sample_from_schema(schema.get("items", {}), defs, name)
+            for i in range(5)
+        ]
+    if kind == "boolean":
+        return True
+    if kind in ("integer", "number"):
+        return 1
+    if kind == "null":
+        return None
+    return f"sample {name}".strip()
+
+
+class FakeOpenAI:
+    """The fake server's behaviour; ``responder`` may override any reply."""
+
+    def __init__(
+        self,
+        latency_ms: float = 200.0,
+        sigma: float = 0.3,
+        slow_prob: float = 0.0,
+        slow_ms: float = 3000.0,
+        rate_limit: float = 0.0,
+        token_ms: float = 15.0,
+        responder: Optional[Callable[[dict], Optional[str]]] = None,
+        seed: Optional[int] = None,
+    ):
+        self.latency_ms = latency_ms
+        self.sigma = sigma
+        self.slow_prob = slow_prob
+        self.slow_ms = slow_ms
+        self.rate_limit = rate_limit
+        self.token_ms = token_ms
+        self.responder = responder
+        self.random = random.Random(seed)
+        self.counts: Dict[str, int] = {"requests": 0, "rate_limited": 0, "slow": 0, "in_flight": 0, "max_in_flight": 0}
+        self.app = self._build_app()
+
+    def latency(self) -> float:
+        if self.slow_prob and self.random.random() < self.slow_prob:
+            self.counts["slow"] += 1
+            return self.slow_ms / 1000
+        return self.latency_ms / 1000 * self.random.lognormvariate(0, self.sigma)
+
+    def reply(self, body: dict) -> dict:
+        """Assistant message for a request: content and/or tool calls."""
+        if self.responder is not None:
+            content = self.responder(body)
+            if content is not None:
+                return {"role": "assistant", "content": content}
+        if body.get("tools"):
+            tool = body["tools"][0]["function"]
+            arguments = json.dumps(sample_from_schema(tool.get("parameters", {})))
+            return {"role": "assistant", "content": None, "tool_calls": [{
+                "id": f"call_{uuid.uuid4().hex[:12]}", "type": "function",
+                "function": {"name": tool["name"], "arguments": arguments},
+            }]}
+        response_format = body.get("response_format") or {}
+        if response_format.get("type") == "json_schema":
+            content = json.dumps(sample_from_schema(response_format["json_schema"]["schema"]))
+        elif response_format.get("type") == "json_object":
+            content = json.dumps(DEFAULT_JSON_OBJECT)
+        else:
+            content = "Okay."
+        return {"role": "assistant", "content": content}
+
+    def _build_app(self) -> FastAPI:
+        app = FastAPI()
+
+        @app.post("/v1/chat/completions")
+        async def chat_completions(request: Request):
+            try:
+                body = await request.json()
+            except ClientDisconnect:
+                # A cancelled hedge or retry; nothing to answer
+                return Response(status_code=499)
+            self.counts["requests"] += 1
+            if self.rate_limit and self.random.random() < self.rate_limit:
+                self.counts["rate_limited"] += 1
+                return JSONResponse(
+                    {"error": {"message": "Rate limit reached", "type": "requests", "code": "rate_limit_exceeded"}},
+                    status_code=429,
+                    headers={"retry-after-ms": "200"},
+                )
+            self.counts["in_flight"] += 1
+            self.counts["max_in_flight"] = max(self.counts["max_in_flight"], self.counts["in_flight"])
+            try:
+                message = self.reply(body)
+                if body.get("stream"):
+                    return StreamingResponse(self._stream(body, message), media_type="text/event-stream")
+                await asyncio.sleep(self.latency())
+            finally:
+                if not body.get("stream"):
+                    self.counts["in_flight"] -= 1
+            return _completion(body, message)
+
+        @app.get("/stats")
+        async def stats():
+            return self.counts
+
+        return app
+
+    async def _stream(self, body: dict, message: dict):
+        try:
+            await asyncio.sleep(self.latency())
+            content = message.get("content") or ""
+            for start in range(0, len(content), 4):
+                delta = {"content": content[start:start + 4]}
+                if start == 0:
+                    delta["role"] = "assistant"
+                yield _sse(body, delta)
+                await asyncio.sleep(self.token_ms / 1000)
+            yield _sse(body, {}, finish_reason="stop")
+            yield "data: [DONE]\n\n"
+        finally:
+            self.counts["in_flight"] -= 1
+
+
+def _completion(body: dict, message: dict) -> dict:
+    return {
+        "id": f"chatcmpl-{uuid.uuid4().hex[:12]}",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": body.get("model", "fake"),
+        "choices": [{"index": 0, "message": message,
+                     "finish_reason": "tool_calls" if message.get("tool_calls") else "stop"}],
+        "usage": _usage(body, message),
+    }
+
+
+def _usage(body: dict, message: dict) -> dict:
+    # Roughly four characters per token, enough to exercise token accounting
+    prompt = sum(len(str(m.get("content") or "")) for m in body.get("messages", [])) // 4
+    reply = message.get("content") or "".join(c["function"]["arguments"] for c in message.get("tool_calls", []))
+    completion = len(reply) // 4
+    return {"prompt_tokens": prompt, "completion_tokens": completion, "total_tokens": prompt + completion}
+
+
+def _sse(body: dict, delta: dict, finish_reason: Optional[str] = None) -> str:
+    chunk = {
+        "id": "chatcmpl-stream",
+        "object": "chat.completion.chunk",
+        "created": int(time.time()),
+        "model": body.get("model", "fake"),
+        "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+    }
+    return f"data: {json.dumps(chunk)}\n\n"
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+@contextlib.asynccontextmanager
+async def serve(fake: FakeOpenAI, port: Optional[int] = None):
+    """Run the fake server on this event loop; yields its ``/v1`` base URL."""
+    port = port or _free_port()
+    server = uvicorn.Server(uvicorn.Config(fake.app, host="127.0.0.1", port=port, log_level="warning"))
+    task = asyncio.create_task(server.serve())
+    while not server.started:
+        if task.done():
+            task.result()
+        await asyncio.sleep(0.01)
+    try:
+        yield f"http://127.0.0.1:{port}/v1"
+    finally:
+        server.should_exit = True
+        await task
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fake OpenAI-compatible chat completions server.")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=200.0)
+    parser.add_argument("--sigma", type=float, default=0.3, help="lognormal spread of the latency")
+    parser.add_argument("--slow-prob", type=float, default=0.0, help="fraction of calls that take --slow-ms")
+    parser.add_argument("--slow-ms", type=float, default=3000.0)
+    parser.add_argument("--rate-limit", type=float, default=0.0, help="fraction of calls answered with 429")
+    args = parser.parse_args()
+    fake = FakeOpenAI(args.latency_ms, args.sigma, args.slow_prob, args.slow_ms, args.rate_limit)
+    uvicorn.run(fake.app, host="127.0.0.1", port=args.port, log_level="warning")
@@ -0,0 +1,462 @@
+"""Offline replay of scripted interviews through the graph, with a fake LLM.
+
+Drives ``build_graph()`` exactly like ``app/main.py`` (``aupdate_state`` with
+the candidate's reply, then ``ainvoke(None)``) for a mix of scripted
+conversations: happy path, repeats, silence, quits, wrong answers and a
+wrong-person call. The LLM is an in-process ``FakeLLM`` that returns the
+schemas in ``app/models/schemas.py`` after a sampled latency, so no API
+calls are made. For each concurrency level it reports sessions/sec, per-turn
+and per-node p50/p95/p99, and time spent in the checkpointer.
+
+    python -m benchmarks.graph_replay --concurrency 1 16 64 --sessions 200 --save baseline.json
+    python -m benchmarks.graph_replay --concurrency 1 16 64 --sessions 200 --baseline baseline.json
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import re
+import tempfile
+import time
+import uuid
+import warnings
+from collections import Counter, defaultdict
+from typing import Callable, Dict, List, Optional
+
+from langchain_core.callbacks import AsyncCallbackHandler
+from langchain_core.messages import AIMessageChunk
+from langchain_core.runnables import RunnableLambda
+from langgraph.checkpoint.memory import MemorySaver
+from pydantic import BaseModel
+
+from app import config
+from app.core.checkpointer import SQLiteCheckpointer
+from app.core.graph import build_graph
+from app.core.intent import intent_stats
+from app.core.speculation import pool_speculator
+from app.core.evaluation_queue import evaluation_queue
+from app.core.router_prefetch import router_prefetch
+from app.core.speculative_intent import IntentSpeculator, speculation_stats
+from app.models.schemas import (
+    IdentityIntent, TopicIntent, DifficultyIntent, QuestionBatch, QuestionIntent, EvaluationSchema,
+    AnswerTurn, CandidateReport, ReportBatch
+)
+from app.services.evaluation_cache import evaluation_cache
+from app.services.llm_service import use_llms
+from app.services.question_bank import question_bank
+from app.services.report_service import report_worker
+from app.utils.helpers import percentile
+
+# langchain's parsed structured output trips a harmless pydantic serializer warning
+warnings.filterwarnings("ignore", category=UserWarning)
+
+GOOD_ANSWERS = [
+    "A list is mutable and a tuple is immutable, so tuples can be used as dictionary keys.",
+    "A decorator is a function that wraps another function to add behaviour without changing its code.",
+    "Generators produce values lazily with yield, so they use constant memory for long sequences.",
+]
+WRONG_ANSWERS = [
+    "I'm not sure, maybe lists and tuples are exactly the same thing.",
+    "I have no idea, I think a decorator is a kind of comment.",
+    "I don't know, generators are probably just faster lists.",
+]
+
+SCENARIOS: Dict[str, List[str]] = {
+    "happy": ["yes, that's me", "Python please", "medium", *GOOD_ANSWERS],
+    "repeats": ["sorry, could you repeat that?", "yes", "pardon, say that again?", "python", "medium",
+                "can you repeat the question?", *GOOD_ANSWERS],
+    "silence": ["", "yes", "", "python", "", "medium", "", *GOOD_ANSWERS],
+    "quits": ["yes", "python", "medium", GOOD_ANSWERS[0], "I'd like to stop here, bye"],
+    "wrong_answers": ["yes", "python", "hard", *WRONG_ANSWERS],
+    "wrong_person": ["no, wrong number"],
+}
+
+# A session that runs off the end of its script keeps answering
+FILLER_REPLY = "I would use a dictionary for constant-time lookups."
+MAX_TURNS = 40
+
+_QUIT = ("quit", "stop", "bye", "end the interview")
+_REPEAT = ("repeat", "again", "sorry", "pardon", "what?")
+_WRONG = ("not sure", "no idea", "don't know")
+_DIFFICULTIES = ("beginner", "medium", "hard")
+
+
+def _reply_text(prompt) -> str:
+    """The candidate's words inside a router/evaluation prompt."""
+    text = prompt if isinstance(prompt, str) else prompt[-1].content
+    match = re.search(r'User reply:\s*"?(.*?)"?\s*$', text, re.S) or re.search(r"Answer:\s*(.*)$", text, re.S)
+    return (match.group(1) if match else text).strip()
+
+
+def _evaluation(reply: str) -> EvaluationSchema:
+    if any(w in reply.lower() for w in _WRONG):
+        return EvaluationSchema(correct=False, short_feedback="Not quite.",
+                                correction="Explain the core idea and one practical use.")
+    return EvaluationSchema(correct=True, short_feedback="Good answer.", correction=None)
+
+
+def scripted_response(schema, prompt) -> BaseModel:
+    """Deterministic, keyword-based stand-in for the model's structured output."""
+    reply = _reply_text(prompt)
+    lowered = reply.lower()
+    quit_ = any(w in lowered for w in _QUIT)
+    repeat = any(w in lowered for w in _REPEAT)
+    if schema is IdentityIntent:
+        if not lowered:
+            return IdentityIntent(intent="silence")
+        if repeat:
+            return IdentityIntent(intent="repeat")
+        return IdentityIntent(intent="not_valid" if lowered.startswith("no") else "valid")
+    if schema is TopicIntent:
+        if not lowered:
+            return TopicIntent(intent="silence")
+        if quit_ or repeat:
+            return TopicIntent(intent="quit" if quit_ else "repeat")
+        return TopicIntent(intent="topic_valid", extracted_topic=reply.split(",")[0].split()[0].title())
+    if schema is DifficultyIntent:
+        level = next((d for d in _DIFFICULTIES if d in lowered), None)
+        if quit_:
+            return DifficultyIntent(intent="quit")
+        if level is None:
+            return DifficultyIntent(intent="repeat" if repeat else "unknown")
+        return DifficultyIntent(intent="difficulty_answer", extracted_difficulty=level)
+    if schema is QuestionBatch:
+        # Overlapping draws, like a real model asked the same thing twice
+        return QuestionBatch(questions=[f"Sample interview question {n}?" for n in random.sample(range(1, 41), 10)])
+    if schema is QuestionIntent:
+        return QuestionIntent(intent="quit" if quit_ else "repeat" if repeat else "answer")
+    if schema is EvaluationSchema:
+        return _evaluation(reply)
+    if schema is AnswerTurn:
+        if quit_ or repeat:
+            return AnswerTurn(intent="quit" if quit_ else "repeat")
+        return AnswerTurn(intent="answer", evaluation=_evaluation(reply))
+    if schema is ReportBatch:
+        text = prompt if isinstance(prompt, str) else prompt[-1].content
+        return ReportBatch(reports=[
+            CandidateReport(candidate_ref=ref, summary="Solid fundamentals; a few gaps to close.",
+                            strengths=["Clear explanations"], improvements=["Revise the corrected topics"])
+            for ref in re.findall(r"^Candidate (\S+)", text, re.M)
+        ])
+    raise ValueError(f"No scripted response for {schema.__name__}")
+
+
+class LognormalLatency:
+    """Lognormal call latency around a median, optionally per schema, with slow outliers."""
+
+    def __init__(
+        self,
+        median_ms: float = 300.0,
+        sigma: float = 0.35,
+        per_kind_ms: Optional[Dict[str, float]] = None,
+        slow_prob: float = 0.0,
+        slow_ms: float = 3000.0,
+        seed: Optional[int] = 0,
+    ):
+        self.median_ms = median_ms
+        self.sigma = sigma
+        self.per_kind_ms = per_kind_ms or {}
+        self.slow_prob = slow_prob
+        self.slow_ms = slow_ms
+        self.random = random.Random(seed)
+
+    def __call__(self, kind: str) -> float:
+        if self.slow_prob and self.random.random() < self.slow_prob:
+            return self.slow_ms / 1000
+        median = self.per_kind_ms.get(kind, self.median_ms)
+        return median / 1000 * self.random.lognormvariate(0, self.sigma)
+
+
+class FakeLLM:
+    """Drop-in for the app's ChatOpenAI clients; install it with ``use_llms``.
+
+    ``responder(schema, prompt)`` builds the structured result and
+    ``latency(kind)`` returns the seconds to wait first, ``kind`` being the
+    schema name (or ``"stream"`` for streamed completions).
+    """
+
+    def __init__(
+        self,
+        responder: Callable = scripted_response,
+        latency: Optional[Callable[[str], float]] = None,
+        token_ms: float = 15.0,
+        model_name: str = "fake",
+    ):
+        self.responder = responder
+        self.latency = latency or LognormalLatency()
+        self.token_ms = token_ms
+        self.model_name = model_name
+        self.calls: Counter = Counter()
+
+    def with_structured_output(self, schema, **kwargs):
+        async def respond(prompt):
+            self.calls[schema.__name__] += 1
+            await asyncio.sleep(self.latency(schema.__name__))
+            return self.responder(schema, prompt)
+
+        return RunnableLambda(respond, name=f"Fake{schema.__name__}")
+
+    def bind(self, **kwargs) -> "FakeLLM":
+        return self
+
+    async def astream(self, messages, config=None, **kwargs):
+        # Only the streamed evaluation uses this; it wants a JSON object
+        self.calls["stream"] += 1
+        await asyncio.sleep(self.latency("stream"))
+        content = self.responder(EvaluationSchema, messages).model_dump_json()
+        for start in range(0, len(content), 4):
+            yield AIMessageChunk(content=content[start:start + 4])
+            await asyncio.sleep(self.token_ms / 1000)
+
+
+class NodeTimer(AsyncCallbackHandler):
+    """Wall time of every graph node run, from LangGraph's callback events."""
+
+    run_inline = True
+
+    def __init__(self):
+        self.seconds: Dict[str, List[float]] = defaultdict(list)
+        self._started: Dict = {}
+
+    async def on_chain_start(self, serialized, inputs, *, run_id, metadata=None, **kwargs):
+        name = kwargs.get("name")
+        if metadata and name == metadata.get("langgraph_node"):
+            self._started[run_id] = (name, time.perf_counter())
+
+    async def on_chain_end(self, outputs, *, run_id, **kwargs):
+        started = self._started.pop(run_id, None)
+        if started is not None:
+            self.seconds[started[0]].append(time.perf_counter() - started[1])
+
+    async def on_chain_error(self, error, *, run_id, **kwargs):
+        self._started.pop(run_id, None)
+
+
+class CheckpointTimer:
+    """Times the checkpointer's async read/write calls made by the graph."""
+
+    OPS = ("aget_tuple", "aput", "aput_writes")
+
+    def __init__(self, checkpointer):
+        self.seconds: Dict[str, List[float]] = defaultdict(list)
+        for op in self.OPS:
+            setattr(checkpointer, op, self._timed(op, getattr(checkpointer, op)))
+
+    def _timed(self, op: str, method):
+        async def timed(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return await method(*args, **kwargs)
+            finally:
+                self.seconds[op].append(time.perf_counter() - started)
+        return timed
+
+    def reset(self) -> None:
+        self.seconds.clear()
+
+
+def _summary(seconds: List[float]) -> dict:
+    return {
+        "count": len(seconds),
+        "p50_ms": round(1000 * percentile(seconds, 50), 2),
+        "p95_ms": round(1000 * percentile(seconds, 95), 2),
+        "p99_ms": round(1000 * percentile(seconds, 99), 2),
+    }
+
+
+async def replay(graph, script: List[str], timer: NodeTimer, turn_seconds: List[float],
+                 speculative_intent: bool = False, speculative_llm: bool = False,
+                 partial_lead: float = 0.0) -> None:
+    """One interview, driven the way app/main.py drives it.
+
+    With ``speculative_intent`` each reply is first offered as a stable
+    partial, as the audio path does, and the final commits any match;
+    ``speculative_llm`` also starts router LLM calls on it. The final arrives
+    ``partial_lead`` seconds later (the end of speech), which the turn time
+    does not include.
+    """
+    session_id = uuid.uuid4().hex[:12]
+    cfg = {"configurable": {"thread_id": f"replay-{session_id}"}, "callbacks": [timer]}
+    await graph.ainvoke({"candidate_id": session_id, "student_name": "Asha", "college": "Replay College",
+                         "course": "Python", "messages": []}, config=cfg)
+    speculator = IntentSpeculator(graph, cfg, llm=speculative_llm) if speculative_intent else None
+    replies = iter(script)
+    try:
+        for _ in range(MAX_TURNS):
+            if not (await graph.aget_state(cfg)).next:
+                return
+            reply = next(replies, FILLER_REPLY)
+            if speculator is not None:
+                await speculator.on_partial(reply)
+                await asyncio.sleep(partial_lead)
+            started = time.perf_counter()
+            if speculator is not None:
+                await speculator.apply_final(reply)
+            else:
+                await graph.aupdate_state(cfg, {"last_user_input": reply})
+            await graph.ainvoke(None, config=cfg)
+            turn_seconds.append(time.perf_counter() - started)
+            # Between turns, as the call layers do
+            await evaluation_queue.persist(graph, cfg)
+    finally:
+        await evaluation_queue.persist(graph, cfg, wait=True)
+
+
+async def run_level(graph, checkpoints: CheckpointTimer, fake: FakeLLM, concurrency: int, sessions: int,
+                    scenarios: List[str], speculative_intent: bool = False, speculative_llm: bool = False,
+                    partial_lead: float = 0.0) -> dict:
+    timer, turn_seconds = NodeTimer(), []
+    checkpoints.reset()
+    calls_before = sum(fake.calls.values())
+    gate = asyncio.Semaphore(concurrency)
+
+    async def one(i: int) -> None:
+        async with gate:
+            await replay(graph, SCENARIOS[scenarios[i % len(scenarios)]], timer, turn_seconds, speculative_intent,
+                         speculative_llm, partial_lead)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(sessions)))
+    elapsed = time.perf_counter() - started
+
+    checkpoint_seconds = sum(sum(v) for v in checkpoints.seconds.values())
+    return {
+        "concurrency": concurrency,
+        "sessions": sessions,
+        "sessions_per_s": round(sessions / elapsed, 2),
+        "llm_calls": sum(fake.calls.values()) - calls_before,
+        "turn": _summary(turn_seconds),
+        "nodes": {name: _summary(v) for name, v in sorted(timer.seconds.items())},
+        "checkpoint": {
+            "ms_per_turn": round(1000 * checkpoint_seconds / max(len(turn_seconds), 1), 2),
+            "share_of_turn_time": round(checkpoint_seconds / max(sum(turn_seconds), 1e-9), 3),
+            **{op: _summary(v) for op, v in sorted(checkpoints.seconds.items())},
+        },
+    }
+
+
+def compare(levels: List[dict], baseline: List[dict]) -> None:
+    """Print throughput and p95 changes against a saved run, matched by concurrency."""
+    by_concurrency = {b["concurrency"]: b for b in baseline}
+    for level in levels:
+        base = by_concurrency.get(level["concurrency"])
+        if base is None:
+            continue
+        print(f"c={level['concurrency']}: sessions/s {base['sessions_per_s']} -> {level['sessions_per_s']}, "
+              f"turn p95 {base['turn']['p95_ms']} -> {level['turn']['p95_ms']} ms")
+        for name, node in level["nodes"].items():
+            before = base["nodes"].get(name)
+            if before and before["p95_ms"]:
+                change = (node["p95_ms"] - before["p95_ms"]) / before["p95_ms"]
+                # Sub-millisecond nodes are all noise
+                if abs(change) >= 0.1 and abs(node["p95_ms"] - before["p95_ms"]) >= 1.0:
+                    print(f"    {name}: p95 {before['p95_ms']} -> {node['p95_ms']} ms ({change:+.0%})")
+
+
+async def main_async(args) -> List[dict]:
+    fake = FakeLLM(latency=LognormalLatency(args.latency_ms, args.sigma, slow_prob=args.slow_prob,
+                                            slow_ms=args.slow_ms, seed=args.seed))
+    use_llms(fake)
+    config.LOCAL_INTENT_ENABLED = args.local_intent
+    evaluation_cache.enabled = args.evaluation_cache
+    question_bank.enabled = args.question_bank
+    question_bank.path = None
+    tmp = tempfile.mkdtemp(prefix="graph_replay_")
+    report_worker.queue_path = f"{tmp}/report_queue.sqlite"
+    report_worker.reports_dir = f"{tmp}/reports"
+    evaluation_cache.path = None
+
+    if args.checkpointer == "sqlite":
+        checkpointer = SQLiteCheckpointer(path=f"{tmp}/checkpoints.sqlite")
+    else:
+        checkpointer = MemorySaver()
+    checkpoints = CheckpointTimer(checkpointer)
+    graph = build_graph(
+        speculative_pool=args.speculative_pool,
+        fused_answer=args.fused_answer,
+        pipelined_evaluation=args.pipelined_evaluation,
+        streaming_feedback=args.streaming_feedback,
+        feedback_reports=args.reports,
+        checkpointer=checkpointer,
+    )
+
+    levels = []
+    for concurrency in args.concurrency:
+        level = await run_level(graph, checkpoints, fake, concurrency, args.sessions, args.scenarios,
+                                args.speculative_intent, args.speculative_llm, args.partial_lead_ms / 1000)
+        levels.append(level)
+        print(json.dumps(level) if args.json else
+              f"c={concurrency}: {level['sessions_per_s']} sessions/s, turn p50/p95/p99 "
+              f"{level['turn']['p50_ms']}/{level['turn']['p95_ms']}/{level['turn']['p99_ms']} ms, "
+              f"checkpoint {level['checkpoint']['ms_per_turn']} ms/turn, {level['llm_calls']} LLM calls")
+    if not args.json:
+        print("per node at c=%d:" % levels[-1]["concurrency"])
+        for name, node in levels[-1]["nodes"].items():
+            print(f"    {name:28} n={node['count']:<6} p50 {node['p50_ms']:>8} p95 {node['p95_ms']:>8} "
+                  f"p99 {node['p99_ms']:>8} ms")
+        if args.local_intent:
+            print("local intent:", json.dumps(intent_stats.snapshot()))
+        if args.evaluation_cache:
+            print("evaluation cache:", json.dumps(evaluation_cache.stats()))
+        if args.question_bank:
+            print("question bank:", json.dumps(question_bank.stats()))
+        if args.speculative_intent:
+            print("speculation:", json.dumps(speculation_stats.snapshot()))
+        if args.speculative_llm:
+            print("router prefetch:", json.dumps(router_prefetch.stats()))
+        if args.speculative_pool:
+            print("pool speculation:", json.dumps(pool_speculator.stats()))
+    if args.reports:
+        reports = await report_worker.drain()
+        if not args.json:
+            print("reports:", json.dumps(reports))
+    return levels
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32, 128])
+    parser.add_argument("--sessions", type=int, default=120, help="interviews per concurrency level")
+    parser.add_argument("--scenarios", nargs="+", choices=sorted(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument("--latency-ms", type=float, default=300.0, help="median fake LLM latency")
+    parser.add_argument("--sigma", type=float, default=0.35, help="lognormal spread of the latency")
+    parser.add_argument("--slow-prob", type=float, default=0.0)
+    parser.add_argument("--slow-ms", type=float, default=3000.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--checkpointer", choices=["memory", "sqlite"], default=config.CHECKPOINT_BACKEND)
+    parser.add_argument("--local-intent", action=argparse.BooleanOptionalAction, default=config.LOCAL_INTENT_ENABLED)
+    parser.add_argument("--evaluation-cache", action=argparse.BooleanOptionalAction, default=False)
+    parser.add_argument("--question-bank", action=argparse.BooleanOptionalAction, default=False)
+    parser.add_argument("--speculative-intent", action=argparse.BooleanOptionalAction, default=False,
+                        help="offer each reply as a stable partial first, as the audio path does")
+    parser.add_argument("--speculative-llm", action=argparse.BooleanOptionalAction,
+                        default=config.SPECULATIVE_INTENT_LLM_ENABLED,
+                        help="with --speculative-intent, start router LLM calls on the partial")
+    parser.add_argument("--partial-lead-ms", type=float, default=0.0,
+                        help="with --speculative-intent, time from the stable partial to the final")
+    parser.add_argument("--reports", action=argparse.BooleanOptionalAction, default=False,
+                        help="queue post-interview reports, to check they do not slow live turns")
+    parser.add_argument("--speculative-pool", action=argparse.BooleanOptionalAction,
+                        default=config.SPECULATIVE_POOL_ENABLED)
+    parser.add_argument("--fused-answer", action=argparse.BooleanOptionalAction, default=config.FUSED_ANSWER_ENABLED)
+    parser.add_argument("--pipelined-evaluation", action=argparse.BooleanOptionalAction,
+                        default=config.PIPELINED_EVALUATION_ENABLED)
+    parser.add_argument("--streaming-feedback", action=argparse.BooleanOptionalAction,
+                        default=config.STREAMING_FEEDBACK_ENABLED)
+    parser.add_argument("--json", action="store_true", help="one JSON line per level")
+    parser.add_argument("--save", help="write results here, to use as a later --baseline")
+    parser.add_argument("--baseline", help="results file from an earlier --save to compare against")
+    args = parser.parse_args()
+
+    levels = asyncio.run(main_async(args))
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump({"args": vars(args), "levels": levels}, f, indent=2)
+    if args.baseline:
+        with open(args.baseline) as f:
+            compare(levels, json.load(f)["levels"])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""Tail latency of the shared LLM client against the fake OpenAI server.
+
+Runs the same mix of structured-output calls with hedging off and on, with
+a share of slow outliers and 429s injected by the server, and reports
+end-to-end p50/p95/p99 plus the client's retry/hedge counters.
+
+    python -m benchmarks.llm_client_bench --calls 600 --slow-prob 0.05
+"""
+
+import argparse
+import asyncio
+import time
+import warnings
+
+from langchain_openai import ChatOpenAI
+
+from app.models.schemas import IdentityIntent, AnswerTurn, QuestionBatch
+from app.services.llm_service import LLMClient
+from app.utils.helpers import percentile
+from benchmarks.fake_openai import FakeOpenAI, serve
+
+# langchain's parsed structured output trips a harmless pydantic serializer warning
+warnings.filterwarnings("ignore", category=UserWarning)
+
+SCHEMAS = (IdentityIntent, AnswerTurn, QuestionBatch)
+
+
+async def run(client: LLMClient, llm: ChatOpenAI, calls: int, in_flight: int) -> dict:
+    latencies = []
+    failed = 0
+    gate = asyncio.Semaphore(in_flight)
+
+    async def one(i: int) -> None:
+        nonlocal failed
+        async with gate:
+            started = time.perf_counter()
+            try:
+                await client.invoke_structured(llm, SCHEMAS[i % len(SCHEMAS)], "hi", name="bench")
+            except Exception:
+                failed += 1
+                return
+            latencies.append(time.perf_counter() - started)
+
+    await asyncio.gather(*(one(i) for i in range(calls)))
+    return {
+        "p50_ms": round(1000 * percentile(latencies, 50)),
+        "p95_ms": round(1000 * percentile(latencies, 95)),
+        "p99_ms": round(1000 * percentile(latencies, 99)),
+        "failed": failed,
+        **client.counts,
+    }
+
+
+async def main_async(args) -> None:
+    fake = FakeOpenAI(latency_ms=args.latency_ms, slow_prob=args.slow_prob, slow_ms=args.slow_ms,
+                      rate_limit=args.rate_limit, seed=1)
+    async with serve(fake) as base_url:
+        llm = ChatOpenAI(model="gpt-4o-mini", api_key="fake", base_url=base_url, max_retries=0)
+        for hedge in (False, True):
+            client = LLMClient(hedge=hedge, requests_per_second=args.rps, burst=50, backoff_base=0.05)
+            print(f"hedge={hedge}:", await run(client, llm, args.calls, args.in_flight))
+    print("server:", fake.counts)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=600)
+    parser.add_argument("--in-flight", type=int, default=16, help="concurrent callers")
+    parser.add_argument("--rps", type=float, default=500.0, help="client token-bucket rate")
+    parser.add_argument("--latency-ms", type=float, default=50.0)
+    parser.add_argument("--slow-prob", type=float, default=0.05)
+    parser.add_argument("--slow-ms", type=float, default=1500.0)
+    parser.add_argument("--rate-limit", type=float, default=0.03)
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""Post-interview report throughput at different batch sizes, with a fake LLM.
+
+Queues N finished interviews, then drains ``ReportWorker`` once per batch
+size and reports reports/minute, LLM calls and batch latency. The fake model
+takes a base latency plus a per-report cost for the output it would write, so
+batching saves the per-call overhead but not the generation time.
+
+    python -m benchmarks.report_pipeline --reports 400 --batch-size 1 4 8 16 --concurrency 2
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import time
+
+from app.core.state import QuestionEvaluation
+from app.services.llm_service import use_llms
+from app.services.report_service import ReportJob, ReportWorker
+from benchmarks.graph_replay import FakeLLM, LognormalLatency, WRONG_ANSWERS, GOOD_ANSWERS
+
+
+def job(i: int) -> ReportJob:
+    answers = GOOD_ANSWERS if i % 3 else WRONG_ANSWERS
+    return ReportJob(
+        thread_id=f"bench-{i:05d}", candidate_id=str(i), student_name=f"Candidate {i}",
+        topic="Python", difficulty="medium",
+        evaluations=[
+            QuestionEvaluation(question=f"Sample interview question {q + 1}?", answer=answer,
+                               correct=bool(i % 3), short_feedback="Good answer." if i % 3 else "Not quite.",
+                               correction=None if i % 3 else "Explain the core idea and one practical use.")
+            for q, answer in enumerate(answers)
+        ],
+    )
+
+
+async def run_level(args, batch_size: int) -> dict:
+    latency = LognormalLatency(args.base_ms + args.per_report_ms * batch_size, sigma=0.2, seed=batch_size)
+    fake = FakeLLM(latency=latency)
+    use_llms(fake)
+    tmp = tempfile.mkdtemp(prefix="report_pipeline_")
+    worker = ReportWorker(queue_path=os.path.join(tmp, "report_queue.sqlite"), reports_dir=os.path.join(tmp, "reports"),
+                          batch_size=batch_size, concurrency=args.concurrency)
+    for i in range(args.reports):
+        worker.store.add(job(i))
+    started = time.perf_counter()
+    stats = await worker.drain()
+    elapsed = time.perf_counter() - started
+    await worker.stop()
+    assert stats["queue"] == {"done": args.reports}, stats
+    return {
+        "batch_size": batch_size,
+        "reports_per_minute": round(60 * args.reports / elapsed, 1),
+        "llm_calls": fake.calls["ReportBatch"],
+        "batch_p95_ms": stats["batch_p95_ms"],
+        "fallbacks": stats["written"]["fallback"],
+    }
+
+
+async def main_async(args) -> None:
+    for batch_size in args.batch_size:
+        level = await run_level(args, batch_size)
+        print(json.dumps(level) if args.json else
+              f"batch={batch_size}: {level['reports_per_minute']} reports/min, {level['llm_calls']} LLM calls, "
+              f"batch p95 {level['batch_p95_ms']} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--reports", type=int, default=400)
+    parser.add_argument("--batch-size", type=int, nargs="+", default=[1, 4, 8, 16])
+    parser.add_argument("--concurrency", type=int, default=2)
+    parser.add_argument("--base-ms", type=float, default=800.0, help="fake LLM latency per call")
+    parser.add_argument("--per-report-ms", type=float, default=150.0, help="extra fake latency per report in a batch")
+    parser.add_argument("--json", action="store_true", help="one JSON line per batch size")
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""Cold-start cost of a worker: import time and time-to-first-turn.
+
+Every measurement runs in a fresh interpreter against the fake OpenAI server:
+
+* ``import_s``: ``import app.api.routes`` (what uvicorn does before serving)
+* ``graph_s``: building the process-wide compiled graph
+* ``ready_s``: spawn of a uvicorn worker until ``/health`` answers
+* ``greeting_s``: connect + ``start`` until the first agent message arrives
+* ``first_turn_s``: the candidate's first reply until ``turn_done`` (first LLM call)
+
+    python -m benchmarks.startup_bench --runs 5
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import websockets
+
+from benchmarks.fake_openai import FakeOpenAI, _free_port, serve
+from benchmarks.ws_load import _wait_http
+
+IMPORT_SNIPPET = """
+import time
+started = time.perf_counter()
+import app.api.routes
+imported = time.perf_counter()
+from app.core.graph import get_graph
+get_graph()
+print(imported - started, time.perf_counter() - imported)
+"""
+
+
+def _env(base_url: str, tmp: str) -> dict:
+    return {
+        **os.environ,
+        "OPENAI_API_KEY": "fake",
+        "LLM_BASE_URL": base_url,
+        "CHECKPOINT_DB_PATH": os.path.join(tmp, "checkpoints.sqlite"),
+        "QUESTION_BANK_PATH": os.path.join(tmp, "question_bank.sqlite"),
+        "EVALUATION_CACHE_PATH": os.path.join(tmp, "evaluations.json"),
+        "REPORT_QUEUE_PATH": os.path.join(tmp, "report_queue.sqlite"),
+        "REPORTS_DIR": os.path.join(tmp, "reports"),
+        "TTS_PROVIDER": "local",
+    }
+
+
+async def measure_once(base_url: str) -> dict:
+    tmp = tempfile.mkdtemp(prefix="startup_bench_")
+    env = _env(base_url, tmp)
+    out = await asyncio.to_thread(
+        subprocess.run, [sys.executable, "-c", IMPORT_SNIPPET], env=env, capture_output=True, text=True, check=True
+    )
+    import_s, graph_s = map(float, out.stdout.split())
+
+    port = _free_port()
+    spawned = time.perf_counter()
+    server = subprocess.Popen([sys.executable, "-m", "uvicorn", "app.api.routes:app", "--port", str(port),
+                               "--log-level", "warning"], env=env)
+    try:
+        await asyncio.to_thread(_wait_http, f"http://127.0.0.1:{port}/health")
+        ready_s = time.perf_counter() - spawned
+
+        async with websockets.connect(f"ws://127.0.0.1:{port}/ws/interview") as ws:
+            started = time.perf_counter()
+            await ws.send(json.dumps({"type": "start", "student_name": "Asha", "college": "Bench", "course": "Python"}))
+            while json.loads(await ws.recv())["type"] != "agent":
+                pass
+            greeting_s = time.perf_counter() - started
+
+            started = time.perf_counter()
+            await ws.send(json.dumps({"type": "text", "text": "yes"}))
+            while json.loads(await ws.recv())["type"] != "turn_done":
+                pass
+            first_turn_s = time.perf_counter() - started
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+
+    return {"import_s": import_s, "graph_s": graph_s, "ready_s": ready_s,
+            "greeting_s": greeting_s, "first_turn_s": first_turn_s}
+
+
+async def main_async(args) -> None:
+    async with serve(FakeOpenAI(latency_ms=args.latency_ms, sigma=0.0)) as base_url:
+        runs = []
+        for _ in range(args.runs):
+            runs.append(await measure_once(base_url))
+            print(json.dumps({k: round(v, 3) for k, v in runs[-1].items()}))
+    print("median:", json.dumps({k: round(statistics.median(r[k] for r in runs), 3) for k in runs[0]}))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--latency-ms", type=float, default=50.0, help="fake LLM latency")
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""VAD throughput on the bundled input.wav.
+
+Feeds the file through many independent detectors in 20 ms chunks (one per
+simulated call, interleaved like a real server) and reports how many
+call-seconds one CPU-second can process, i.e. concurrent streams per core.
+
+    python -m benchmarks.vad_bench --streams 200
+"""
+
+import argparse
+import time
+import wave
+
+from app.streaming.vad import VoiceActivityDetector
+
+
+def load_pcm(path: str):
+    with wave.open(path, "rb") as w:
+        if w.getsampwidth() != 2 or w.getnchannels() != 1:
+            raise ValueError("expected 16-bit mono PCM")
+        return w.getframerate(), w.readframes(w.getnframes())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--wav", default="input.wav")
+    parser.add_argument("--streams", type=int, default=200)
+    parser.add_argument("--chunk-ms", type=int, default=20)
+    args = parser.parse_args()
+
+    sample_rate, pcm = load_pcm(args.wav)
+    audio_seconds = len(pcm) / 2 / sample_rate
+    chunk_bytes = sample_rate * args.chunk_ms // 1000 * 2
+    chunks = [pcm[i:i + chunk_bytes] for i in range(0, len(pcm), chunk_bytes)]
+
+    detector = VoiceActivityDetector(sample_rate=sample_rate)
+    # (event, stream time at which the detector reported it)
+    events = [(e, (i + 1) * args.chunk_ms) for i, c in enumerate(chunks) for e in detector.process(c)]
+    events += [(e, len(chunks) * args.chunk_ms) for e in detector.flush()]
+    print("segments in", args.wav)
+    for event, reported_ms in events:
+        print(f"  {event.type:<12} {event.timestamp_ms:7.0f} ms  (reported at {reported_ms:.0f} ms)")
+
+    detectors = [VoiceActivityDetector(sample_rate=sample_rate) for _ in range(args.streams)]
+    started = time.process_time()
+    for chunk in chunks:
+        for d in detectors:
+            d.process(chunk)
+    cpu = time.process_time() - started
+
+    call_seconds = audio_seconds * args.streams
+    print(f"{args.streams} streams x {audio_seconds:.1f}s in {cpu:.3f} CPU-s")
+    print(f"throughput: {call_seconds / cpu:.0f} call-seconds per CPU-second "
+          f"(~{call_seconds / cpu:.0f} concurrent real-time streams per core)")
+    print(f"per chunk: {1e6 * cpu / (len(chunks) * args.streams):.1f} us")
+
+
+if __name__ == "__main__":
+    main()
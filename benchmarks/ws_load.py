@@ -0,0 +1,188 @@
+"""Load generator for the WebSocket call server.
+
+Starts the fake OpenAI server and one uvicorn worker (``app.api.routes:app``)
+as subprocesses, then drives N simulated candidates through full interviews
+over WebSockets, with a think time between replies like a real caller. For
+each N it reports completed/failed calls, turn latency percentiles and the
+worker's CPU use; the largest N that stays within the latency SLO with no
+failures is what one worker can sustain.
+
+    python -m benchmarks.ws_load --sessions 50 100 200 --think-ms 1500 --llm-latency-ms 400
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from typing import List
+
+import websockets
+
+from app.utils.helpers import percentile
+from benchmarks.fake_openai import _free_port
+
+SCRIPT = [
+    "yes",
+    "python",
+    "medium",
+    "a list is mutable while a tuple cannot be changed after creation",
+    "decorators wrap a function to add behaviour without changing its code",
+    "the GIL lets only one thread run Python bytecode at a time",
+    "generators yield values lazily instead of building the whole list",
+    "context managers make sure cleanup runs even when an error is raised",
+]
+
+
+class Results:
+    def __init__(self):
+        self.turn_ms: List[float] = []
+        self.completed = 0
+        self.failed = 0
+        self.errors: List[str] = []
+        self.audio_bytes = 0
+
+
+async def _next_message(ws, results: Results) -> dict:
+    while True:
+        frame = await ws.recv()
+        if isinstance(frame, bytes):
+            results.audio_bytes += len(frame)
+            continue
+        message = json.loads(frame)
+        if message["type"] in ("error", "shutdown"):
+            raise RuntimeError(message)
+        return message
+
+
+async def candidate(url: str, index: int, think_ms: float, audio: bool, results: Results) -> None:
+    rng = random.Random(index)
+    replies = iter(SCRIPT)
+    sent_at = None
+    try:
+        async with websockets.connect(url, max_size=None, open_timeout=60) as ws:
+            await ws.send(json.dumps({"type": "start", "student_name": f"Candidate {index}",
+                                      "college": "Load Test", "course": "Python", "audio": audio}))
+            while True:
+                message = await _next_message(ws, results)
+                if message["type"] == "end":
+                    results.completed += 1
+                    return
+                if message["type"] == "turn_done":
+                    results.turn_ms.append(1000 * (time.perf_counter() - sent_at))
+                elif not (message["type"] == "agent" and sent_at is None):
+                    continue
+
+                # Think before replying; the interview may end in the meantime
+                try:
+                    message = await asyncio.wait_for(_next_message(ws, results), think_ms / 1000 * rng.uniform(0.5, 1.5))
+                except asyncio.TimeoutError:
+                    sent_at = time.perf_counter()
+                    await ws.send(json.dumps({"type": "text", "text": next(replies, "that is all I know")}))
+                    continue
+                if message["type"] != "end":
+                    raise RuntimeError(f"unexpected message while idle: {message}")
+                results.completed += 1
+                return
+    except Exception as e:
+        results.failed += 1
+        results.errors.append(f"{type(e).__name__}: {e}")
+
+
+def _wait_http(url: str, timeout: float = 60.0) -> None:
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            urllib.request.urlopen(url, timeout=1).read()
+            return
+        except OSError:
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(0.1)
+
+
+def _cpu_seconds(pid: int) -> float:
+    with open(f"/proc/{pid}/stat") as f:
+        fields = f.read().rsplit(")", 1)[1].split()
+    return (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+
+
+async def run_level(ws_url: str, server_pid: int, sessions: int, args) -> dict:
+    results = Results()
+    cpu_before, started = _cpu_seconds(server_pid), time.perf_counter()
+
+    async def staggered(i: int) -> None:
+        await asyncio.sleep(args.ramp_seconds * i / sessions)
+        await candidate(ws_url, i, args.think_ms, args.audio, results)
+
+    await asyncio.gather(*(staggered(i) for i in range(sessions)))
+    elapsed = time.perf_counter() - started
+    return {
+        "sessions": sessions,
+        "completed": results.completed,
+        "failed": results.failed,
+        "turn_p50_ms": round(percentile(results.turn_ms, 50)),
+        "turn_p95_ms": round(percentile(results.turn_ms, 95)),
+        "turn_p99_ms": round(percentile(results.turn_ms, 99)),
+        "worker_cpu_pct": round(100 * (_cpu_seconds(server_pid) - cpu_before) / elapsed, 1),
+        "audio_mb": round(results.audio_bytes / 2 ** 20, 1),
+        "wall_s": round(elapsed, 1),
+        "first_error": results.errors[0] if results.errors else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, nargs="+", default=[25, 50, 100])
+    parser.add_argument("--think-ms", type=float, default=1500.0)
+    parser.add_argument("--ramp-seconds", type=float, default=5.0)
+    parser.add_argument("--llm-latency-ms", type=float, default=400.0)
+    parser.add_argument("--slo-ms", type=float, default=2000.0, help="p95 turn latency budget")
+    parser.add_argument("--audio", action="store_true", help="also stream agent speech (local TTS)")
+    args = parser.parse_args()
+
+    llm_port, app_port = _free_port(), _free_port()
+    tmp = tempfile.mkdtemp(prefix="ws_load_")
+    env = {
+        **os.environ,
+        "OPENAI_API_KEY": "fake",
+        "LLM_BASE_URL": f"http://127.0.0.1:{llm_port}/v1",
+        "LLM_REQUESTS_PER_SECOND": "1000",
+        "LLM_BURST": "200",
+        "CHECKPOINT_DB_PATH": os.path.join(tmp, "checkpoints.sqlite"),
+        "QUESTION_BANK_PATH": os.path.join(tmp, "question_bank.sqlite"),
+        "EVALUATION_CACHE_PATH": os.path.join(tmp, "evaluations.json"),
+        "REPORT_QUEUE_PATH": os.path.join(tmp, "report_queue.sqlite"),
+        "REPORTS_DIR": os.path.join(tmp, "reports"),
+        "AUDIO_CACHE_DIR": os.path.join(tmp, "audio"),
+        "TTS_PROVIDER": "local",
+        "WS_MAX_SESSIONS": str(max(args.sessions) * 2),
+    }
+    fake = subprocess.Popen([sys.executable, "-m", "benchmarks.fake_openai", "--port", str(llm_port),
+                             "--latency-ms", str(args.llm_latency_ms)], env=env)
+    server = subprocess.Popen([sys.executable, "-m", "uvicorn", "app.api.routes:app", "--port", str(app_port),
+                               "--log-level", "warning", "--ws-max-size", "65536"], env=env)
+    try:
+        _wait_http(f"http://127.0.0.1:{app_port}/health")
+        ws_url = f"ws://127.0.0.1:{app_port}/ws/interview"
+        sustainable = 0
+        for sessions in args.sessions:
+            level = asyncio.run(run_level(ws_url, server.pid, sessions, args))
+            print(json.dumps(level))
+            if level["failed"] == 0 and level["turn_p95_ms"] <= args.slo_ms:
+                sustainable = sessions
+        print(f"sustainable concurrent calls per worker (p95 <= {args.slo_ms:.0f} ms): {sustainable}")
+        print(urllib.request.urlopen(f"http://127.0.0.1:{app_port}/stats").read().decode())
+    finally:
+        for proc in (server, fake):
+            proc.terminate()
+            proc.wait(timeout=30)
+
+
+if __name__ == "__main__":
+    main()
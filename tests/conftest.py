@@ -0,0 +1,6 @@
+import os
+import sys
+
+# The OpenAI clients are built at import time; tests never reach the network
+os.environ.setdefault("OPENAI_API_KEY", "test")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,67 @@
+import asyncio
+
+from langchain_core.messages import AIMessage
+
+from app.core.prompts import GOODBYE
+from app.core.streaming_reply import speak_turn
+from app.services.audio_cache import AudioCache
+from app.services.tts_service import LocalTTS
+
+
+class CountingTTS(LocalTTS):
+    def __init__(self):
+        super().__init__(chars_per_second=200.0)
+        self.calls = []
+
+    async def stream(self, text):
+        self.calls.append(text)
+        async for chunk in super().stream(text):
+            yield chunk
+
+
+class OneTurnGraph:
+    """Stands in for the compiled graph: one node that says ``text``."""
+
+    def __init__(self, text):
+        self.text = text
+
+    async def astream(self, _input, config=None, stream_mode=None):
+        yield "updates", {"goodbye": {"messages": [AIMessage(content=self.text)]}}
+
+
+async def play(graph, tts, cache):
+    return b"".join([chunk async for chunk in speak_turn(graph, {}, tts=tts, cache=cache)])
+
+
+def test_warmed_line_makes_no_tts_call(tmp_path):
+    tts = CountingTTS()
+    cache = AudioCache(directory=str(tmp_path), tts=tts)
+    asyncio.run(cache.warm([GOODBYE]))
+    tts.calls.clear()
+
+    audio = asyncio.run(play(OneTurnGraph(GOODBYE), tts, cache))
+
+    assert tts.calls == []
+    assert audio == bytes(cache.lookup(GOODBYE, tts))
+    assert cache.hits == 1
+
+
+def test_static_line_is_recorded_whole_on_a_miss(tmp_path):
+    tts = CountingTTS()
+    cache = AudioCache(directory=str(tmp_path), tts=tts)
+
+    asyncio.run(play(OneTurnGraph(GOODBYE), tts, cache))
+    asyncio.run(play(OneTurnGraph(GOODBYE), tts, cache))
+
+    assert tts.calls == [GOODBYE]
+    assert cache.stats()["pinned"] == 1
+
+
+def test_dynamic_line_is_split_into_clauses(tmp_path):
+    tts = CountingTTS()
+    cache = AudioCache(directory=str(tmp_path), tts=tts)
+
+    asyncio.run(play(OneTurnGraph("First sentence here. Second sentence here."), tts, cache))
+
+    assert tts.calls == ["First sentence here.", "Second sentence here."]
+    assert cache.stats()["entries"] == 0
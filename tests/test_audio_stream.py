@@ -0,0 +1,59 @@
+import asyncio
+
+import numpy as np
+
+from app.streaming.audio_stream import CallAudioStream, TELEPHONY_RATE, TTS_RATE
+
+
+def tts_audio(seconds: float) -> bytes:
+    t = np.arange(int(TTS_RATE * seconds)) / TTS_RATE
+    return (8000 * np.sin(2 * np.pi * 440 * t)).astype("<i2").tobytes()
+
+
+async def play(stream: CallAudioStream, pcm: bytes, chunk_bytes: int = 9600) -> bytes:
+    """Feed TTS in chunks while a fake telephony socket drains one frame per tick."""
+    received = bytearray()
+    done = asyncio.Event()
+
+    async def telephony():
+        while not (done.is_set() and len(stream.outbound) < stream.outbound_frame_bytes):
+            for frame in stream.outbound_frames():
+                received.extend(frame)
+                break
+            await asyncio.sleep(0)
+
+    sender = asyncio.create_task(telephony())
+    for start in range(0, len(pcm), chunk_bytes):
+        assert await stream.feed_outbound_pcm(pcm[start:start + chunk_bytes]) == len(pcm[start:start + chunk_bytes])
+    done.set()
+    await sender
+    return bytes(received)
+
+
+def test_ten_seconds_come_out_intact():
+    pcm = tts_audio(10.0)
+    received = asyncio.run(play(CallAudioStream(buffer_seconds=2.0), pcm))
+
+    reference = CallAudioStream(buffer_seconds=12.0)
+    asyncio.run(reference.feed_outbound_pcm(pcm))
+    expected = b"".join(bytes(frame) for frame in reference.outbound_frames())
+
+    assert len(received) == TELEPHONY_RATE * 10
+    assert received == expected
+    assert reference.outbound.dropped == 0
+
+
+def test_clear_outbound_releases_a_waiting_feed():
+    async def scenario():
+        stream = CallAudioStream(buffer_seconds=1.0)
+        pcm = tts_audio(3.0)
+        feed = asyncio.create_task(stream.feed_outbound_pcm(pcm))
+        await asyncio.sleep(0.01)
+        assert not feed.done() and len(stream.outbound) == stream.outbound.capacity
+        stream.clear_outbound()
+        taken = await asyncio.wait_for(feed, 1.0)
+        return stream, taken, len(pcm)
+
+    stream, taken, total = asyncio.run(scenario())
+    assert taken < total
+    assert len(stream.outbound) == 0 and stream.outbound.dropped == 0
@@ -0,0 +1,37 @@
+import json
+
+import pytest
+
+from app.services.call_service import candidate_id_for_phone, load_candidates
+
+
+def write_csv(tmp_path, text: str) -> str:
+    path = tmp_path / "candidates.csv"
+    path.write_text(text)
+    return str(path)
+
+
+def test_missing_id_is_derived_from_phone_and_survives_reordering(tmp_path):
+    rows = "Asha,A College,Python,+91 98765 43210\nRavi,B College,Java,9876500000\n"
+    first = load_candidates(write_csv(tmp_path, "student_name,college,course,phone\n" + rows))
+    reordered = load_candidates(write_csv(tmp_path, "student_name,college,course,phone\n"
+                                          + "".join(reversed(rows.splitlines(keepends=True)))))
+    assert {c.student_name: c.candidate_id for c in first} == {c.student_name: c.candidate_id for c in reordered}
+    assert first[0].candidate_id == candidate_id_for_phone("+919876543210")
+
+
+def test_explicit_id_is_kept(tmp_path):
+    path = tmp_path / "candidates.json"
+    path.write_text(json.dumps([{"candidate_id": "c-7", "student_name": "Asha", "phone": "123"}]))
+    assert [c.candidate_id for c in load_candidates(str(path))] == ["c-7"]
+
+
+def test_row_without_id_or_phone_is_rejected(tmp_path):
+    with pytest.raises(ValueError, match="neither a candidate_id nor a phone"):
+        load_candidates(write_csv(tmp_path, "student_name,college,course\nAsha,A College,Python\n"))
+
+
+def test_duplicate_ids_are_rejected(tmp_path):
+    text = "student_name,college,course,candidate_id,phone\nAsha,A,Python,,555-0100\nRavi,B,Java,,5550100\n"
+    with pytest.raises(ValueError, match="candidates 1 and 2 share candidate_id"):
+        load_candidates(write_csv(tmp_path, text))
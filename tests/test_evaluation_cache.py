@@ -0,0 +1,42 @@
+from app.models.schemas import EvaluationSchema
+from app.services.evaluation_cache import EvaluationCache, normalize_answer
+
+QUESTION = "What is the time complexity of binary search?"
+
+
+def verdict(correct: bool) -> EvaluationSchema:
+    return EvaluationSchema(correct=correct, short_feedback="Right." if correct else "Not quite.", correction=None)
+
+
+def test_normalize_keeps_content_words():
+    assert normalize_answer("It is in the heap.") == ["it", "is", "in", "the", "heap"]
+    assert normalize_answer("Um, it is, you know, like in the heap") == ["it", "is", "in", "the", "heap"]
+
+
+def test_disfluencies_share_an_entry():
+    cache = EvaluationCache(path=None, enabled=True)
+    cache.put(QUESTION, "It is logarithmic.", verdict(True))
+    cached = cache.get(QUESTION, "Um, uh, it is logarithmic")
+    assert cached is not None and cached.correct
+
+
+def test_one_word_substitution_is_a_miss():
+    cache = EvaluationCache(path=None, enabled=True)
+    cache.put(QUESTION, "It runs in logarithmic time", verdict(True))
+    assert cache.get(QUESTION, "It runs in linear time") is None
+    assert cache.get(QUESTION, "It runs in not logarithmic time") is None
+    assert cache.stats()["hits"] == 0 and cache.stats()["misses"] == 2
+
+
+def test_same_answer_to_another_question_is_a_miss():
+    cache = EvaluationCache(path=None, enabled=True)
+    cache.put(QUESTION, "It is logarithmic", verdict(True))
+    assert cache.get("What is the time complexity of a hash lookup?", "It is logarithmic") is None
+
+
+def test_persists_across_instances(tmp_path):
+    path = str(tmp_path / "evaluations.json")
+    cache = EvaluationCache(path=path, enabled=True)
+    cache.put(QUESTION, "It is logarithmic", verdict(True))
+    cache.flush()
+    assert EvaluationCache(path=path, enabled=True).get(QUESTION, "it is logarithmic").correct
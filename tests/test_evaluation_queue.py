@@ -0,0 +1,116 @@
+import asyncio
+
+import pytest
+from fastapi import WebSocketDisconnect
+from langgraph.checkpoint.memory import MemorySaver
+
+from app.api.websocket import SessionManager
+from app.core import nodes
+from app.core.evaluation_queue import evaluation_queue, turn_latency
+from app.core.graph import build_graph
+from app.services.evaluation_cache import evaluation_cache
+from app.services.llm_service import use_llms
+from benchmarks.graph_replay import GOOD_ANSWERS, FakeLLM, LognormalLatency
+
+QUESTIONS = ["What is a tuple?", "What is a decorator?", "What is a generator?"]
+EVALUATION_SECONDS = 0.2
+
+
+class FakeWebSocket:
+    def __init__(self):
+        self.incoming: asyncio.Queue = asyncio.Queue()
+        self.sent = []
+
+    async def accept(self):
+        pass
+
+    async def close(self, code: int = 1000):
+        pass
+
+    async def receive_json(self):
+        message = await self.incoming.get()
+        if message is None:
+            raise WebSocketDisconnect()
+        return message
+
+    async def send_json(self, payload):
+        self.sent.append(payload)
+
+
+@pytest.fixture(autouse=True)
+def fake_llm(monkeypatch):
+    use_llms(FakeLLM(latency=LognormalLatency(1.0, sigma=0.0,
+                                              per_kind_ms={"EvaluationSchema": 1000 * EVALUATION_SECONDS})))
+    monkeypatch.setattr(evaluation_cache, "enabled", False)
+
+    async def pool(topic, difficulty, size, candidate):
+        return list(QUESTIONS)
+
+    monkeypatch.setattr(nodes, "draw_question_pool", pool)
+    turn_latency.reset()
+    yield
+    use_llms(None)
+
+
+def graph(**kwargs):
+    return build_graph(speculative_pool=False, feedback_reports=False, checkpointer=MemorySaver(), **kwargs)
+
+
+def test_dropped_call_persists_outstanding_evaluations():
+    async def scenario():
+        ws, g = FakeWebSocket(), graph(pipelined_evaluation=True)
+        handler = asyncio.create_task(SessionManager().handle(ws, g))
+        await ws.incoming.put({"type": "start", "thread_id": "dropped", "student_name": "Asha"})
+        for reply in ["yes", "python", "medium", GOOD_ANSWERS[0]]:
+            await ws.incoming.put({"type": "text", "text": reply})
+        # Hang up while the first answer is still being scored
+        await ws.incoming.put(None)
+        await handler
+        return await g.aget_state({"configurable": {"thread_id": "dropped"}})
+
+    state = asyncio.run(scenario())
+    assert [e.question for e in state.values["evaluations"]] == [QUESTIONS[0]]
+    assert state.values["evaluations"][0].correct
+    assert evaluation_queue.outstanding("dropped") == 0
+    assert "dropped" not in evaluation_queue._pending
+
+
+def test_finished_evaluations_are_written_between_turns():
+    async def scenario():
+        ws, g = FakeWebSocket(), graph(pipelined_evaluation=True)
+        handler = asyncio.create_task(SessionManager().handle(ws, g))
+        await ws.incoming.put({"type": "start", "thread_id": "between", "student_name": "Asha"})
+        for reply in ["yes", "python", "medium", GOOD_ANSWERS[0]]:
+            await ws.incoming.put({"type": "text", "text": reply})
+        while sum(m["type"] == "turn_done" for m in ws.sent) < 4:
+            await asyncio.sleep(0.01)
+        await asyncio.sleep(EVALUATION_SECONDS + 0.1)
+        # The next turn persists what finished while the candidate was answering
+        await ws.incoming.put({"type": "text", "text": "can you repeat the question?"})
+        while sum(m["type"] == "turn_done" for m in ws.sent) < 5:
+            await asyncio.sleep(0.01)
+        state = await g.aget_state({"configurable": {"thread_id": "between"}})
+        await ws.incoming.put(None)
+        await handler
+        return state
+
+    state = asyncio.run(scenario())
+    assert [e.question for e in state.values["evaluations"]] == [QUESTIONS[0]]
+
+
+def test_answer_turn_latency_is_comparable_across_modes():
+    async def answer(g, thread_id):
+        cfg = {"configurable": {"thread_id": thread_id}}
+        await g.ainvoke({"student_name": "Asha", "college": "", "course": "", "messages": []}, config=cfg)
+        for reply in ["yes", "python", "medium", GOOD_ANSWERS[0]]:
+            await g.aupdate_state(cfg, {"last_user_input": reply})
+            await g.ainvoke(None, config=cfg)
+        evaluation_queue.discard(thread_id)
+
+    asyncio.run(answer(graph(), "inline"))
+    asyncio.run(answer(graph(pipelined_evaluation=True), "pipelined"))
+
+    stats = turn_latency.stats()
+    assert stats["inline"]["count"] == stats["pipelined"]["count"] == 1
+    assert stats["inline"]["p50_ms"] >= 1000 * EVALUATION_SECONDS
+    assert stats["pipelined"]["p50_ms"] < 1000 * EVALUATION_SECONDS / 2
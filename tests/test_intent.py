@@ -0,0 +1,20 @@
+import pytest
+
+from app.core.intent import classify_identity
+
+
+@pytest.mark.parametrize("reply", ["no", "nope, wrong number", "no it's not me", "he is not here"])
+def test_plain_denials_are_settled_locally(reply):
+    result = classify_identity(reply, "Jayanth", record=False)
+    assert result is not None and result.intent == "not_valid"
+
+
+@pytest.mark.parametrize("reply", ["no no I am Jayanth", "no, this is Jayanth", "no no, my name is Jayanth",
+                                   "no, Jayanth is not here"])
+def test_denial_with_a_self_identification_goes_to_the_llm(reply):
+    assert classify_identity(reply, "Jayanth", record=False) is None
+
+
+def test_confirmation_with_the_name_is_still_local():
+    result = classify_identity("yes I am Jayanth", "Jayanth", record=False)
+    assert result is not None and result.intent == "valid"
@@ -0,0 +1,229 @@
+import asyncio
+import operator
+from typing import Annotated, List, Optional, TypedDict
+
+import pytest
+from fastapi import WebSocketDisconnect
+from langchain_core.messages import AIMessage, AnyMessage
+from langgraph.checkpoint.memory import MemorySaver
+from langgraph.graph import END, START, StateGraph
+from langgraph.graph.message import add_messages
+
+from app.api import websocket as ws_module
+from app.core import streaming_reply
+from app.core.checkpointer import SQLiteCheckpointer
+from app.services import tts_service
+from app.services.audio_cache import AudioCache
+from app.services.tts_service import LocalTTS
+from app.streaming.interrupt_handler import InterruptHandler
+
+REPLY = "That is a reasonable answer, and here is a longer explanation of why it works the way it does. " * 3
+
+
+class TurnState(TypedDict, total=False):
+    candidate_id: Optional[str]
+    student_name: str
+    college: str
+    course: str
+    last_user_input: str
+    messages: Annotated[List[AnyMessage], add_messages]
+    log: Annotated[list, operator.add]
+
+
+def build(checkpointer, gate: Optional[asyncio.Event] = None, entered: Optional[asyncio.Event] = None):
+    """ask -> [interrupt] router -> think1 -> think2 -> think3 -> ask; think3 can be held on ``gate``."""
+
+    async def ask(state):
+        return {"messages": [AIMessage(content=REPLY)], "log": ["ask"]}
+
+    async def router(state):
+        return {"log": [f"router:{state['last_user_input']}"]}
+
+    def think(name):
+        async def node(state):
+            if name == "think3" and gate is not None:
+                entered.set()
+                await gate.wait()
+            return {"log": [name]}
+        return node
+
+    builder = StateGraph(TurnState)
+    builder.add_node("ask", ask)
+    builder.add_node("router", router)
+    for name in ("think1", "think2", "think3"):
+        builder.add_node(name, think(name))
+    builder.add_edge(START, "ask")
+    builder.add_edge("ask", "router")
+    builder.add_edge("router", "think1")
+    builder.add_edge("think1", "think2")
+    builder.add_edge("think2", "think3")
+    builder.add_conditional_edges("think3", lambda s: END if len(s["log"]) > 10 else "ask")
+    return builder.compile(checkpointer=checkpointer, interrupt_before=["router"])
+
+
+async def cut_off_turn(checkpointer):
+    """Start a turn, barge in while it is inside think3, and return the handler."""
+    gate, entered = asyncio.Event(), asyncio.Event()
+    graph = build(checkpointer, gate, entered)
+    config = {"configurable": {"thread_id": "t1"}}
+    await graph.ainvoke({"log": []}, config=config)
+    handler = InterruptHandler(graph, config)
+    turn = await handler.submit_utterance("it is")
+    await entered.wait()
+    assert handler.barge_in() is None  # nothing was playing
+    with pytest.raises(asyncio.CancelledError):
+        await turn
+    gate.set()
+    return graph, config, handler
+
+
+def test_rollback_after_pruning_reruns_from_the_pinned_checkpoint():
+    async def scenario():
+        graph, config, handler = await cut_off_turn(SQLiteCheckpointer(":memory:", keep_last=2))
+        assert handler.pending
+        turn = await handler.submit_utterance("a hash map")
+        return await turn, handler
+
+    state, handler = asyncio.run(scenario())
+    assert state.values["log"] == ["ask", "router:it is a hash map", "think1", "think2", "think3", "ask"]
+    assert not handler.pending
+    assert handler.graph.checkpointer._pinned == {}
+
+
+def test_rollback_fails_loudly_when_the_base_is_gone():
+    class Unpinned(SQLiteCheckpointer):
+        pin = unpin = None
+
+    async def scenario():
+        graph, config, handler = await cut_off_turn(Unpinned(":memory:", keep_last=2))
+        turn = await handler.submit_utterance("a hash map")
+        await turn
+
+    with pytest.raises(RuntimeError, match="no longer retained"):
+        asyncio.run(scenario())
+
+
+class FakeWebSocket:
+    def __init__(self):
+        self.incoming: asyncio.Queue = asyncio.Queue()
+        self.events: asyncio.Queue = asyncio.Queue()
+        self.audio: List[int] = []
+
+    async def receive_json(self):
+        message = await self.incoming.get()
+        if message is None:
+            raise WebSocketDisconnect()
+        return message
+
+    async def send_json(self, payload):
+        await self.events.put(payload)
+
+    async def send_bytes(self, payload):
+        self.audio.append(len(payload))
+        await asyncio.sleep(0.002)
+
+
+async def next_event(ws, kind):
+    while (event := await asyncio.wait_for(ws.events.get(), 5)).get("type") != kind:
+        pass
+    return event
+
+
+def test_barge_in_during_playback(monkeypatch, tmp_path):
+    monkeypatch.setattr(tts_service, "_tts", LocalTTS())
+    monkeypatch.setattr(streaming_reply, "audio_cache", AudioCache(directory=str(tmp_path)))
+
+    async def scenario():
+        ws = FakeWebSocket()
+        session = ws_module.CallSession(ws, build(MemorySaver()))
+        runner = asyncio.create_task(session.run())
+        await ws.incoming.put({"type": "start", "audio": True})
+        await next_event(ws, "agent")
+        greeting = len(ws.audio)
+
+        await ws.incoming.put({"type": "text", "text": "first"})
+        while len(ws.audio) < greeting + 5:
+            await asyncio.sleep(0.005)
+        await ws.incoming.put({"type": "interrupt"})
+        done = await next_event(ws, "turn_done")
+        sent = len(ws.audio)
+        await asyncio.sleep(0.05)
+        assert len(ws.audio) == sent
+
+        # The graph had finished, so the next reply is a new turn, not a rerun
+        await ws.incoming.put({"type": "text", "text": "second"})
+        await next_event(ws, "turn_done")
+        await ws.incoming.put(None)
+        await runner
+        state = await session.graph.aget_state(session.config)
+        return done, session.interrupts, state
+
+    done, interrupts, state = asyncio.run(scenario())
+    assert done["interrupted"]
+    [interruption] = interrupts.interruptions
+    assert interruption.text == REPLY
+    assert 0 < interruption.played_ms < interruption.total_ms
+    assert [entry for entry in state.values["log"] if entry.startswith("router")] == ["router:first", "router:second"]
+
+
+def test_barge_in_mid_evaluation_scores_and_records_the_answer_once(monkeypatch):
+    from app.core import nodes
+    from app.core.evaluation_queue import evaluation_queue
+    from app.core.graph import build_graph
+    from app.services.evaluation_cache import evaluation_cache
+    from app.services.llm_service import use_llms
+    from app.services.question_bank import QuestionBank
+    from benchmarks.graph_replay import FakeLLM, LognormalLatency
+
+    questions = ["What is a tuple?", "What is a decorator?", "What is a generator?"]
+    bank = QuestionBank(path=None, min_cell=1, enabled=True)
+    bank.add("Python", "medium", questions)
+    monkeypatch.setattr(nodes, "question_bank", bank)
+    monkeypatch.setattr(evaluation_cache, "enabled", False)
+
+    async def no_new_questions(topic, difficulty):
+        return questions
+
+    monkeypatch.setattr(nodes, "generate_questions", no_new_questions)
+    use_llms(FakeLLM(latency=LognormalLatency(1.0, sigma=0.0, per_kind_ms={"EvaluationSchema": 300.0})))
+    replaced = evaluation_queue.replaced
+
+    async def scenario():
+        graph = build_graph(pipelined_evaluation=True, speculative_pool=False, feedback_reports=False,
+                            checkpointer=MemorySaver())
+        config = {"configurable": {"thread_id": "rerun"}}
+        await graph.ainvoke({"candidate_id": "c-1", "student_name": "Asha", "college": "", "course": "",
+                             "messages": []}, config=config)
+        armed = []
+
+        async def respond():
+            async for update in graph.astream(None, config=config, stream_mode="updates"):
+                if armed and "ask_question" in update:
+                    # The candidate talks over the next question while the answer is still being scored
+                    armed.clear()
+                    handler.barge_in()
+                    await asyncio.sleep(0)
+            handler.settle()
+
+        handler = InterruptHandler(graph, config, respond=respond)
+        for reply in ["yes", "python", "medium"]:
+            await (await handler.submit_utterance(reply))
+        armed.append(True)
+        with pytest.raises(asyncio.CancelledError):
+            await (await handler.submit_utterance("a list"))
+        await (await handler.submit_utterance("that cannot change"))
+
+        outstanding = evaluation_queue.outstanding("rerun")
+        await evaluation_queue.persist(graph, config, wait=True)
+        return outstanding, (await graph.aget_state(config)).values
+
+    try:
+        outstanding, values = asyncio.run(scenario())
+    finally:
+        use_llms(None)
+
+    assert outstanding == 1 and evaluation_queue.replaced - replaced == 1
+    assert [(e.question, e.answer) for e in values["evaluations"]] == [(values["asked_questions"][0],
+                                                                         "a list that cannot change")]
+    assert values["question_count"] == 1 and len(values["asked_questions"]) == 2
+    assert bank._conn.execute("SELECT COUNT(*) FROM asked_questions").fetchone()[0] == 2
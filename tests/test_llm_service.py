@@ -0,0 +1,123 @@
+import asyncio
+import time
+
+import pytest
+
+from app.services.llm_service import LLMClient, TokenBucket
+
+
+class StatusError(Exception):
+    def __init__(self, status_code: int):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+
+
+class StubModel:
+    """A runnable whose n-th call raises ``errors[n]`` (if any) after sleeping ``delays[n]`` seconds."""
+
+    def __init__(self, errors=(), delays=()):
+        self.errors = list(errors)
+        self.delays = list(delays)
+        self.calls = 0
+        self.cancelled = 0
+        self.active = 0
+        self.max_active = 0
+
+    async def ainvoke(self, prompt, config=None):
+        n = self.calls
+        self.calls += 1
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            await asyncio.sleep(self.delays[n] if n < len(self.delays) else 0.01)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        finally:
+            self.active -= 1
+        if n < len(self.errors) and self.errors[n] is not None:
+            raise self.errors[n]
+        return f"reply {n}"
+
+
+def client(**kwargs) -> LLMClient:
+    options = dict(requests_per_second=1000.0, burst=100, backoff_base=0.0, hedge=False)
+    options.update(kwargs)
+    return LLMClient(**options)
+
+
+def test_rate_limits_and_server_errors_are_retried():
+    llm, model = client(max_attempts=3), StubModel(errors=[StatusError(429), StatusError(503)])
+    assert asyncio.run(llm.invoke(model, "hi", "test")) == "reply 2"
+    assert model.calls == 3
+    assert (llm.counts["retries"], llm.counts["rate_limited"]) == (2, 1)
+    assert llm.bucket.rate < llm.bucket.max_rate
+
+
+def test_client_errors_are_not_retried():
+    llm, model = client(max_attempts=3), StubModel(errors=[StatusError(400)])
+    with pytest.raises(StatusError):
+        asyncio.run(llm.invoke(model, "hi", "test"))
+    assert model.calls == 1 and llm.counts["retries"] == 0
+
+
+def test_slow_call_is_hedged_once_and_the_loser_cancelled():
+    llm = client(hedge=True, hedge_min_samples=1, hedge_budget=1.0)
+    llm._latency["test"].extend([0.02] * 5)
+    model = StubModel(delays=[1.0, 0.01])
+
+    started = time.perf_counter()
+    assert asyncio.run(llm.invoke(model, "hi", "test")) == "reply 1"
+    assert time.perf_counter() - started < 0.5
+    assert model.calls == 2 and model.cancelled == 1
+    assert (llm.counts["hedges"], llm.counts["hedge_wins"]) == (1, 1)
+
+
+def test_bucket_halves_on_rate_limits_and_recovers():
+    bucket = TokenBucket(rate=10.0, capacity=1, min_rate=1.0)
+    bucket.throttle()
+    bucket.throttle()
+    assert bucket.rate == 2.5
+    for _ in range(10):
+        bucket.throttle()
+    assert bucket.rate == 1.0
+    for _ in range(60):
+        bucket.recover()
+    assert bucket.rate == 10.0
+
+
+def test_bucket_paces_requests_at_the_throttled_rate():
+    async def take(bucket: TokenBucket, n: int) -> float:
+        started = time.perf_counter()
+        for _ in range(n):
+            await bucket.acquire()
+        return time.perf_counter() - started
+
+    bucket = TokenBucket(rate=20.0, capacity=1)
+    # One token in the bucket, then one every 50 ms
+    assert asyncio.run(take(bucket, 3)) == pytest.approx(0.1, abs=0.04)
+    bucket.throttle()
+    # Empty bucket, one token every 100 ms
+    assert asyncio.run(take(bucket, 3)) == pytest.approx(0.3, abs=0.06)
+
+
+@pytest.mark.parametrize("limits, expected", [({"max_concurrency": 2}, 2), ({"model_concurrency": 1}, 1)])
+def test_concurrency_is_capped(limits, expected):
+    llm, model = client(**limits), StubModel(delays=[0.02] * 6)
+
+    async def burst():
+        await asyncio.gather(*(llm.invoke(model, "hi", "test", model="m") for _ in range(6)))
+
+    asyncio.run(burst())
+    assert model.calls == 6 and model.max_active == expected
+
+
+def test_client_works_across_event_loops():
+    llm, model = client(max_concurrency=1), StubModel()
+
+    async def contended():
+        return await asyncio.gather(*(llm.invoke(model, "hi", "test") for _ in range(3)))
+
+    # Semaphores made for the first loop would refuse waiters from the second
+    asyncio.run(contended())
+    assert len(asyncio.run(contended())) == 3
@@ -0,0 +1,89 @@
+import asyncio
+
+from fastapi import WebSocketDisconnect
+from langgraph.checkpoint.memory import MemorySaver
+
+from app.api.websocket import SessionManager
+from app.core import speculation
+from app.core.graph import build_graph
+from app.core.speculation import PoolSpeculator
+
+
+class FakeWebSocket:
+    def __init__(self):
+        self.incoming: asyncio.Queue = asyncio.Queue()
+        self.sent = []
+        self.closed = False
+
+    async def accept(self):
+        pass
+
+    async def close(self, code: int = 1000):
+        self.closed = True
+
+    async def receive_json(self):
+        message = await self.incoming.get()
+        if message is None:
+            raise WebSocketDisconnect()
+        return message
+
+    async def send_json(self, payload):
+        self.sent.append(payload)
+
+
+def test_hang_up_cancels_speculated_pools(monkeypatch):
+    speculator = PoolSpeculator()
+    monkeypatch.setattr("app.api.websocket.pool_speculator", speculator)
+
+    async def slow_pool(topic, difficulty, size, candidate=None):
+        await asyncio.sleep(60)
+
+    monkeypatch.setattr(speculation, "draw_question_pool", slow_pool)
+
+    async def scenario():
+        manager = SessionManager()
+        ws = FakeWebSocket()
+        graph = build_graph(speculative_pool=True, feedback_reports=False, checkpointer=MemorySaver())
+        handler = asyncio.create_task(manager.handle(ws, graph))
+        await ws.incoming.put({"type": "start", "thread_id": "hang-up", "student_name": "Asha"})
+        while not any(m.get("type") == "session" for m in ws.sent):
+            await asyncio.sleep(0.01)
+        # As if the topic router had just accepted a topic
+        speculator.start("hang-up", "Python", 5)
+        tasks = list(speculator._tasks["hang-up"].values())
+        await ws.incoming.put(None)
+        await handler
+        await asyncio.sleep(0)
+        return ws, tasks
+
+    ws, tasks = asyncio.run(scenario())
+    assert ws.closed
+    assert all(task.cancelled() for task in tasks)
+    assert speculator.stats()["started"] == 3
+    assert speculator.stats()["cancelled"] == 3
+    assert "hang-up" not in speculator._tasks
+
+
+def test_rerun_of_a_cut_off_turn_takes_the_same_pool(monkeypatch):
+    speculator = PoolSpeculator()
+    generated = []
+
+    async def pool(topic, difficulty, size, candidate=None):
+        generated.append(difficulty)
+        await asyncio.sleep(0.05)
+        return [f"{topic} {difficulty} question"]
+
+    monkeypatch.setattr(speculation, "draw_question_pool", pool)
+
+    async def scenario():
+        speculator.start("t1", "Python", 1)
+        # A barge-in cancels the turn waiting on the pool ...
+        cut_off = asyncio.create_task(speculator.take("t1", "Python", "medium"))
+        await asyncio.sleep(0.01)
+        cut_off.cancel()
+        # ... and its rerun gets the pool that kept generating
+        return await speculator.take("t1", "Python", "medium")
+
+    assert asyncio.run(scenario()) == ["Python medium question"]
+    assert sorted(generated) == ["beginner", "hard", "medium"]
+    assert speculator.stats()["missed"] == 0
@@ -0,0 +1,53 @@
+import asyncio
+
+from app.core import nodes
+from app.core.state import InterviewState
+from app.services.question_bank import QuestionBank
+
+QUESTIONS = [
+    "What is the difference between a list and a tuple in Python?",
+    "How does a decorator wrap a function?",
+    "Why would you use a generator instead of building a list?",
+]
+CANDIDATE = "id:c-1"
+
+
+def asked_rows(bank: QuestionBank) -> int:
+    return bank._conn.execute("SELECT COUNT(*) FROM asked_questions").fetchone()[0]
+
+
+def test_repeats_pad_the_pool_without_counting_as_draws_or_being_recorded_again(monkeypatch):
+    bank = QuestionBank(path=None, min_cell=1, enabled=True)
+    bank.add("Python", "medium", QUESTIONS)
+    for question in QUESTIONS[:2]:
+        bank.record(CANDIDATE, "Python", "medium", question)
+    monkeypatch.setattr(nodes, "question_bank", bank)
+
+    async def no_new_questions(topic, difficulty):
+        return QUESTIONS  # all duplicates, so the refill adds nothing
+
+    monkeypatch.setattr(nodes, "generate_questions", no_new_questions)
+
+    pool = asyncio.run(nodes.draw_question_pool("Python", "medium", 3, CANDIDATE))
+
+    assert pool[0] == QUESTIONS[2]
+    assert sorted(pool[1:]) == sorted(QUESTIONS[:2])
+    stats = bank.stats()
+    assert (stats["served"], stats["thin"], stats["repeats"]) == (0, 2, 2)
+
+    state = InterviewState(candidate_id="c-1", student_name="Asha", topic="Python", difficulty="medium",
+                           question_pool=pool)
+    for _ in pool:
+        state = state.model_copy(update=asyncio.run(nodes.ask_question(state)))
+    assert state.asked_questions == pool
+    # Only the question the candidate had not been asked is new on record
+    assert asked_rows(bank) == 3
+    assert bank._seen(CANDIDATE) == set(bank._cells[bank.cell("Python", "medium")])
+
+
+def test_full_pool_has_no_repeats():
+    bank = QuestionBank(path=None, min_cell=1, enabled=True)
+    bank.add("Python", "medium", QUESTIONS)
+    assert sorted(bank.sample("Python", "medium", 3, CANDIDATE)) == sorted(QUESTIONS)
+    assert bank.stats()["repeats"] == 0
+    assert bank.sample_repeats("Python", "medium", 2, QUESTIONS) == []
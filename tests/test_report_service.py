@@ -0,0 +1,119 @@
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import time
+
+from app.core.state import QuestionEvaluation
+from app.models.schemas import CandidateReport, ReportBatch
+from app.services import report_service
+from app.services.report_service import PENDING, ReportJob, ReportStore, ReportWorker
+
+
+def job(thread_id: str) -> ReportJob:
+    return ReportJob(thread_id=thread_id, student_name=thread_id.title(), topic="Python", difficulty="medium",
+                     evaluations=[QuestionEvaluation(question="What is a tuple?", answer="An immutable list.",
+                                                     correct=True, short_feedback="Good.", correction=None)])
+
+
+def report(ref: str) -> CandidateReport:
+    return CandidateReport(candidate_ref=ref, summary=f"Summary for {ref}.", strengths=["clear"], improvements=[])
+
+
+def worker(tmp_path, **kwargs) -> ReportWorker:
+    return ReportWorker(queue_path=":memory:", reports_dir=str(tmp_path / "reports"), **kwargs)
+
+
+def run_batch(w: ReportWorker) -> None:
+    async def batch():
+        w._wake = asyncio.Event()
+        await w._run_batch(w.store.claim(5))
+
+    asyncio.run(batch())
+
+
+def written(tmp_path, thread_id: str) -> dict:
+    with open(os.path.join(tmp_path, "reports", f"{thread_id}.json"), encoding="utf-8") as f:
+        return json.load(f)
+
+
+def test_claim_skips_jobs_held_back_for_retry():
+    store = ReportStore(":memory:")
+    store.add(job("ada"))
+    store.add(job("bob"))
+    [(claimed, attempts)] = store.claim(1)
+    store.retry(claimed.thread_id, delay=60)
+
+    assert [j.thread_id for j, _ in store.claim(5)] == ["bob"]
+    count, _, next_retry = store.pending()
+    assert count == 0 and next_retry is not None
+    assert store.counts() == {PENDING: 1, "in_progress": 1}
+
+    store.retry(claimed.thread_id, delay=0)
+    assert [(j.thread_id, n) for j, n in store.claim(5)] == [("ada", 2)]
+
+
+def test_failed_batch_is_retried_with_backoff(tmp_path, monkeypatch, caplog):
+    async def failing(*args, **kwargs):
+        raise RuntimeError("rate limited")
+
+    monkeypatch.setattr(report_service, "invoke_structured", failing)
+    w = worker(tmp_path, retry_backoff_seconds=10.0)
+    w.store.add(job("ada"))
+
+    with caplog.at_level(logging.WARNING, logger="intervu.reports"):
+        run_batch(w)
+
+    assert "rate limited" in caplog.text
+    not_before, attempts = w.store._conn.execute(
+        "SELECT not_before, attempts FROM report_jobs WHERE thread_id = 'ada'").fetchone()
+    assert attempts == 1 and not_before > time.time() + 5
+    assert w.store.claim(5) == []
+    assert w.stats()["retries"] == 1
+
+
+def test_unmatched_refs_get_fallback_reports_not_positional_ones(tmp_path, monkeypatch):
+    async def garbled(llm, schema, messages):
+        # One report per candidate, but only c2's ref survived
+        return ReportBatch(reports=[report("candidate one"), report("c2")])
+
+    monkeypatch.setattr(report_service, "invoke_structured", garbled)
+    w = worker(tmp_path)
+    w.store.add(job("ada"))
+    w.store.add(job("bob"))
+
+    run_batch(w)
+
+    assert written(tmp_path, "ada")["source"] == "fallback"
+    assert written(tmp_path, "bob")["summary"] == "Summary for c2."
+    assert w.store.counts() == {"done": 2}
+    assert w.written == {"llm": 1, "fallback": 1} and w.unmatched == 1
+
+
+def test_queue_from_before_backoff_is_migrated(tmp_path):
+    path = str(tmp_path / "old.sqlite")
+    conn = sqlite3.connect(path)
+    conn.executescript("""
+        CREATE TABLE report_jobs (thread_id TEXT PRIMARY KEY, job TEXT NOT NULL, status TEXT NOT NULL,
+                                  attempts INTEGER NOT NULL DEFAULT 0, created_at REAL NOT NULL,
+                                  updated_at REAL NOT NULL);
+    """)
+    conn.execute("INSERT INTO report_jobs VALUES ('ada', ?, 'pending', 0, 1.0, 1.0)", (job("ada").model_dump_json(),))
+    conn.commit()
+    conn.close()
+
+    assert [j.thread_id for j, _ in ReportStore(path).claim(5)] == ["ada"]
+
+
+def test_requeued_interview_replaces_a_waiting_job_but_not_a_claimed_one():
+    store = ReportStore(":memory:")
+    assert store.add(job("ada"))
+    rerun = job("ada")
+    rerun.evaluations[0].answer = "An immutable sequence."
+    assert not store.add(rerun)
+    [(claimed, _)] = store.claim(1)
+    assert claimed.evaluations[0].answer == "An immutable sequence."
+
+    assert not store.add(job("ada"))
+    assert store._conn.execute("SELECT job FROM report_jobs").fetchone()[0] == claimed.model_dump_json()
@@ -0,0 +1,119 @@
+import asyncio
+import os
+import time
+
+from langgraph.checkpoint.memory import MemorySaver
+
+from app.core.graph import build_graph
+from app.core.intent import intent_stats
+from app.core.router_prefetch import router_prefetch
+from app.core.speculative_intent import IntentSpeculator, speculation_stats
+from app.services.llm_service import use_llms
+from app.services.stt_service import Transcript, WavReplaySTT, wav_chunks
+from benchmarks.graph_replay import FakeLLM, LognormalLatency
+
+INPUT_WAV = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "input.wav")
+TRANSCRIPT = "yes this is jayanth speaking"
+
+
+async def with_trailing_silence(seconds: float):
+    async for chunk in wav_chunks(INPUT_WAV, realtime=False):
+        yield chunk
+    silence = bytes(640)  # 20 ms at 16 kHz
+    for _ in range(int(seconds * 50)):
+        yield silence
+
+
+async def at_identity_router(llm: bool = False):
+    graph = build_graph(speculative_pool=False, feedback_reports=False, checkpointer=MemorySaver())
+    config = {"configurable": {"thread_id": "speculation"}}
+    await graph.ainvoke({"student_name": "Jayanth", "college": "", "course": "", "messages": []}, config=config)
+    return IntentSpeculator(graph, config, llm=llm)
+
+
+def run_wav(audio=None):
+    speculation_stats.reset()
+    intent_stats.reset()
+
+    async def scenario():
+        speculator = await at_identity_router()
+        stt = WavReplaySTT(INPUT_WAV, TRANSCRIPT, realtime=False)
+        return await speculator.run(stt.transcribe(audio))
+
+    return asyncio.run(scenario()), speculation_stats.snapshot()
+
+
+def test_wav_replay_speech_to_the_last_frame_is_a_miss():
+    # input.wav is voiced up to its end, so the final arrives before the full text was ever a stable partial
+    state, stats = run_wav()
+    assert state.next == ("topic_router",) and state.values["intent"] == "valid"
+    assert stats["started"] >= 1 and stats["hits"] == 0 and stats["committed"] == 0
+    assert stats["started"] == stats["cancelled"] + stats["misses"]
+    assert intent_stats.local_hits["identity"] == 1
+
+
+def test_wav_replay_commits_the_identity_route():
+    state, stats = run_wav(with_trailing_silence(1.0))
+    assert state.next == ("topic_router",)
+    assert state.values["intent"] == "valid"
+    assert state.values["messages"][-2].content == TRANSCRIPT
+    assert stats["hits"] == 1 and stats["committed"] == 1 and stats["misses"] == 0
+    # Counted once, by the commit; the router itself never ran
+    assert intent_stats.local_hits["identity"] == 1 and not intent_stats.llm_fallbacks
+
+
+def test_changed_final_runs_the_router():
+    speculation_stats.reset()
+
+    async def scripted():
+        for text in ["yes", "yes", "yes"]:
+            yield Transcript(text=text)
+        yield Transcript(text="no", is_final=True)
+
+    async def scenario():
+        speculator = await at_identity_router()
+        return await speculator.run(scripted())
+
+    state = asyncio.run(scenario())
+    stats = speculation_stats.snapshot()
+    assert state.values["intent"] == "not_valid"
+    assert stats["started"] == 1 and stats["misses"] == 1 and stats["committed"] == 0
+
+
+def run_llm_speculation(partial: str, final: str):
+    """Offer a partial the phrase tables cannot settle, then the final 150 ms later."""
+    speculation_stats.reset()
+    fake = FakeLLM(latency=LognormalLatency(100.0, sigma=0.0))
+    use_llms(fake)
+    used, wasted = router_prefetch.used, router_prefetch.wasted
+
+    async def scenario():
+        speculator = await at_identity_router(llm=True)
+        await speculator.on_partial(partial)
+        await asyncio.sleep(0.15)
+        started = time.perf_counter()
+        state = await speculator.on_final(final)
+        return state, time.perf_counter() - started
+
+    try:
+        state, seconds = asyncio.run(scenario())
+    finally:
+        use_llms(None)
+    return state, seconds, fake.calls, router_prefetch.used - used, router_prefetch.wasted - wasted
+
+
+def test_llm_classification_started_on_the_partial_is_used_by_the_router():
+    state, seconds, calls, used, wasted = run_llm_speculation("who is asking", "Who is asking?")
+    assert state.next == ("topic_router",) and state.values["intent"] == "valid"
+    assert calls["IdentityIntent"] == 1 and (used, wasted) == (1, 0)
+    # The call finished while the candidate was still speaking
+    assert seconds < 0.1
+    stats = speculation_stats.snapshot()
+    assert stats["prefetched"] == 1 and stats["committed"] == 0
+
+
+def test_changed_final_drops_the_llm_classification():
+    state, seconds, calls, used, wasted = run_llm_speculation("who is asking", "no this is not him")
+    assert state.values["intent"] == "not_valid"
+    assert calls["IdentityIntent"] == 2 and (used, wasted) == (0, 1)
+    assert speculation_stats.snapshot()["misses"] == 1
@@ -0,0 +1,75 @@
+import asyncio
+from typing import Optional
+
+import pytest
+from langchain_core.messages import AIMessageChunk
+
+from app.core.streaming_reply import stream_evaluation
+from app.models.schemas import EvaluationSchema
+from app.services.evaluation_cache import evaluation_cache
+from app.services.llm_service import use_llms
+from benchmarks.graph_replay import FakeLLM, LognormalLatency
+
+
+class ScriptedStream(FakeLLM):
+    """Streams a fixed completion in 4-character pieces, optionally failing after ``fail_after`` of them."""
+
+    def __init__(self, content: str, fail_after: Optional[int] = None):
+        super().__init__(responder=lambda schema, prompt: EvaluationSchema(
+            correct=True, short_feedback="Fresh verdict.", correction=None),
+            latency=LognormalLatency(1.0, sigma=0.0), token_ms=0.0)
+        self.content = content
+        self.fail_after = fail_after
+
+    async def astream(self, messages, config=None, **kwargs):
+        for n, start in enumerate(range(0, len(self.content), 4)):
+            if n == self.fail_after:
+                raise ConnectionError("stream reset")
+            yield AIMessageChunk(content=self.content[start:start + 4])
+            await asyncio.sleep(0)
+
+
+@pytest.fixture(autouse=True)
+def no_cache(monkeypatch):
+    monkeypatch.setattr(evaluation_cache, "enabled", False)
+    yield
+    use_llms(None)
+
+
+def evaluate(llm: ScriptedStream):
+    use_llms(llm)
+    clauses = []
+    result = asyncio.run(stream_evaluation("What is a tuple?", "A list you can change.", clauses.append))
+    return result, clauses
+
+
+def test_correction_streamed_before_the_verdict_is_spoken_once_it_is_wrong():
+    result, clauses = evaluate(ScriptedStream(
+        '{"correction": "Tuples are immutable.", "short_feedback": "Not quite.", "correct": false}'))
+    assert not result.correct
+    assert clauses == ["Not quite.", "A better way is: Tuples are immutable."]
+
+
+def test_correction_of_a_right_answer_is_not_spoken():
+    result, clauses = evaluate(ScriptedStream(
+        '{"correction": "Tuples are immutable.", "short_feedback": "Good answer.", "correct": true}'))
+    assert result.correct
+    assert clauses == ["Good answer."]
+
+
+def test_stream_failing_after_speech_keeps_what_was_said():
+    llm = ScriptedStream('{"correct": false, "short_feedback": "Not quite, you are close. Tuples cannot change."}',
+                         fail_after=18)
+    result, clauses = evaluate(llm)
+    assert clauses == ["Not quite, you are close."]
+    assert not result.correct and result.short_feedback.startswith("Not quite, you are close.")
+    # No second evaluation that could contradict the spoken feedback
+    assert llm.calls["EvaluationSchema"] == 0
+
+
+def test_stream_failing_before_speech_falls_back_to_a_fresh_evaluation():
+    llm = ScriptedStream('{"correct": true, "short_feedback": "Good answer."}', fail_after=2)
+    result, clauses = evaluate(llm)
+    assert result.short_feedback == "Fresh verdict."
+    assert clauses == ["Fresh verdict."]
+    assert llm.calls["EvaluationSchema"] == 1
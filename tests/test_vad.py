@@ -0,0 +1,70 @@
+import os
+import wave
+
+import numpy as np
+
+from app.streaming.vad import VoiceActivityDetector
+
+INPUT_WAV = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "input.wav")
+RATE = 16000
+
+
+def tone(ms: int) -> np.ndarray:
+    t = np.arange(RATE * ms // 1000) / RATE
+    return (8000 * np.sin(2 * np.pi * 220 * t)).astype(np.int16)
+
+
+def silence(ms: int) -> np.ndarray:
+    return np.zeros(RATE * ms // 1000, dtype=np.int16)
+
+
+def detect(samples: np.ndarray):
+    """(type, timestamp_ms, reported_ms) for each event, fed in 20 ms chunks."""
+    vad = VoiceActivityDetector(sample_rate=RATE, frame_ms=20, start_ms=60, hangover_ms=100,
+                                end_of_utterance_ms=200)
+    events = []
+    for start in range(0, len(samples), vad.frame_len):
+        for e in vad.process(samples[start:start + vad.frame_len]):
+            events.append((e.type, e.timestamp_ms, vad.frames_processed * vad.frame_ms))
+    return events
+
+
+def test_endpoint_waits_for_hangover_then_silence():
+    events = detect(np.concatenate([silence(200), tone(400), silence(1000)]))
+    assert events == [("speech_start", 200, 260), ("speech_end", 600, 900)]
+
+
+def test_default_endpoint_is_300_ms():
+    vad = VoiceActivityDetector(sample_rate=RATE)
+    assert (vad.hangover_frames + vad.end_frames) * vad.frame_ms == 300
+
+
+def test_gap_shorter_than_hangover_plus_silence_does_not_split():
+    # 260 ms < 100 ms hangover + 200 ms end-of-utterance
+    events = detect(np.concatenate([silence(200), tone(300), silence(260), tone(300), silence(1000)]))
+    assert [e[0] for e in events] == ["speech_start", "speech_end"]
+    assert events[-1][1] == 1060
+
+
+def test_without_hangover_endpoint_is_end_of_utterance_only():
+    samples = np.concatenate([silence(200), tone(400), silence(1000)])
+    vad = VoiceActivityDetector(sample_rate=RATE, frame_ms=20, hangover_ms=0, end_of_utterance_ms=300)
+    reported = None
+    for start in range(0, len(samples), vad.frame_len):
+        if any(e.type == "speech_end" for e in vad.process(samples[start:start + vad.frame_len])):
+            reported = vad.frames_processed * vad.frame_ms
+    assert reported == 900
+
+
+def test_silence_only_has_no_events():
+    assert detect(silence(2000)) == []
+
+
+def test_input_wav_endpoints():
+    with wave.open(INPUT_WAV, "rb") as w:
+        samples = np.frombuffer(w.readframes(w.getnframes()), dtype=np.int16)
+    events = detect(np.concatenate([samples, silence(1000)]))
+    assert [(t, ts) for t, ts, _ in events if t == "speech_end"] == [
+        ("speech_end", 460), ("speech_end", 1220), ("speech_end", 4980)]
+    # Each endpoint is reported 100 ms hangover + 200 ms end-of-utterance after the speech ends
+    assert [reported - ts for t, ts, reported in events if t == "speech_end"] == [300, 300, 300]
@@ -0,0 +1,82 @@
+import asyncio
+
+from fastapi import WebSocketDisconnect
+from langgraph.checkpoint.memory import MemorySaver
+
+from app.api import websocket as ws_module
+from app.core import streaming_reply
+from app.core.graph import build_graph
+from app.core.prompts import INTRO_TEMPLATE
+from app.services import tts_service
+from app.services.audio_cache import AudioCache
+from app.services.tts_service import LocalTTS, split_clauses
+
+INTRO = INTRO_TEMPLATE.format(student_name="Asha")
+
+
+class CountingTTS(LocalTTS):
+    def __init__(self):
+        super().__init__(chars_per_second=200.0)
+        self.calls = []
+
+    async def stream(self, text):
+        self.calls.append(text)
+        async for chunk in super().stream(text):
+            yield chunk
+
+
+class FakeWebSocket:
+    def __init__(self):
+        self.incoming: asyncio.Queue = asyncio.Queue()
+        self.frames = []  # ("audio", bytes) or the JSON payload
+
+    async def receive_json(self):
+        message = await self.incoming.get()
+        if message is None:
+            raise WebSocketDisconnect()
+        return message
+
+    async def send_json(self, payload):
+        self.frames.append(payload)
+
+    async def send_bytes(self, payload):
+        self.frames.append(("audio", payload))
+
+
+def greet(monkeypatch, tmp_path, warm: bool = False):
+    tts = CountingTTS()
+    cache = AudioCache(directory=str(tmp_path), tts=tts)
+    monkeypatch.setattr(tts_service, "_tts", tts)
+    monkeypatch.setattr(streaming_reply, "audio_cache", cache)
+    if warm:
+        asyncio.run(cache.warm([INTRO], pinned=False))
+        tts.calls.clear()
+
+    async def scenario():
+        ws = FakeWebSocket()
+        session = ws_module.CallSession(ws, build_graph(feedback_reports=False, checkpointer=MemorySaver()))
+        runner = asyncio.create_task(session.run())
+        await ws.incoming.put({"type": "start", "audio": True, "student_name": "Asha"})
+        while not any(isinstance(f, dict) and f.get("type") == "agent" for f in ws.frames):
+            await asyncio.sleep(0.01)
+        await ws.incoming.put(None)
+        await runner
+        return ws.frames
+
+    return asyncio.run(scenario()), tts, cache
+
+
+def test_greeting_is_spoken_before_its_text_frame(monkeypatch, tmp_path):
+    frames, tts, _ = greet(monkeypatch, tmp_path)
+    kinds = [f[0] if isinstance(f, tuple) else f["type"] for f in frames]
+    assert kinds[0] == "session"
+    assert kinds.index("agent") > kinds.index("audio")
+    assert {"type": "agent", "text": INTRO} in frames
+    # A dynamic line that is not cached yet is synthesized clause by clause
+    assert tts.calls == split_clauses(INTRO)
+
+
+def test_cached_greeting_plays_whole_from_the_cache(monkeypatch, tmp_path):
+    frames, tts, cache = greet(monkeypatch, tmp_path, warm=True)
+    assert tts.calls == []
+    assert b"".join(f[1] for f in frames if isinstance(f, tuple)) == bytes(cache.lookup(INTRO, tts))